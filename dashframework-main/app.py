@@ -1,10 +1,10 @@
 # app.py
-from dash import html, dcc, Input, Output, State
+from dash import html, dcc, Input, Output, State, ClientsideFunction, no_update
 from main import app
+from jbi100_app.data_loader import GEO_OPTIONS
 
-# Import layouts
-from jbi100_app.views.data_view import data_view_layout
-from jbi100_app.views.map_view import map_view_layout
+# Import layouts (built once, serialised; see layout_cache)
+from jbi100_app.views.layout_cache import view_layout, INITIAL_VIEW
 
 # Import callbacks
 from jbi100_app.callbacks import data_callbacks  # noqa
@@ -13,58 +13,97 @@ from jbi100_app.callbacks import map_callbacks   # noqa
 
 # ========= PAGE LAYOUT =========
 
-app.layout = html.Div(
-    id="app-container",
-    children=[
-
-        html.Div(
-            id="page-content",
-            children=[
-                html.Div(id="map-view-wrapper",
-                         style={"display": "none"},
-                         children=map_view_layout()),
-
-                html.Div(id="data-view-wrapper",
-                         style={"display": "block"},
-                         children=data_view_layout()),
-            ],
-        ),
-
-        dcc.Store(id="current-page", data="data"),
-        dcc.Store(id="map-click", data=None)
-    ],
-)
+def serve_layout():
+    """
+    Served on every page load, so reloaded datasets show up without a restart.
+    Only the initial view is sent; the other one is fetched on the first switch.
+    """
+    return html.Div(
+        id="app-container",
+        children=[
 
+            html.Div(
+                id="page-content",
+                children=[
+                    html.Div(id="map-view-wrapper",
+                             style={"display": "none"},
+                             children=view_layout("map") if INITIAL_VIEW == "map" else []),
 
-# ========= PAGE SWITCHING =========
+                    html.Div(id="data-view-wrapper",
+                             style={"display": "block"},
+                             children=view_layout("data") if INITIAL_VIEW == "data" else []),
+                ],
+            ),
 
-@app.callback(
+            dcc.Store(id="current-page", data=INITIAL_VIEW),
+            dcc.Store(id="map-click", data=None),
+
+            # Views present in the page, and the one to fetch next (set clientside)
+            dcc.Store(id="loaded-views", data=[INITIAL_VIEW]),
+            dcc.Store(id="view-request", data=None),
+
+            # Precomputed geo dropdown values for the clientside callbacks
+            dcc.Store(id="geo-options-store", data=GEO_OPTIONS),
+        ],
+    )
+
+
+app.layout = serve_layout
+
+
+# ========= PAGE SWITCHING (clientside) =========
+
+app.clientside_callback(
+    ClientsideFunction(namespace="ui", function_name="toggle_page"),
     Output("current-page", "data"),
-    Input("bottom-nav-button", "n_clicks"),
+    Input("data-nav-button", "n_clicks"),
+    Input("map-nav-button", "n_clicks"),
     State("current-page", "data"),
     prevent_initial_call=True
 )
-def toggle_page(n, current):
-    return "data" if current == "map" else "map"
-
 
-@app.callback(
-    Output("bottom-nav-button", "children"),
+app.clientside_callback(
+    ClientsideFunction(namespace="ui", function_name="update_visibility"),
+    Output("map-view-wrapper", "style"),
+    Output("data-view-wrapper", "style"),
     Input("current-page", "data")
 )
-def update_btn(page):
-    return "Go to Data View" if page == "map" else "Go to Map View"
+
+
+# ========= LAZY VIEWS =========
+
+# Only asks the server for a view that is not in the page yet
+app.clientside_callback(
+    ClientsideFunction(namespace="ui", function_name="request_view"),
+    Output("view-request", "data"),
+    Input("current-page", "data"),
+    State("loaded-views", "data"),
+    prevent_initial_call=True
+)
 
 
 @app.callback(
-    Output("map-view-wrapper", "style"),
-    Output("data-view-wrapper", "style"),
-    Input("current-page", "data")
+    Output("map-view-wrapper", "children"),
+    Output("data-view-wrapper", "children"),
+    Output("loaded-views", "data"),
+    Input("view-request", "data"),
+    State("loaded-views", "data"),
+    prevent_initial_call=True
 )
-def update_visibility(page):
-    if page == "map":
-        return {"display": "block"}, {"display": "none"}
-    return {"display": "none"}, {"display": "block"}
+def load_view(page, loaded):
+    if not page or page in loaded:
+        return no_update, no_update, no_update
+
+    layout = view_layout(page)
+    return (
+        layout if page == "map" else no_update,
+        layout if page == "data" else no_update,
+        loaded + [page],
+    )
+
+
+# WSGI entry point, e.g. `gunicorn app:server`
+server = app.server
 
 
 if __name__ == "__main__":
@@ -0,0 +1,113 @@
+/* ===========================
+   CLIENTSIDE CALLBACKS
+   Registered from Python with ClientsideFunction(namespace, function_name)
+=========================== */
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+
+    /* ---------- geo dropdowns, fed from geo-options-store ---------- */
+    geo: {
+        toOptions: function (values) {
+            return (values || []).map(function (v) {
+                return {"label": v, "value": v};
+            });
+        },
+
+        load_geo_options: function (scale, geo) {
+            var toOptions = window.dash_clientside.geo.toOptions;
+            if (scale === "continent") {
+                return toOptions(geo.continents);
+            }
+            if (scale === "region") {
+                return toOptions(geo.regions);
+            }
+            if (scale === "country") {
+                return toOptions(geo.countries);
+            }
+            return [];
+        },
+
+        update_region_dropdown: function (view, geo) {
+            var toOptions = window.dash_clientside.geo.toOptions;
+            if (view === "Global") {
+                return [toOptions(["Global"]), "Global"];
+            }
+            if (view === "Continent") {
+                return [toOptions(geo.continents), geo.continents[0]];
+            }
+            if (view === "Region") {
+                return [toOptions(geo.regions), geo.regions[0]];
+            }
+            return [[], null];
+        },
+
+        update_country_search: function (region, view, geo) {
+            var toOptions = window.dash_clientside.geo.toOptions;
+            if (view === "Global") {
+                return toOptions(geo.countries);
+            }
+            if (view === "Continent") {
+                return toOptions(geo.by_continent[region]);
+            }
+            if (view === "Region") {
+                return toOptions(geo.by_region[region]);
+            }
+            return [];
+        }
+    },
+
+    /* ---------- pure UI state: pages, tabs, popup, scale block ---------- */
+    ui: {
+        toggle_page: function (dataClicks, mapClicks, current) {
+            return current === "map" ? "data" : "map";
+        },
+
+        request_view: function (page, loaded) {
+            // Views already in the page need no round trip
+            if ((loaded || []).indexOf(page) !== -1) {
+                return window.dash_clientside.no_update;
+            }
+            return page;
+        },
+
+        update_visibility: function (page) {
+            if (page === "map") {
+                return [{"display": "block"}, {"display": "none"}];
+            }
+            return [{"display": "none"}, {"display": "block"}];
+        },
+
+        toggle_popup: function (addClick, cancelClick, addConfirm, style) {
+            var triggered = window.dash_clientside.callback_context.triggered;
+            var trigger = triggered.length ? triggered[0].prop_id.split(".")[0] : null;
+
+            // OPEN POPUP on "+ Add new", CLOSE on cancel / add
+            var display = trigger === "add-attribute" ? "flex" : "none";
+            return Object.assign({}, style, {"display": display});
+        },
+
+        hide_scale_block: function (scale) {
+            return scale === "global" ? {"display": "none"} : {"display": "block"};
+        },
+
+        update_scale_title: function (scale) {
+            var titles = {
+                "continent": "Select Continent",
+                "region": "Select Region",
+                "country": "Select Country"
+            };
+            return titles[scale] || "";
+        },
+
+        show_correct_tab: function (active) {
+            return ["info", "plots", "numbers", "create"].map(function (tab) {
+                return {"display": tab === active ? "block" : "none"};
+            });
+        },
+
+        style_tabs: function (active, ids) {
+            return ids.map(function (id) {
+                return id.tab === active ? "top-tab active" : "top-tab";
+            });
+        }
+    }
+});
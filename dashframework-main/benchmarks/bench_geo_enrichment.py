@@ -0,0 +1,77 @@
+# benchmarks/bench_geo_enrichment.py
+"""
+Compare the row-by-row country normalisation with the vectorised
+enrich_geo() stage on a synthetic country-year panel.
+
+Run from the dashframework-main folder:
+
+    python -m benchmarks.bench_geo_enrichment --years 200 --attributes 5
+"""
+import argparse
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from jbi100_app.data_loader import (
+    UN_COUNTRIES,
+    COUNTRY_TO_CONTINENT,
+    COUNTRY_TO_REGION,
+    normalize_country,
+    enrich_geo,
+)
+
+
+def legacy_enrich(df):
+    """The original ingest path: apply + isin + two map passes."""
+    df = df.copy()
+    df["Country"] = df["Country"].apply(normalize_country)
+    df = df[df["Country"].isin(UN_COUNTRIES)]
+    df["Continent"] = df["Country"].map(COUNTRY_TO_CONTINENT).fillna("Unknown")
+    df["Region"] = df["Country"].map(COUNTRY_TO_REGION).fillna("Unknown")
+    return df
+
+
+def make_panel(years, attributes, seed=0):
+    """Country-year panel with messy country spellings and a few non-UN rows."""
+    rng = np.random.default_rng(seed)
+    names = [c.title() for c in sorted(UN_COUNTRIES)] + ["World", "European Union", " netherlands "]
+
+    df = pd.DataFrame({
+        "Country": np.repeat(names, years),
+        "Year": np.tile(np.arange(2000, 2000 + years), len(names)),
+    })
+    for i in range(attributes):
+        df[f"attr_{i}"] = rng.random(len(df))
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--years", type=int, default=200)
+    parser.add_argument("--attributes", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    df = make_panel(args.years, args.attributes)
+
+    # Both paths must agree on the result
+    expected = legacy_enrich(df)
+    actual = enrich_geo(df)
+    for col in ("Country", "Continent", "Region"):
+        assert (expected[col].to_numpy() == actual[col].astype(object).to_numpy()).all(), col
+
+    legacy = min(timeit.repeat(lambda: legacy_enrich(df), number=1, repeat=args.repeat))
+    vectorised = min(timeit.repeat(lambda: enrich_geo(df), number=1, repeat=args.repeat))
+
+    legacy_mem = expected.memory_usage(deep=True).sum()
+    vectorised_mem = actual.memory_usage(deep=True).sum()
+
+    print(f"rows:        {len(df):,}")
+    print(f"legacy:      {legacy * 1000:8.1f} ms  {legacy_mem / 1e6:8.2f} MB")
+    print(f"vectorised:  {vectorised * 1000:8.1f} ms  {vectorised_mem / 1e6:8.2f} MB")
+    print(f"speed-up:    {legacy / vectorised:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+# benchmarks/callback_counts.py
+"""
+Server round trips per user interaction, and what the clientside callbacks do.
+
+Reads the callback graph from /_dash-dependencies and follows every
+interaction through the chain of callbacks it triggers. Each interaction
+lists the server-side callbacks it is expected to reach (by their first
+output); the check fails when any other server-side callback is reached, so
+moving pure-UI state back to the server, or a new round trip in the chain,
+is caught even when the count stays the same.
+
+With Node.js on the PATH, assets/clientside.js is then loaded the way the
+browser loads it, every clientside function named in the callback graph
+must exist, and the functions in CLIENTSIDE_CASES are run against their
+expected results. Without Node.js that part is skipped.
+
+tests/test_callbacks.py runs the same checks under pytest. To print the
+round trips per interaction, run from the dashframework-main folder (needs
+a working DATA_DIR):
+
+    python -m benchmarks.callback_counts
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+from collections import Counter
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLIENTSIDE_JS = os.path.join(APP_ROOT, "assets", "clientside.js")
+
+# interaction -> (triggering component id, property, server-side callbacks allowed)
+# Switching pages fetches a view the first time only (load_view, gated clientside)
+INTERACTIONS = {
+    "switch page (data -> map)": ("data-nav-button", "n_clicks", ["map-view-wrapper.children"]),
+    "switch page (map -> data)": ("map-nav-button", "n_clicks", ["map-view-wrapper.children"]),
+    "open attribute popup": ("add-attribute", "n_clicks", ["popup-category-dropdown.value"]),
+    "cancel attribute popup": ("popup-cancel", "n_clicks", ["popup-category-dropdown.value"]),
+    "click a top tab": ({"type": "top-tab"}, "n_clicks", ["content-panel-info.children"]),
+    "change geo scale": ("geo-scale", "value", [
+        # clear_dropdown_when_scale_changes, then fill_country_after_options
+        "scale-select-dropdown.value",
+        "scale-select-dropdown.value",
+        "scale-tags-store.data",
+        "selected-tags.children",
+        "content-panel-info.children",
+    ]),
+    "change map view": ("view-radio", "value", ["mun-map.figure"]),
+    "search a country on the map": ("search-country", "value", ["mun-map.figure"]),
+}
+
+NO_UPDATE = "__no_update__"
+
+# (namespace, function, arguments, expected result); NO_UPDATE stands for
+# window.dash_clientside.no_update
+CLIENTSIDE_CASES = [
+    ("ui", "toggle_page", [1, None, "data"], "map"),
+    ("ui", "toggle_page", [1, 1, "map"], "data"),
+    ("ui", "request_view", ["map", ["data"]], "map"),
+    ("ui", "request_view", ["map", ["data", "map"]], NO_UPDATE),
+    ("ui", "update_visibility", ["map"], [{"display": "block"}, {"display": "none"}]),
+    ("ui", "hide_scale_block", ["global"], {"display": "none"}),
+    ("ui", "update_scale_title", ["region"], "Select Region"),
+    ("ui", "show_correct_tab", ["numbers"],
+     [{"display": "none"}, {"display": "none"}, {"display": "block"}, {"display": "none"}]),
+    ("ui", "style_tabs", ["plots", [{"tab": "info"}, {"tab": "plots"}]], ["top-tab", "top-tab active"]),
+    ("geo", "load_geo_options", ["continent", {"continents": ["ASIA"]}],
+     [{"label": "ASIA", "value": "ASIA"}]),
+    ("geo", "update_region_dropdown", ["Global", {}], [[{"label": "Global", "value": "Global"}], "Global"]),
+    ("geo", "update_country_search", ["EUROPE", "Continent", {"by_continent": {"EUROPE": ["FRANCE"]}}],
+     [{"label": "FRANCE", "value": "FRANCE"}]),
+]
+
+# Loads clientside.js into a browser-like `window` and prints, as JSON, which
+# referenced functions are missing and the result of every case
+NODE_HARNESS = """
+var window = {dash_clientside: {no_update: "%(no_update)s", callback_context: {triggered: []}}};
+%(script)s
+var clientside = window.dash_clientside;
+var input = %(input)s;
+var missing = input.functions.filter(function (f) {
+    return !clientside[f[0]] || typeof clientside[f[0]][f[1]] !== "function";
+});
+var results = input.cases.map(function (c) {
+    return clientside[c[0]][c[1]].apply(null, c[2]);
+});
+console.log(JSON.stringify({missing: missing, results: results}));
+"""
+
+
+def parse_id(raw):
+    """Component id as sent by Dash: plain string or JSON for pattern ids."""
+    if raw.startswith("{"):
+        return json.loads(raw)
+    return raw
+
+
+def parse_outputs(output):
+    """'a.b' or '..a.b...c.d..' -> [(id, prop), ...] (allow_duplicate suffixes dropped)"""
+    parts = output[2:-2].split("...") if output.startswith("..") else [output]
+    outputs = []
+    for part in parts:
+        comp, prop = part.rsplit(".", 1)
+        outputs.append((parse_id(comp), prop.split("@")[0]))
+    return outputs
+
+
+def id_matches(dep_id, comp_id):
+    """Pattern ids match on their non-wildcard keys (e.g. type)."""
+    if isinstance(dep_id, dict) and isinstance(comp_id, dict):
+        return all(dep_id.get(k) == v for k, v in comp_id.items())
+    return dep_id == comp_id
+
+
+def load_dependencies(app):
+    client = app.server.test_client()
+    deps = client.get("/_dash-dependencies").get_json()
+    return [
+        {
+            "name": dep["output"],
+            "inputs": [(parse_id(i["id"]) if isinstance(i["id"], str) else i["id"], i["property"])
+                       for i in dep["inputs"]],
+            "outputs": parse_outputs(dep["output"]),
+            "clientside": dep.get("clientside_function"),
+        }
+        for dep in deps
+    ]
+
+
+def first_output(dep):
+    """'id.prop' of the callback's first output, the name INTERACTIONS uses."""
+    comp, prop = dep["outputs"][0]
+    return f"{json.dumps(comp, sort_keys=True) if isinstance(comp, dict) else comp}.{prop}"
+
+
+def triggered_by(deps, comp_id, prop):
+    """All callbacks reached from one changed property, following outputs."""
+    reached = []
+    frontier = [(comp_id, prop)]
+    seen_props = set()
+
+    while frontier:
+        comp, p = frontier.pop()
+        key = (json.dumps(comp, sort_keys=True), p)
+        if key in seen_props:
+            continue
+        seen_props.add(key)
+
+        for dep in deps:
+            if dep in reached:
+                continue
+            if any(id_matches(i, comp) and ip == p for i, ip in dep["inputs"]):
+                reached.append(dep)
+                frontier.extend(dep["outputs"])
+
+    return reached
+
+
+def round_trips(deps, comp_id, prop):
+    """(server-side callbacks by first output, clientside callbacks) one change reaches."""
+    reached = triggered_by(deps, comp_id, prop)
+    server = [first_output(d) for d in reached if not d["clientside"]]
+    client = [d for d in reached if d["clientside"]]
+    return server, client
+
+
+def unexpected_callbacks(server, allowed):
+    """Server-side callbacks reached beyond the allowed ones (counting repeats)."""
+    return list((Counter(server) - Counter(allowed)).elements())
+
+
+def check_interactions(deps):
+    """Print the round trips per interaction; return the failure messages."""
+    failures = []
+
+    print(f"{'interaction':34} {'server':>6} {'client':>6} {'budget':>6}")
+    for name, (comp_id, prop, allowed) in INTERACTIONS.items():
+        server, client = round_trips(deps, comp_id, prop)
+
+        print(f"{name:34} {len(server):>6} {len(client):>6} {len(allowed):>6}")
+        unexpected = unexpected_callbacks(server, allowed)
+        if unexpected:
+            failures.append(f"{name}: unexpected server-side callbacks:\n  " + "\n  ".join(unexpected))
+
+    return failures
+
+
+def clientside_functions(deps):
+    """(namespace, function) of every clientside callback in the graph."""
+    return sorted({
+        (d["clientside"]["namespace"], d["clientside"]["function_name"]) for d in deps if d["clientside"]
+    })
+
+
+def run_clientside(deps, node):
+    """Load clientside.js under Node.js and run CLIENTSIDE_CASES; return the failure messages."""
+    functions = clientside_functions(deps)
+    with open(CLIENTSIDE_JS, encoding="utf-8") as f:
+        script = NODE_HARNESS % {
+            "no_update": NO_UPDATE,
+            "script": f.read(),
+            "input": json.dumps({"functions": functions, "cases": [c[:3] for c in CLIENTSIDE_CASES]}),
+        }
+    out = subprocess.run([node, "-e", script], check=True, capture_output=True, text=True)
+    report = json.loads(out.stdout)
+
+    failures = [f"clientside function missing from clientside.js: {ns}.{fn}" for ns, fn in report["missing"]]
+    for (ns, fn, args, expected), result in zip(CLIENTSIDE_CASES, report["results"]):
+        if result != expected:
+            failures.append(f"{ns}.{fn}{tuple(args)} returned {result!r}, expected {expected!r}")
+    return failures
+
+
+def check_clientside(deps, node=None):
+    """Run clientside.js under Node.js; return the failure messages (None when skipped)."""
+    node = node or shutil.which("node")
+    if node is None:
+        print("\nclientside checks skipped: node not found")
+        return None
+
+    failures = run_clientside(deps, node)
+    functions = clientside_functions(deps)
+    print(f"\nclientside: {len(functions)} functions referenced, {len(CLIENTSIDE_CASES)} cases run")
+    return failures
+
+
+def main():
+    from app import app
+
+    deps = load_dependencies(app)
+    failures = check_interactions(deps)
+    failures += check_clientside(deps) or []
+
+    for failure in failures:
+        print(f"\nFAIL {failure}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+# benchmarks/compare.py
+"""
+Compare two reports written by benchmarks.run, e.g. main vs. a branch:
+
+    python -m benchmarks.compare main.json branch.json
+"""
+import argparse
+import json
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark reports.")
+    parser.add_argument("base")
+    parser.add_argument("other")
+    args = parser.parse_args()
+
+    base, other = load(args.base), load(args.other)
+
+    print(f"{'benchmark':36} {'base ms':>10} {'other ms':>10} {'ratio':>7} {'base B':>10} {'other B':>10} "
+          f"{'base gz':>10} {'other gz':>10}")
+    for name in sorted(set(base) | set(other)):
+        b, o = base.get(name, {}), other.get(name, {})
+        b_ms, o_ms = b.get("median_ms"), o.get("median_ms")
+        ratio = f"{o_ms / b_ms:6.2f}x" if b_ms and o_ms else ""
+        print(
+            f"{name:36} {b_ms if b_ms is not None else '-':>10} {o_ms if o_ms is not None else '-':>10} "
+            f"{ratio:>7} {b.get('payload_bytes', '-'):>10} {o.get('payload_bytes', '-'):>10} "
+            f"{b.get('gzip_bytes', '-'):>10} {o.get('gzip_bytes', '-'):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
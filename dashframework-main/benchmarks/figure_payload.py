@@ -0,0 +1,94 @@
+# benchmarks/figure_payload.py
+"""
+Response payload of the figures, plain JSON versus compact encoding.
+
+Builds the global-scope map of every category on the synthetic fixtures
+(or an existing DATA_DIR with --data-dir) plus one figure per Visualisation
+type, and reports the bytes Dash would send for each as plain JSON and
+after `compact_figure`. Exits with 1 when a compact figure is not smaller.
+
+Run from the dashframework-main folder:
+
+    python -m benchmarks.figure_payload --countries 190 --years 30 --attributes 20
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+from benchmarks.fixtures import write_fixtures
+from benchmarks.run import payload_bytes
+
+
+def payload_report():
+    """{figure name: {"plain": bytes, "compact": bytes, "saved": fraction}}"""
+    from jbi100_app.callbacks import map_callbacks
+    from jbi100_app.callbacks.data_callbacks import prepare_dataframe
+    from jbi100_app.data_loader import CATEGORY_ATTRIBUTES
+    from jbi100_app.figure_encoding import compact_figure
+    from jbi100_app.Visualisation import ScatterVis, BarVis, HistVis
+
+    figures = {}
+    for category, attrs in CATEGORY_ATTRIBUTES.items():
+        figure, _ = map_callbacks.build_base_figure(category, attrs[0][0], "Global", "Global")
+        figures[f"map.global.{category}"] = figure
+
+    category = next(iter(CATEGORY_ATTRIBUTES))
+    (x, _), (y, _) = CATEGORY_ATTRIBUTES[category][:2]
+    df = prepare_dataframe([{"id": f"{category}::{x}"}, {"id": f"{category}::{y}"}], [], "global")
+    figures["scatter"] = ScatterVis(x, y).render(df)
+    figures["bar"] = BarVis("Country", y).render(df)
+    figures["hist"] = HistVis(x).render(df)
+
+    report = {}
+    for name, figure in figures.items():
+        plain = payload_bytes(figure)
+        compact = payload_bytes(compact_figure(figure))
+        report[name] = {"plain": plain, "compact": compact, "saved": round(1 - compact / plain, 3)}
+    return report
+
+
+def print_table(report):
+    print(f"{'figure':30} {'plain':>12} {'compact':>12} {'saved':>7}")
+    for name, sizes in report.items():
+        print(f"{name:30} {sizes['plain']:>12,} {sizes['compact']:>12,} {sizes['saved']:>7.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Figure payload before/after compact encoding.")
+    parser.add_argument("--data-dir", help="measure this folder instead of synthetic fixtures")
+    parser.add_argument("--countries", type=int, default=190)
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--attributes", type=int, default=10)
+    parser.add_argument("--categories", type=int, default=4)
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="jbi100-payload-") as folder:
+        data_dir = args.data_dir
+        if data_dir is None:
+            data_dir, info_path = write_fixtures(
+                folder, args.countries, args.years, args.attributes, args.categories
+            )
+            os.environ["JBI100_COUNTRY_INFO"] = info_path
+        os.environ.update({
+            "JBI100_DATA_DIR": data_dir,
+            "JBI100_CACHE_DIR": os.path.join(folder, "cache"),
+        })
+
+        report = payload_report()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_table(report)
+
+    failures = [name for name, sizes in report.items() if sizes["compact"] >= sizes["plain"]]
+    for name in failures:
+        print(f"FAIL {name}: compact encoding is not smaller", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
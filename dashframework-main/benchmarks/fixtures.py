@@ -0,0 +1,55 @@
+# benchmarks/fixtures.py
+"""
+Synthetic CSV fixtures shaped like the real datasets: one CSV per category
+with a Country column, a Year column and numeric attributes, plus a country
+info CSV for the Info tab.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from jbi100_app.geo import UN_COUNTRIES, COUNTRY_TO_CONTINENT, COUNTRY_TO_REGION
+
+
+def write_fixtures(folder, countries=150, years=20, attributes=10, categories=4, seed=0):
+    """
+    Write `categories` CSVs of countries x years rows and `attributes`
+    numeric columns each into `folder`/data, plus `folder`/country_info.csv.
+    Returns (data_dir, country_info_path).
+    """
+    rng = np.random.default_rng(seed)
+    data_dir = os.path.join(folder, "data")
+    os.makedirs(data_dir, exist_ok=True)
+
+    names = sorted(UN_COUNTRIES)[:countries]
+
+    for c in range(categories):
+        df = pd.DataFrame({
+            # Mixed case + padding, like the raw CSVs, so normalisation has work to do
+            "Country": np.repeat([f" {n.title()} " for n in names], years),
+            "Year": np.tile(np.arange(2024 - years, 2024), len(names)),
+        })
+        for a in range(attributes):
+            values = rng.lognormal(3, 2, len(df))
+            values[rng.random(len(df)) < 0.05] = np.nan
+            df[f"attribute_{c}_{a}"] = values
+        df.to_csv(os.path.join(data_dir, f"category_{c}.csv"), index=False)
+
+    info = pd.DataFrame({
+        "Country": names,
+        "Written_name": [n.title() for n in names],
+        "Capital": "Capital",
+        "Government_Type": "republic",
+        "Suffrage_Age": "18 years of age",
+        "Total_Population": rng.integers(10_000, 1_000_000_000, len(names)),
+        "Area_Total": [f"{a:,} sq km" for a in rng.integers(100, 10_000_000, len(names))],
+        "Continent": [COUNTRY_TO_CONTINENT.get(n, "Unknown") for n in names],
+        "Region": [COUNTRY_TO_REGION.get(n, "Unknown") for n in names],
+        "Description": "Synthetic country used for benchmarking.",
+        "Wiki_link": "",
+    })
+    info_path = os.path.join(folder, "country_info.csv")
+    info.to_csv(info_path, index=False)
+
+    return data_dir, info_path
@@ -0,0 +1,74 @@
+# benchmarks/memory.py
+"""
+Per-category memory of the loaded datasets, with and without compact dtypes.
+
+Loads the synthetic fixtures (or an existing DATA_DIR with --data-dir) via
+`load_datasets(compact=True)` and reports the deep memory size of every
+category frame before and after conversion.
+
+Run from the dashframework-main folder:
+
+    python -m benchmarks.memory --countries 190 --years 30 --attributes 20
+"""
+import argparse
+import json
+import os
+import tempfile
+
+from benchmarks.fixtures import write_fixtures
+
+
+def memory_report(data_dir):
+    """{category: {"before": bytes, "after": bytes, "saved": fraction}}"""
+    from jbi100_app.data_loader import load_datasets
+
+    memory = {}
+    load_datasets(data_dir, use_cache=False, compact=True, memory=memory)
+    for sizes in memory.values():
+        sizes["saved"] = round(1 - sizes["after"] / sizes["before"], 3) if sizes["before"] else 0.0
+    return memory
+
+
+def print_table(memory):
+    print(f"{'category':30} {'before':>12} {'after':>12} {'saved':>7}")
+    for category, sizes in memory.items():
+        print(f"{category:30} {sizes['before']:>12,} {sizes['after']:>12,} {sizes['saved']:>7.1%}")
+
+    before = sum(s["before"] for s in memory.values())
+    after = sum(s["after"] for s in memory.values())
+    if before:
+        print(f"{'total':30} {before:>12,} {after:>12,} {1 - after / before:>7.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dataset memory before/after compact dtypes.")
+    parser.add_argument("--data-dir", help="measure this folder instead of synthetic fixtures")
+    parser.add_argument("--countries", type=int, default=190)
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--attributes", type=int, default=10)
+    parser.add_argument("--categories", type=int, default=4)
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="jbi100-memory-") as folder:
+        data_dir = args.data_dir
+        if data_dir is None:
+            data_dir, info_path = write_fixtures(
+                folder, args.countries, args.years, args.attributes, args.categories
+            )
+            os.environ["JBI100_COUNTRY_INFO"] = info_path
+        os.environ.update({
+            "JBI100_DATA_DIR": data_dir,
+            "JBI100_CACHE_DIR": os.path.join(folder, "cache"),
+        })
+
+        memory = memory_report(data_dir)
+
+    if args.json:
+        print(json.dumps(memory, indent=2))
+    else:
+        print_table(memory)
+
+
+if __name__ == "__main__":
+    main()
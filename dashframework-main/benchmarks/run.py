@@ -0,0 +1,224 @@
+# benchmarks/run.py
+"""
+Startup and callback latency benchmarks for the Dash app.
+
+Generates synthetic CSV fixtures in a temporary DATA_DIR, then times the
+app import (cold and with a warm snapshot cache), dataset loading and the
+Python side of the heavy callbacks, and measures the JSON payload size of
+what they return, uncompressed and as the server would gzip/brotli it.
+Results are written as JSON so branches can be compared with
+`python -m benchmarks.compare`.
+
+Run from the dashframework-main folder:
+
+    python -m benchmarks.run --countries 190 --years 30 --attributes 20 -o report.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.fixtures import write_fixtures
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); import app; "
+    "print(time.perf_counter() - t)"
+)
+
+
+def timed(fn, repeat):
+    """Run fn `repeat` times; return timing stats (ms) and the last result."""
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return {
+        "min_ms": round(min(times), 3),
+        "median_ms": round(statistics.median(times), 3),
+        "max_ms": round(max(times), 3),
+        "repeat": repeat,
+    }, result
+
+
+def payload_bytes(obj):
+    """Size of `obj` serialised the way Dash sends it to the browser."""
+    import plotly
+
+    if hasattr(obj, "to_plotly_json"):
+        obj = obj.to_plotly_json()
+    return len(json.dumps(obj, cls=plotly.utils.PlotlyJSONEncoder).encode("utf-8"))
+
+
+def wire_bytes(obj):
+    """
+    Bytes on the wire of `obj` per response encoding the server can produce
+    ({"gzip_bytes": ..., "br_bytes": ...}), see jbi100_app.responses.
+    """
+    import plotly
+    from jbi100_app.responses import available_encodings, compress
+
+    if hasattr(obj, "to_plotly_json"):
+        obj = obj.to_plotly_json()
+    data = json.dumps(obj, cls=plotly.utils.PlotlyJSONEncoder).encode("utf-8")
+    return {
+        f"{encoding}_bytes": len(compress(data, encoding))
+        for encoding in available_encodings(["gzip", "br"])
+    }
+
+
+def time_import(env, repeat):
+    """Wall time of `import app` in a fresh interpreter."""
+    times = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET],
+            cwd=APP_ROOT, env=env, check=True, capture_output=True, text=True,
+        )
+        times.append(float(out.stdout.strip().splitlines()[-1]) * 1000)
+    return {
+        "min_ms": round(min(times), 3),
+        "median_ms": round(statistics.median(times), 3),
+        "max_ms": round(max(times), 3),
+        "repeat": repeat,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=APP_ROOT, check=True, capture_output=True, text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_callbacks(repeat):
+    """In-process timings; must run after the environment points at the fixtures."""
+    from jbi100_app import data_loader
+    from jbi100_app.data_loader import DATASETS, CATEGORY_ATTRIBUTES, DATA_INFO
+    from jbi100_app.callbacks import map_callbacks
+    from jbi100_app.callbacks.data_callbacks import prepare_dataframe, update_numbers_page, COUNTRY_INFO
+    from jbi100_app.views.data_tabs.tab_numbers import render_numbers_tab
+    from jbi100_app.views.data_tabs.tab_info import render_info_tab
+
+    results = {}
+
+    def record(name, fn, payload=False):
+        stats, result = timed(fn, repeat)
+        if payload and result is not None:
+            stats["payload_bytes"] = payload_bytes(result)
+            stats.update(wire_bytes(result))
+        results[name] = stats
+        return result
+
+    record("load_datasets.no_cache", lambda: data_loader.load_datasets(use_cache=False))
+    record("load_datasets.cache", lambda: data_loader.load_datasets(use_cache=True))
+
+    categories = list(CATEGORY_ATTRIBUTES)
+    cat = categories[0]
+    attr = CATEGORY_ATTRIBUTES[cat][0][0]
+    DATASETS[cat]  # first load is part of the startup numbers, not the callbacks
+
+    one_cat = [{"id": f"{cat}::{raw}"} for raw, _ in CATEGORY_ATTRIBUTES[cat][:3]]
+    multi_cat = [{"id": f"{c}::{CATEGORY_ATTRIBUTES[c][0][0]}"} for c in categories[:3]]
+    europe = [{"id": "EUROPE"}]
+
+    record("prepare_dataframe.global", lambda: prepare_dataframe(one_cat, [], "global"))
+    record("prepare_dataframe.continent", lambda: prepare_dataframe(one_cat, europe, "continent"))
+    record("prepare_dataframe.multi_category", lambda: prepare_dataframe(multi_cat, [], "global"))
+
+    def map_cold():
+        cache = getattr(map_callbacks, "FIGURE_CACHE", None)
+        if cache is not None:
+            cache.clear()
+        return map_callbacks.update_map(cat, attr, "Global", "Global", None)
+
+    def map_warm(view, region):
+        def call():
+            return map_callbacks.update_map(cat, attr, view, region, None)
+        # Fill the figure cache first, so every timed call is a cache hit
+        call()
+        return call
+
+    record("update_map.global.cold", map_cold, payload=True)
+    record("update_map.global.warm", map_warm("Global", "Global"), payload=True)
+    record("update_map.continent.warm", map_warm("Continent", "EUROPE"), payload=True)
+
+    df = prepare_dataframe(one_cat, [], "global")
+    record("render_numbers_tab.global", lambda: render_numbers_tab(df), payload=True)
+    record("update_numbers_page.global",
+           lambda: update_numbers_page(0, 25, [], "", one_cat, [], "global"), payload=True)
+
+    country = [{"id": DATA_INFO["Country"].iloc[0], "label": DATA_INFO["Country"].iloc[0]}]
+    record("render_info_tab", lambda: render_info_tab(one_cat, country, "country", COUNTRY_INFO), payload=True)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark app startup and callbacks.")
+    parser.add_argument("--countries", type=int, default=190)
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--attributes", type=int, default=10)
+    parser.add_argument("--categories", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("-o", "--output", help="write the JSON report here (default: stdout)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="jbi100-bench-") as folder:
+        data_dir, info_path = write_fixtures(
+            folder, args.countries, args.years, args.attributes, args.categories
+        )
+        cache_dir = os.path.join(folder, "cache")
+
+        os.environ.update({
+            "JBI100_DATA_DIR": data_dir,
+            "JBI100_COUNTRY_INFO": info_path,
+            "JBI100_CACHE_DIR": cache_dir,
+        })
+        env = dict(os.environ)
+
+        startup = {
+            "import.no_cache": time_import({**env, "JBI100_DATA_CACHE": "0"}, args.repeat),
+        }
+        # First run fills the snapshot cache, the rest measure a warm start
+        time_import(env, 1)
+        startup["import.warm_cache"] = time_import(env, args.repeat)
+
+        if APP_ROOT not in sys.path:
+            sys.path.insert(0, APP_ROOT)
+        callbacks = run_callbacks(args.repeat)
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "countries": args.countries,
+            "years": args.years,
+            "attributes": args.attributes,
+            "categories": args.categories,
+        },
+        "results": {**startup, **callbacks},
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
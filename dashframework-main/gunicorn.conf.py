@@ -0,0 +1,43 @@
+# gunicorn.conf.py
+"""
+gunicorn settings for serving the dashboard with several worker processes:
+
+    gunicorn app:server
+
+The app is imported once in the master with every dataset preloaded, so
+the forked workers share those frames copy-on-write. Loaded datasets are
+also published to the shared-memory store, which workers started later
+(e.g. after a restart) attach to instead of loading their own copy.
+"""
+import gc
+import multiprocessing
+import os
+
+# Read by jbi100_app.config when the master imports the app
+os.environ.setdefault("JBI100_PRELOAD_DATASETS", "1")
+os.environ.setdefault("JBI100_SHARED_STORE", "1")
+# The data watcher is started per worker in post_fork, never in the master
+os.environ["JBI100_WATCH_STARTED_BY_SERVER"] = "1"
+
+bind = os.environ.get("JBI100_BIND", "0.0.0.0:8050")
+workers = int(os.environ.get("JBI100_WORKERS", multiprocessing.cpu_count()))
+preload_app = True
+
+
+def when_ready(server):
+    # Everything loaded so far lives as long as the master: move it out of
+    # the GC's reach so collections in the workers do not write to (and
+    # un-share) the pages holding it
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # The data watcher thread (JBI100_WATCH_DATA=1) runs in the workers only:
+    # threads are not inherited by forks, and one in the master could be
+    # holding the registry lock when a worker is forked
+    from jbi100_app.config import WATCH_DATA_DIR, WATCH_INTERVAL
+    from jbi100_app.data_loader import DATASETS
+    from jbi100_app.watcher import start_watcher
+
+    if WATCH_DATA_DIR:
+        start_watcher(DATASETS, WATCH_INTERVAL)
@@ -2,7 +2,12 @@
 # visualisations.py
 # ============================
 
-import plotly.express as px
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from jbi100_app.config import COMPACT_FIGURES, WEBGL_MIN_POINTS
+from jbi100_app.figure_encoding import compact_figure
 
 
 # ==========================================
@@ -40,6 +45,60 @@ class Visualisation:
         """
         raise NotImplementedError
 
+    def figure(self, df):
+        """
+        render(df) ready to send to a dcc.Graph: with COMPACT_FIGURES the
+        numeric arrays are typed arrays and the layout is trimmed.
+        """
+        fig = self.render(df)
+        return compact_figure(fig) if COMPACT_FIGURES else fig
+
+
+# ==========================================
+# Array helpers
+# ==========================================
+
+def column_values(df, name):
+    """Column as a NumPy array: float for numeric columns, object otherwise."""
+    col = df[name]
+    if pd.api.types.is_numeric_dtype(col) and not isinstance(col.dtype, pd.CategoricalDtype):
+        return col.to_numpy(dtype=float, na_value=np.nan)
+    return col.astype(object).to_numpy()
+
+
+def numeric_values(df, name):
+    """
+    Column as a float array for attributes that must be numbers. Text that
+    does not parse as a number becomes NaN; a column with values but no
+    numbers at all is rejected.
+    """
+    values = column_values(df, name)
+    if is_numeric(values):
+        return values
+    numbers = pd.to_numeric(df[name].astype(object), errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    if df[name].notna().any() and np.isnan(numbers).all():
+        raise ValueError(f"{name!r} is not a numeric attribute")
+    return numbers
+
+
+def is_numeric(values):
+    return values.dtype.kind == "f"
+
+
+def scatter_trace_type(n_points):
+    """WebGL above WEBGL_MIN_POINTS points, SVG below (sharper, lighter for few points)."""
+    return go.Scattergl if n_points > WEBGL_MIN_POINTS else go.Scatter
+
+
+def base_layout(title, x_title=None, y_title=None):
+    return dict(
+        title=title,
+        xaxis_title=x_title,
+        yaxis_title=y_title,
+        legend_tracegroupgap=0,
+        margin=dict(t=60),
+    )
+
 
 # ==========================================
 # Scatter Plot
@@ -63,15 +122,42 @@ class ScatterVis(Visualisation):
         self.title = title or "Scatter Plot"
 
     def render(self, df):
-        fig = px.scatter(
-            df,
-            x=self.x,
-            y=self.y,
-            color=self.color,
-            hover_name="Country",
-            title=self.title,
+        x = column_values(df, self.x)
+        y = column_values(df, self.y)
+        names = df["Country"].astype(object).to_numpy()
+        trace_type = scatter_trace_type(len(df))
+
+        hovertemplate = (
+            "<b>%{hovertext}</b><br><br>"
+            f"{self.x}=" + "%{x}<br>"
+            f"{self.y}=" + "%{y}"
         )
-        fig.update_layout(title=self.title)
+
+        if not self.color:
+            traces = [trace_type(x=x, y=y, hovertext=names, mode="markers",
+                                 hovertemplate=hovertemplate + "<extra></extra>")]
+        else:
+            color = column_values(df, self.color)
+            if is_numeric(color):
+                # Continuous colour, one trace
+                traces = [trace_type(
+                    x=x, y=y, hovertext=names, mode="markers",
+                    marker=dict(color=color, colorscale="Plasma", showscale=True,
+                                colorbar=dict(title=self.color)),
+                    hovertemplate=hovertemplate + f"<br>{self.color}=" + "%{marker.color}<extra></extra>",
+                )]
+            else:
+                # Discrete colour, one trace per group
+                groups, codes = np.unique(color.astype(str), return_inverse=True)
+                traces = [
+                    trace_type(x=x[codes == i], y=y[codes == i], hovertext=names[codes == i],
+                               mode="markers", name=group, legendgroup=group,
+                               hovertemplate=hovertemplate + f"<br>{self.color}={group}<extra></extra>")
+                    for i, group in enumerate(groups)
+                ]
+
+        fig = go.Figure(data=traces)
+        fig.update_layout(**base_layout(self.title, self.x, self.y))
         return fig
 
 
@@ -97,15 +183,51 @@ class BarVis(Visualisation):
         self.title = title or "Bar Chart"
 
     def render(self, df):
-        fig = px.bar(
-            df,
-            x=self.x,
-            y=self.y,
-            color=self.color,
-            hover_name="Country" if self.x == "Country" else None,
-            title=self.title
-        )
-        fig.update_layout(title=self.title)
+        """
+        One bar per group: rows sharing an x value are summed server-side
+        (the height the stacked per-row segments used to add up to). A
+        numeric colour attribute is averaged per group; any other colour
+        column stacks one trace per colour group.
+        """
+        codes, groups = pd.factorize(df[self.x], sort=True)
+        groups = np.asarray(groups, dtype=object)
+        y = numeric_values(df, self.y)
+        # Rows without a group (code -1) or value are left out
+        present = (codes >= 0) & ~np.isnan(y)
+
+        hovertemplate = f"{self.x}=" + "%{x}<br>" + f"{self.y}=" + "%{y}"
+        color = column_values(df, self.color) if self.color else None
+
+        if color is None or is_numeric(color):
+            marker = {}
+            if color is not None:
+                known = (codes >= 0) & ~np.isnan(color)
+                sums = np.bincount(codes[known], weights=color[known], minlength=len(groups))
+                counts = np.bincount(codes[known], minlength=len(groups))
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    means = sums / counts
+                marker = dict(color=means, colorscale="Plasma", showscale=True,
+                              colorbar=dict(title=self.color))
+                hovertemplate += f"<br>{self.color} (mean)=" + "%{marker.color}"
+
+            totals = np.bincount(codes[present], weights=y[present], minlength=len(groups))
+            traces = [go.Bar(x=groups, y=totals, marker=marker,
+                             hovertemplate=hovertemplate + "<extra></extra>")]
+        else:
+            # Discrete colour, one stacked trace per group holding its share of every bar
+            names, color_codes = np.unique(color.astype(str), return_inverse=True)
+            traces = []
+            for i, name in enumerate(names):
+                rows = present & (color_codes == i)
+                totals = np.bincount(codes[rows], weights=y[rows], minlength=len(groups))
+                has_rows = np.bincount(codes[rows], minlength=len(groups)) > 0
+                traces.append(go.Bar(
+                    x=groups[has_rows], y=totals[has_rows], name=name, legendgroup=name,
+                    hovertemplate=hovertemplate + f"<br>{self.color}={name}<extra></extra>",
+                ))
+
+        fig = go.Figure(data=traces)
+        fig.update_layout(**base_layout(self.title, self.x, self.y), barmode="stack")
         return fig
 
 
@@ -129,13 +251,35 @@ class HistVis(Visualisation):
         self.title = title or "Histogram"
 
     def render(self, df):
-        fig = px.histogram(
-            df,
-            x=self.x,
-            nbins=self.bins,
-            title=self.title
-        )
-        fig.update_layout(title=self.title)
+        """
+        Binned server-side, so only the bin counts are sent to the browser.
+        A categorical or text attribute gets one bar per category instead.
+        """
+        values = column_values(df, self.x)
+        if not is_numeric(values):
+            counts = df[self.x].value_counts()
+            fig = go.Figure(go.Bar(
+                x=counts.index.astype(str).to_numpy(dtype=object),
+                y=counts.to_numpy(),
+                hovertemplate=f"{self.x}=" + "%{x}<br>count=%{y}<extra></extra>",
+            ))
+            fig.update_layout(**base_layout(self.title, self.x, "count"))
+            return fig
+
+        values = values[np.isfinite(values)]
+        counts, edges = np.histogram(values, bins=max(int(self.bins or 1), 1))
+
+        fig = go.Figure(go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=counts,
+            width=np.diff(edges),
+            customdata=np.column_stack([edges[:-1], edges[1:]]),
+            hovertemplate=(
+                f"{self.x}=" + "%{customdata[0]:.4g} – %{customdata[1]:.4g}<br>"
+                "count=%{y}<extra></extra>"
+            ),
+        ))
+        fig.update_layout(**base_layout(self.title, self.x, "count"), bargap=0)
         return fig
 
 
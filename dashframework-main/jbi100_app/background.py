@@ -0,0 +1,165 @@
+# jbi100_app/background.py
+"""
+Optional background execution of the heavy callbacks (map, data tabs).
+
+With JBI100_BACKGROUND=1 those callbacks run as jobs of a diskcache backed
+manager: every job is a separate process, results are stored in a local
+diskcache folder, so no broker is needed and a slow figure no longer holds a
+request worker. Without it (or without dash[diskcache] installed) everything
+stays synchronous.
+
+Each job runs in a fresh process, so whatever a job puts in a process-local
+cache (e.g. the map's FIGURE_CACHE) is gone when it ends. Background mode
+therefore needs the shared cache (JBI100_SHARED_CACHE, on by default) so
+figures computed by one job are reused by the next; without it the
+callbacks also stay synchronous.
+
+Jobs are forked from the worker, where the data watcher thread or another
+request may hold a lock of DATASETS or of a cache at that moment. Those
+objects are registered with cache.reinit_after_fork, so the job process
+gets fresh locks (and a DATASETS state no thread was halfway through
+changing) instead of a lock nobody in it will ever release.
+"""
+import logging
+import os
+import time
+
+from dash import DiskcacheManager
+
+from jbi100_app.config import (
+    USE_SHARED_CACHE,
+    BACKGROUND_CALLBACKS,
+    BACKGROUND_CACHE_DIR,
+    BACKGROUND_RESULT_TTL,
+    BACKGROUND_POLL_MS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Job handle of a request that is answered from the result cache
+NO_JOB = "0"
+
+# How long a job slot may stay claimed before its process is started
+CLAIM_TIMEOUT = 5
+
+
+def data_signature():
+    """
+    Identity of the source data, part of every job's cache key so cached
+    results are not reused once a CSV changes.
+    """
+    from jbi100_app.data_loader import DATASETS
+
+    return [(category, DATASETS.fingerprint(category)) for category in sorted(DATASETS)]
+
+
+class JobManager(DiskcacheManager):
+    """
+    DiskcacheManager that shares work between identical requests.
+
+    A request whose result is still cached starts no job at all, and one that
+    matches a running job attaches to it instead of starting a second process.
+    Attached requests are counted, so cancelling one of them (the browser does
+    so when the inputs change mid-job) only kills the job once nobody else is
+    waiting for it.
+    """
+
+    PENDING = "pending"
+
+    @staticmethod
+    def _job_key(key):
+        return f"{key}-job"
+
+    @staticmethod
+    def _waiters_key(job):
+        return f"job-{job}-waiters"
+
+    def call_job_fn(self, key, job_fn, args, context):
+        job_key = self._job_key(key)
+
+        while True:
+            if self.result_ready(key):
+                return NO_JOB
+
+            # Atomic claim: only one request gets to start the job
+            if self.handle.add(job_key, self.PENDING, expire=CLAIM_TIMEOUT):
+                break
+
+            job = self.handle.get(job_key)
+            if job == self.PENDING:
+                time.sleep(0.01)
+                continue
+
+            if job is not None and self.job_running(job):
+                self.handle.incr(self._waiters_key(job))
+                return job
+
+            # Finished or cancelled without a result: drop the stale handle
+            with self.handle.transact():
+                if self.handle.get(job_key) == job:
+                    self.handle.delete(job_key)
+
+        job = super().call_job_fn(key, job_fn, args, context)
+        self.handle.set(self._waiters_key(job), 1, expire=self.expire)
+        self.handle.set(job_key, job, expire=self.expire)
+        return job
+
+    def job_running(self, job):
+        if job is None or str(job) == NO_JOB:
+            return False
+        return super().job_running(job)
+
+    def terminate_job(self, job):
+        if job is None or str(job) == NO_JOB:
+            return
+
+        waiters = self._waiters_key(job)
+        with self.handle.transact():
+            left = self.handle.decr(waiters, default=1)
+            if left <= 0:
+                self.handle.delete(waiters)
+
+        if left <= 0:
+            super().terminate_job(job)
+
+
+def make_manager(cache_dir=BACKGROUND_CACHE_DIR, expire=BACKGROUND_RESULT_TTL, shared_cache=USE_SHARED_CACHE):
+    """
+    JobManager on a local diskcache folder, or None (callbacks stay
+    synchronous) when dash[diskcache] is missing or the shared cache is off.
+    """
+    try:
+        # DiskcacheManager also needs psutil and multiprocess
+        import diskcache
+        import multiprocess  # noqa: F401
+        import psutil  # noqa: F401
+    except ImportError as e:
+        logger.warning("JBI100_BACKGROUND=1 needs dash[diskcache] (%s); callbacks stay synchronous", e)
+        return None
+
+    if not shared_cache:
+        logger.warning(
+            "JBI100_BACKGROUND=1 needs the shared cache (JBI100_SHARED_CACHE=1): jobs run in "
+            "their own processes and would rebuild every figure; callbacks stay synchronous"
+        )
+        return None
+
+    os.makedirs(cache_dir, exist_ok=True)
+    return JobManager(
+        diskcache.Cache(cache_dir),
+        cache_by=[data_signature],
+        expire=expire,
+    )
+
+
+BACKGROUND_MANAGER = make_manager() if BACKGROUND_CALLBACKS else None
+
+
+def background_options():
+    """
+    Extra app.callback() arguments for a heavy callback: run it as a
+    background job when a manager is configured, synchronously otherwise.
+    """
+    if BACKGROUND_MANAGER is None:
+        return {}
+    return {"background": True, "interval": BACKGROUND_POLL_MS}
@@ -0,0 +1,255 @@
+# jbi100_app/cache.py
+"""
+Caches shared by the callbacks.
+
+LRUCache lives in one process; concurrent misses on the same key are
+collapsed by a SingleFlight so only one thread computes the value. Backed by
+a DiskCache it also shares values between the worker processes of a
+multi-process deployment, computing each value in one process only.
+
+Their locks are replaced in processes forked from this one (see
+reinit_after_fork), e.g. background jobs forked from a worker.
+"""
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+from jbi100_app.config import SHARED_CACHE_DIR, USE_SHARED_CACHE, SHARED_CACHE_LOCK_TIMEOUT
+
+try:
+    import diskcache
+except ImportError:  # shared caches are simply disabled without diskcache
+    diskcache = None
+
+_MISSING = object()
+
+# Objects with a _lock to replace in a forked child, and the ones whose lock
+# is held across the fork, by id (not all of them are hashable)
+_AFTER_FORK = weakref.WeakValueDictionary()
+_HOLD_ACROSS_FORK = weakref.WeakValueDictionary()
+_HELD = []
+
+
+def reinit_after_fork(obj, hold_lock=False):
+    """
+    Call obj._after_fork() in every child process forked from this one.
+
+    Only the forking thread exists in the child, so a lock another thread
+    held at that moment would stay held there forever; _after_fork()
+    replaces the object's locks and drops work that was in flight. With
+    `hold_lock`, obj._lock is also taken for the fork itself, so the child
+    never copies state some thread was halfway through updating.
+    """
+    _AFTER_FORK[id(obj)] = obj
+    if hold_lock:
+        _HOLD_ACROSS_FORK[id(obj)] = obj
+    return obj
+
+
+def _before_fork():
+    _HELD[:] = list(_HOLD_ACROSS_FORK.values())
+    for obj in _HELD:
+        obj._lock.acquire()
+
+
+def _after_fork_in_parent():
+    for obj in reversed(_HELD):
+        obj._lock.release()
+    _HELD.clear()
+
+
+def _after_fork_in_child():
+    _HELD.clear()
+    for obj in list(_AFTER_FORK.values()):
+        obj._after_fork()
+
+
+if hasattr(os, "register_at_fork"):  # not on Windows, which does not fork
+    os.register_at_fork(
+        before=_before_fork,
+        after_in_parent=_after_fork_in_parent,
+        after_in_child=_after_fork_in_child,
+    )
+
+
+class _Call:
+    """One in-progress computation of a SingleFlight."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one computation.
+
+    The first caller for a key runs `compute()`; callers arriving while it
+    runs wait for it and get the same value (or exception).
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        reinit_after_fork(self)
+
+    def _after_fork(self):
+        # The leaders of these calls are threads of the parent process
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, compute):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = compute()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value
+
+
+class DiskCache:
+    """
+    Cache on a local diskcache folder, shared by every process using it.
+
+    get_or_compute() holds a cross-process lock per key while computing, so
+    workers missing the same key at once wait for the first one instead of
+    computing it again. The lock expires after `lock_timeout` seconds in case
+    its holder dies. Values must be picklable.
+    """
+
+    def __init__(self, directory, ttl=None, lock_timeout=SHARED_CACHE_LOCK_TIMEOUT):
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        self._cache = diskcache.Cache(directory)
+
+    def get(self, key, default=None):
+        return self._cache.get(key, default)
+
+    def set(self, key, value):
+        self._cache.set(key, value, expire=self.ttl)
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with diskcache.Lock(self._cache, ("lock", key), expire=self.lock_timeout):
+            # Another process may have filled it while we waited for the lock
+            value = self.get(key, _MISSING)
+            if value is _MISSING:
+                value = compute()
+                self.set(key, value)
+        return value
+
+    def clear(self):
+        self._cache.clear()
+
+
+def shared_cache(name, ttl=None):
+    """DiskCache `name` under SHARED_CACHE_DIR, or None when disabled."""
+    if not USE_SHARED_CACHE or diskcache is None:
+        return None
+    return DiskCache(os.path.join(SHARED_CACHE_DIR, name), ttl=ttl)
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache with an optional time-to-live per entry.
+
+    With a `shared` DiskCache, misses are looked up there (and computed
+    there at most once across processes) before falling back to compute().
+
+    Values are shared between callers, so they must not be modified after
+    being stored.
+    """
+
+    def __init__(self, maxsize=128, ttl=None, shared=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.shared = shared
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        reinit_after_fork(self)
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                return default
+
+            expires, value = item
+            if expires is not None and expires < time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        """
+        Cached value for `key`, calling `compute()` and storing it on a miss.
+        Concurrent misses on the same key share a single computation.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        def fill():
+            # The previous leader for this key may have just stored it
+            value = self.get(key, _MISSING)
+            if value is _MISSING:
+                if self.shared is not None:
+                    value = self.shared.get_or_compute(key, compute)
+                else:
+                    value = compute()
+                self.set(key, value)
+            return value
+
+        return self._flight.do(key, fill)
+
+    def discard(self, predicate):
+        """Drop the entries of this process whose key matches `predicate`."""
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def clear(self):
+        """Drop every entry, including those in the shared cache."""
+        with self._lock:
+            self._data.clear()
+        if self.shared is not None:
+            self.shared.clear()
+
+    def __len__(self):
+        return len(self._data)
@@ -1,18 +1,24 @@
 # jbi100_app/callbacks/data_callbacks.py
 
 import dash
-from dash import Input, Output, State, ALL, html, callback_context, no_update
+import pandas as pd
+from dash import Input, Output, State, ALL, ClientsideFunction, html, callback_context, no_update
 
 from main import app
+from jbi100_app.background import background_options
 from jbi100_app.views.data_view import make_tag, make_geo_tag
-from jbi100_app.data_loader import DATA_INFO, CATEGORY_ATTRIBUTES, ALL_COUNTRIES, DATASETS, COUNTRY_TO_CONTINENT, \
-    COUNTRY_TO_REGION
-from jbi100_app.views.data_tabs.tab_info import render_info_tab
+from jbi100_app.data_loader import DATA_INFO, CATEGORY_ATTRIBUTES, DATASETS, GEO_COLUMNS, GEO_INDEX, \
+    YEAR_COLUMN, GLOBAL_GROUP, prettify_attribute, attributes_by_category
+from jbi100_app.views.data_tabs.tab_info import render_info_tab, country_info_records
 from jbi100_app.views.data_tabs.tab_plots import render_plots_tab
-from jbi100_app.views.data_tabs.tab_numbers import render_numbers_tab
+from jbi100_app.views.data_tabs.tab_numbers import render_numbers_tab, table_page
 from jbi100_app.views.data_tabs.tab_create import render_create_tab
 
 
+# Info tab records, formatted once and looked up by country
+COUNTRY_INFO = country_info_records(DATA_INFO)
+
+
 # -------------------------------------------------------------
 # 1. RENDER ATTRIBUTE TAGS IN BOX
 # -------------------------------------------------------------
@@ -36,9 +42,10 @@ def render_geo_tags(tags):
 
 
 # -------------------------------------------------------------
-# 3. POPUP OPEN / CLOSE (visual only)
+# 3. POPUP OPEN / CLOSE (visual only, clientside)
 # -------------------------------------------------------------
-@app.callback(
+app.clientside_callback(
+    ClientsideFunction(namespace="ui", function_name="toggle_popup"),
     Output("popup-backdrop", "style"),
     Input("add-attribute", "n_clicks"),
     Input("popup-cancel", "n_clicks"),
@@ -46,15 +53,6 @@ def render_geo_tags(tags):
     State("popup-backdrop", "style"),
     prevent_initial_call=True
 )
-def toggle_popup(add_click, cancel_click, add_confirm, style):
-    ctx = callback_context
-
-    # OPEN POPUP
-    if ctx.triggered_id == "add-attribute":
-        return {**style, "display": "flex"}
-
-    # CLOSE POPUP
-    return {**style, "display": "none"}
 
 
 # -------------------------------------------------------------
@@ -92,10 +90,10 @@ def reset_or_update_popup(popup_style, category_values):
 
         options = []
         for cat in category_values:
-            for attr in CATEGORY_ATTRIBUTES[cat]:
+            for raw, pretty in CATEGORY_ATTRIBUTES[cat]:
                 options.append({
-                    "label": f"{cat} – {attr}",
-                    "value": f"{cat}::{attr}"
+                    "label": f"{cat} – {pretty}",
+                    "value": f"{cat}::{raw}"
                 })
 
         return category_values, options, None
@@ -104,25 +102,14 @@ def reset_or_update_popup(popup_style, category_values):
 
 
 # -------------------------------------------------------------
-# 5. LOAD GEO OPTIONS BASED ON SCALE
+# 5. LOAD GEO OPTIONS BASED ON SCALE (clientside, from geo-options-store)
 # -------------------------------------------------------------
-@app.callback(
+app.clientside_callback(
+    ClientsideFunction(namespace="geo", function_name="load_geo_options"),
     Output("scale-select-dropdown", "options"),
-    Input("geo-scale", "value")
+    Input("geo-scale", "value"),
+    State("geo-options-store", "data")
 )
-def load_geo_options(scale):
-    if scale == "continent":
-        return [{"label": c, "value": c}
-                for c in sorted(set(COUNTRY_TO_CONTINENT.values()))]
-
-    if scale == "region":
-        return [{"label": r, "value": r}
-                for r in sorted(set(COUNTRY_TO_REGION.values()))]
-
-    if scale == "country":
-        return [{"label": c, "value": c} for c in ALL_COUNTRIES]
-
-    return []
 
 
 # -------------------------------------------------------------
@@ -152,28 +139,18 @@ def update_geo_tag_list(selected, delete_clicks, existing):
     return existing
 
 
-@app.callback(
+# Scale block visibility + title (clientside)
+app.clientside_callback(
+    ClientsideFunction(namespace="ui", function_name="hide_scale_block"),
     Output("select-scale-block", "style"),
     Input("geo-scale", "value")
 )
-def hide_scale_block(scale):
-    if scale == "global":
-        return {"display": "none"}  # hide entire block
-    return {"display": "block"}
-
 
-@app.callback(
+app.clientside_callback(
+    ClientsideFunction(namespace="ui", function_name="update_scale_title"),
     Output("scale-select-title", "children"),
     Input("geo-scale", "value")
 )
-def update_scale_title(scale):
-    if scale == "continent":
-        return "Select Continent"
-    if scale == "region":
-        return "Select Region"
-    if scale == "country":
-        return "Select Country"
-    return ""
 
 
 @app.callback(
@@ -251,7 +228,7 @@ def manage_attributes(add_click, delete_clicks, reset_click, new_values, tags):
             if not any(t["id"] == v for t in updated):
                 cat, attr = v.split("::")
                 updated.append({
-                    "label": f"{cat} – {attr}",
+                    "label": f"{cat} – {prettify_attribute(attr)}",
                     "id": v
                 })
 
@@ -272,32 +249,92 @@ def manage_attributes(add_click, delete_clicks, reset_click, new_values, tags):
 def prepare_dataframe(attrs, geo_tags, geo_scale):
     """
     Returns a filtered dataframe based on:
-    - selected attributes (to pick the right dataset category)
+    - selected attributes (only these + the geo columns are kept)
     - selected geo tags
     - selected geo scale
+
+    Attributes from a single category keep that dataset's rows (and its Year
+    column); attributes spanning several categories are column slices of the
+    cross-category WideTable, one row per country and year when one of the
+    categories has a Year column, one row per country otherwise.
+    Geo filtering uses the precomputed GeoIndex; the result may share data
+    with the cached datasets, so it must not be modified in place.
     """
     if not attrs:
         return None
 
-    # Use the category of the FIRST selected attribute
-    cat, _ = attrs[0]["id"].split("::")
-    df = DATASETS[cat].copy()
+    selection = attributes_by_category(t["id"] for t in attrs)
+    selected = [t["id"] for t in geo_tags or []]
+    filtered = geo_scale != "global" and selected
+
+    if len(selection) > 1:
+        codes = GEO_INDEX.lookup(geo_scale, selected) if filtered else None
+        return DATASETS.wide_table().select(selection, codes)
+
+    [(cat, columns)] = selection.items()
+    data = DATASETS.entry(cat)
+    df = data.select(geo_scale, selected) if filtered else data.frame
 
-    if geo_scale == "global" or not geo_tags:
-        return df
+    keep = [c for c in GEO_COLUMNS + [YEAR_COLUMN] if c in df.columns]
+    keep += [c for c in columns if c in df.columns and c not in keep]
+    return df[keep]
 
-    selected = [t["id"] for t in geo_tags]
 
-    if geo_scale == "continent":
-        df = df[df["Continent"].isin(selected)]
+def prepare_stats(attrs, geo_tags, geo_scale):
+    """
+    Statistics of the selected attributes: precomputed per selected continent
+    or region, computed over the selected countries together, otherwise the
+    precomputed ones over all countries.
+    """
+    if not attrs:
+        return None
 
-    elif geo_scale == "region":
-        df = df[df["Region"].isin(selected)]
+    selected = [t["id"] for t in geo_tags or []]
+    if geo_scale in ("continent", "region") and selected:
+        scope, groups = geo_scale, selected
+    else:
+        scope, groups = "global", [GLOBAL_GROUP]
+
+    parts = []
+    for cat, columns in attributes_by_category(t["id"] for t in attrs).items():
+        data = DATASETS.entry(cat)
+        if geo_scale == "country" and selected:
+            label = selected[0] if len(selected) == 1 else f"{len(selected)} countries"
+            stats = data.selection_stats("country", selected, columns, label)
+        else:
+            stats = data.attribute_stats(scope, groups, columns)
+        parts.append(stats.assign(
+            attribute=f"{cat} – " + stats["attribute"].map(prettify_attribute)
+        ))
 
-    elif geo_scale == "country":
-        df = df[df["Country"].isin(selected)]
+    return pd.concat(parts, ignore_index=True)
 
-    return df
+
+@app.callback(
+    Output("numbers-table", "data"),
+    Output("numbers-table", "page_count"),
+    Output("numbers-table", "page_current"),
+    Input("numbers-table", "page_current"),
+    Input("numbers-table", "page_size"),
+    Input("numbers-table", "sort_by"),
+    Input("numbers-table", "filter_query"),
+    State("attribute-tags-store", "data"),
+    State("scale-tags-store", "data"),
+    State("geo-scale", "value"),
+    prevent_initial_call=True
+)
+def update_numbers_page(page_current, page_size, sort_by, filter_query, attrs, geo_tags, geo_scale):
+    """
+    Server-side paging, sorting and filtering of the Numbers table. When the
+    filter leaves fewer pages than the current one, the last page is shown.
+    """
+    df = prepare_dataframe(attrs, geo_tags, geo_scale)
+    if df is None:
+        return [], 1, 0
+
+    page_current = page_current or 0
+    records, page_count, page = table_page(df, page_current, page_size, sort_by, filter_query)
+    return records, page_count, (page if page != page_current else no_update)
 
 
 @app.callback(
@@ -310,7 +347,9 @@ def prepare_dataframe(attrs, geo_tags, geo_scale):
     Input({"type": "top-tab", "tab": ALL}, "n_clicks"),
     Input("scale-tags-store", "data"),
     State("attribute-tags-store", "data"),
-    State("geo-scale", "value")
+    State("geo-scale", "value"),
+    running=[(Output("content-panel", "className"), "computing", "")],
+    **background_options()
 )
 def update_tabs(clicks, geo_tags, attrs, geo_scale):
     ctx = callback_context
@@ -322,14 +361,16 @@ def update_tabs(clicks, geo_tags, attrs, geo_scale):
     info = plots = numbers = create = html.Div()
 
     if tab == "info":
-        info = render_info_tab(attrs, geo_tags, geo_scale, DATA_INFO)
+        info = render_info_tab(attrs, geo_tags, geo_scale, COUNTRY_INFO)
 
     elif tab == "plots":
         plots = render_plots_tab([])
 
     elif tab == "numbers":
-        df = prepare_dataframe(attrs, geo_tags, geo_scale)
-        numbers = render_numbers_tab(df)
+        numbers = render_numbers_tab(
+            prepare_dataframe(attrs, geo_tags, geo_scale),
+            prepare_stats(attrs, geo_tags, geo_scale),
+        )
 
     elif tab == "create":
         create = render_create_tab()
@@ -337,45 +378,22 @@ def update_tabs(clicks, geo_tags, attrs, geo_scale):
     return info, plots, numbers, create, tab
 
 
-@app.callback(
+app.clientside_callback(
+    ClientsideFunction(namespace="ui", function_name="show_correct_tab"),
     Output("content-panel-info", "style"),
     Output("content-panel-plots", "style"),
     Output("content-panel-numbers", "style"),
     Output("content-panel-create", "style"),
     Input("active-tab", "data")
 )
-def show_correct_tab(active):
-    styles = {
-        "info": {"display": "block"},
-        "plots": {"display": "block"},
-        "numbers": {"display": "block"},
-        "create": {"display": "block"},
-    }
-
-    # Default hidden
-    hidden = {"display": "none"}
-
-    return (
-        styles["info"] if active == "info" else hidden,
-        styles["plots"] if active == "plots" else hidden,
-        styles["numbers"] if active == "numbers" else hidden,
-        styles["create"] if active == "create" else hidden,
-    )
 
 
 # -------------------------------------------------------------
-# 9. STYLE ACTIVE TAB
+# 9. STYLE ACTIVE TAB (clientside)
 # -------------------------------------------------------------
-@app.callback(
+app.clientside_callback(
+    ClientsideFunction(namespace="ui", function_name="style_tabs"),
     Output({"type": "top-tab", "tab": ALL}, "className"),
     Input("active-tab", "data"),
     State({"type": "top-tab", "tab": ALL}, "id")
 )
-def style_tabs(active, ids):
-    out = []
-    for tab in ids:
-        if tab["tab"] == active:
-            out.append("top-tab active")
-        else:
-            out.append("top-tab")
-    return out
@@ -1,15 +1,19 @@
 import dash
-from dash import Input, Output, State, no_update
+from dash import Input, Output, State, ClientsideFunction, Patch, no_update
 import plotly.express as px
+import plotly.graph_objects as go
 
 from main import app
+from jbi100_app.background import background_options
+from jbi100_app.cache import LRUCache, shared_cache
+from jbi100_app.config import FIGURE_CACHE_SIZE, FIGURE_CACHE_TTL, COMPACT_FIGURES
 from jbi100_app.data_loader import (
     DATASETS,
     CATEGORY_ATTRIBUTES,
-    ALL_COUNTRIES,
-    COUNTRY_TO_REGION,
-    COUNTRY_TO_CONTINENT,
 )
+from jbi100_app.figure_encoding import compact_figure
+from jbi100_app.geo import COUNTRY_TO_ISO, ISO_TO_COUNTRY
+from jbi100_app.geometry import load_geometry_layer
 
 
 # ----------------------------------------
@@ -36,25 +40,15 @@ def update_attribute_dropdown(category):
 
 # ----------------------------------------
 # Update region dropdown based on view radio
+# (clientside, from geo-options-store)
 # ----------------------------------------
-@app.callback(
+app.clientside_callback(
+    ClientsideFunction(namespace="geo", function_name="update_region_dropdown"),
     Output("region-dropdown", "options"),
     Output("region-dropdown", "value"),
-    Input("view-radio", "value")
+    Input("view-radio", "value"),
+    State("geo-options-store", "data")
 )
-def update_region_dropdown(view):
-    if view == "Global":
-        return [{"label": "Global", "value": "Global"}], "Global"
-
-    if view == "Continent":
-        continents = sorted(set(COUNTRY_TO_CONTINENT.values()))
-        return [{"label": c, "value": c} for c in continents], continents[0]
-
-    if view == "Region":
-        regions = sorted(set(COUNTRY_TO_REGION.values()))
-        return [{"label": r, "value": r} for r in regions], regions[0]
-
-    return [], None
 
 
 @app.callback(
@@ -76,7 +70,7 @@ def handle_map_click(clickData, relayout, relayout_prev):
 
     # Extract clicked country
     point = clickData["points"][0]
-    clicked_country = point.get("hovertext")
+    clicked_country = country_of_location(point.get("location"))
 
     if not clicked_country:
         return no_update, no_update, no_update, None
@@ -105,83 +99,99 @@ def debug_click(clickData):
 
 # ----------------------------------------
 # Country search filtered by selected region
+# (clientside, from geo-options-store)
 # ----------------------------------------
-@app.callback(
+app.clientside_callback(
+    ClientsideFunction(namespace="geo", function_name="update_country_search"),
     Output("search-country", "options"),
     Input("region-dropdown", "value"),
-    Input("view-radio", "value")
+    Input("view-radio", "value"),
+    State("geo-options-store", "data")
 )
-def update_country_search(region, view):
-    if view == "Global":
-        return [{"label": c, "value": c} for c in ALL_COUNTRIES]
-
-    elif view == "Continent":
-        region_countries = [
-            c for c in ALL_COUNTRIES if COUNTRY_TO_CONTINENT.get(c) == region
-        ]
-        return [{"label": c, "value": c} for c in region_countries]
-
-    elif view == "Region":
-        region_countries = [
-            c for c in ALL_COUNTRIES if COUNTRY_TO_REGION.get(c) == region
-        ]
-        return [{"label": c, "value": c} for c in region_countries]
-
-    return []
 
 
 # ----------------------------------------
 # Choropleth MAP
 # ----------------------------------------
-@app.callback(
-    Output("mun-map", "figure"),
-    Input("category-dropdown", "value"),
-    Input("attr-dropdown", "value"),
-    Input("view-radio", "value"),
-    Input("region-dropdown", "value"),
-    Input("search-country", "value")
-)
-def update_map(category, attribute, view, region_value, search_country):
-    # Prevent empty map
-    if not category or not attribute:
-        return px.choropleth()
 
-    df = DATASETS[category].copy()
+# Local ISO-keyed geometry, None when not built (then Plotly matches country names)
+GEOMETRY = load_geometry_layer()
+
+# (category, attribute, view, region, csv fingerprint, geometry version)
+# -> (figure dict, countries on the map).
+# Concurrent identical requests build the figure once; with the shared cache
+# also only once across worker processes.
+FIGURE_CACHE = LRUCache(
+    maxsize=FIGURE_CACHE_SIZE,
+    ttl=FIGURE_CACHE_TTL,
+    shared=shared_cache("figures", ttl=FIGURE_CACHE_TTL),
+)
 
-    # Filter based on selected region scope
-    if view == "Continent":
-        df = df[df["Continent"] == region_value]
-    elif view == "Region":
-        df = df[df["Region"] == region_value]
 
-    # Drop missing
-    df = df[df[attribute].notna()]
+def build_base_figure(category, attribute, view, region_value):
+    """
+    Choropleth for one filter combination, without the search highlight.
+    Returns the serialised figure and the set of countries it shows.
+    """
+    data = DATASETS.entry(category)
+    df = data.frame[["Country", "Region", attribute]]
 
-    # Ranking
-    df = df.sort_values([attribute], ascending=False)
-    df["Rank"] = df[attribute].rank(method="dense", ascending=False).astype(int)
+    # Ranks within the selected scope are precomputed at ingest
+    scope = view.lower() if view in ("Continent", "Region") else "global"
+    rank = data.rank(scope, attribute)
 
-    custom_cols = ["Region", attribute, "Rank"]
+    # Filter based on selected region scope
+    if scope != "global":
+        rows = data.geo_index.lookup(scope, [region_value])
+        df, rank = df.take(rows), rank[rows]
+
+    # Drop missing (rank 0)
+    present = rank > 0
+    df = df[present].assign(Rank=rank[present])
+
+    # customdata stays numeric (Rank only) so it can be sent as a typed array.
+    # Strings are sent once per point at most: the locations. Name and region
+    # come from the geometry's feature properties when it has them, otherwise
+    # the location is the name and the region goes into text.
+    custom_cols = ["Rank"]
+    name, region, per_point = "%{location}", "%{text}", {}
+
+    if GEOMETRY is not None:
+        # Countries without geometry would only be dropped by the browser
+        df = df.assign(ISO=df["Country"].map(COUNTRY_TO_ISO).astype(object))
+        df = df[df["ISO"].isin(GEOMETRY.countries)]
+        locations = dict(
+            locations="ISO",
+            geojson=app.get_asset_url(GEOMETRY.asset_path(view)),
+            featureidkey="id",
+        )
+        if {"name", "region"} <= GEOMETRY.properties:
+            name, region = "%{properties.name}", "%{properties.region}"
+        else:
+            per_point = dict(hovertext=df["Country"].astype(str), text=df["Region"].astype(str))
+            name = "%{hovertext}"
+    else:
+        locations = dict(locations="Country", locationmode="country names")
+        per_point = dict(text=df["Region"].astype(str))
 
     hovertemplate = (
-            "<b>%{hovertext}</b><br>"
-            "Region: %{customdata[0]}<br>"
-            f"{attribute}: " + "%{customdata[1]:,.2f}<br>"
-                               "Rank: %{customdata[2]}<extra></extra>"
+            f"<b>{name}</b><br>"
+            f"Region: {region}<br>"
+            f"{attribute}: " + "%{z:,.2f}<br>"
+                               "Rank: %{customdata[0]}<extra></extra>"
     )
 
     fig = px.choropleth(
         df,
-        locations="Country",
-        locationmode="country names",
+        **locations,
         color=attribute,
-        hover_name="Country",
         custom_data=custom_cols,
         projection="natural earth",
         color_continuous_scale="YlOrRd",
     )
 
-    fig.update_traces(ids=df["Country"])
+    if per_point:
+        fig.update_traces(**per_point)
     fig.update_layout(clickmode="event+select")
 
     fig.update_traces(
@@ -190,24 +200,14 @@ def update_map(category, attribute, view, region_value, search_country):
         unselected=dict(marker=dict(opacity=1))
     )
 
-    # Highlight selected country
-    if search_country and search_country in df["Country"].values:
-        highlight = df[df["Country"] == search_country]
-
-        fig.add_scattergeo(
-            locations=highlight["Country"],
-            locationmode="country names",
-            mode="markers+text",
-            text=highlight["Country"],
-            textposition="top center",
-            marker=dict(size=14, color="black", line=dict(width=2, color="white")),
-            showlegend=False,
-        )
-
-    fig.update_geos(
-        fitbounds="locations",
-        visible=False,
-    )
+    viewport = GEOMETRY.viewport(scope, region_value) if GEOMETRY is not None else None
+    if viewport is not None:
+        # Precomputed continent/region box instead of fitting bounds per render
+        fig.update_geos(visible=False, **viewport)
+    elif GEOMETRY is not None and scope == "global":
+        fig.update_geos(visible=False)
+    else:
+        fig.update_geos(fitbounds="locations", visible=False)
 
     fig.update_layout(
         margin=dict(l=0, r=0, t=0, b=0),
@@ -225,4 +225,97 @@ def update_map(category, attribute, view, region_value, search_country):
         ),
     )
 
-    return fig
+    return fig.to_plotly_json(), frozenset(df["Country"])
+
+
+def country_of_location(location):
+    """Dataset country name of a map location (ISO code with the geometry layer)."""
+    if GEOMETRY is not None:
+        return ISO_TO_COUNTRY.get(location)
+    return location
+
+
+def discard_figures(changed):
+    """Drop the cached figures of reloaded categories."""
+    FIGURE_CACHE.discard(lambda key: key[0] in changed)
+
+
+DATASETS.on_change(discard_figures)
+
+
+def get_base_figure(category, attribute, view, region_value):
+    key = (category, attribute, view, region_value, DATASETS.fingerprint(category),
+           GEOMETRY.version if GEOMETRY is not None else None, COMPACT_FIGURES)
+
+    def compute():
+        figure, countries = build_base_figure(category, attribute, view, region_value)
+        return (compact_figure(figure) if COMPACT_FIGURES else figure), countries
+
+    return FIGURE_CACHE.get_or_compute(key, compute)
+
+
+def highlight_trace(country=None):
+    """
+    Marker + label on top of the searched country. Without a country this is
+    an empty placeholder, so the highlight always sits at the same trace index.
+    """
+    names = [country] if country else []
+    return go.Scattergeo(
+        # Plotly's own ISO-3 centroids, no name matching needed
+        locations=[COUNTRY_TO_ISO.get(c, c) for c in names],
+        locationmode="ISO-3",
+        mode="markers+text",
+        text=names,
+        textposition="top center",
+        marker=dict(size=14, color="black", line=dict(width=2, color="white")),
+        showlegend=False,
+        hoverinfo="skip",
+    ).to_plotly_json()
+
+
+@app.callback(
+    Output("mun-map", "figure"),
+    Output("map-highlight-store", "data"),
+    Input("category-dropdown", "value"),
+    Input("attr-dropdown", "value"),
+    Input("view-radio", "value"),
+    Input("region-dropdown", "value"),
+    State("search-country", "value"),
+    running=[(Output("map-right-panel", "className"), "computing", "")],
+    **background_options()
+)
+def update_map(category, attribute, view, region_value, search_country):
+    # Prevent empty map
+    if not category or not attribute:
+        return px.choropleth(), None
+
+    base, countries = get_base_figure(category, attribute, view, region_value)
+
+    # Cached figures are shared: build a new top-level dict, never mutate.
+    # The highlight trace always comes last, see update_search_highlight.
+    highlighted = search_country if search_country in countries else None
+    data = list(base["data"]) + [highlight_trace(highlighted)]
+
+    # Where the highlight trace sits and which countries it may point at,
+    # so a new search does not need the base figure again
+    highlight = {"index": len(base["data"]), "countries": sorted(countries)}
+
+    return {"data": data, "layout": base["layout"]}, highlight
+
+
+@app.callback(
+    Output("mun-map", "figure", allow_duplicate=True),
+    Input("search-country", "value"),
+    State("map-highlight-store", "data"),
+    prevent_initial_call=True
+)
+def update_search_highlight(search_country, highlight):
+    """Only swap the highlight trace instead of re-sending the whole map."""
+    if not highlight:
+        return no_update
+
+    highlighted = search_country if search_country in highlight["countries"] else None
+
+    patched = Patch()
+    patched["data"][highlight["index"]] = highlight_trace(highlighted)
+    return patched
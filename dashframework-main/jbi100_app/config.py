@@ -1,4 +1,165 @@
+import os
+import tempfile
+
 # Here you can add any global configuations
 
 color_list1 = ["green", "blue"]
 color_list2 = ["red", "purple"]
+
+
+# ------------------------------
+# DATA LOCATIONS
+# ------------------------------
+
+# Folder where all CSV datasets live
+DATA_DIR = os.environ.get(
+    "JBI100_DATA_DIR",
+    os.path.join(os.path.dirname(__file__), "data"),
+)
+
+# Country facts shown in the Info tab
+COUNTRY_INFO_PATH = os.environ.get(
+    "JBI100_COUNTRY_INFO",
+    os.path.join(os.path.dirname(__file__), "country_info_final.csv"),
+)
+
+# Folder for the columnar snapshots of the cleaned datasets
+CACHE_DIR = os.environ.get(
+    "JBI100_CACHE_DIR",
+    os.path.join(os.path.dirname(__file__), ".cache"),
+)
+
+# Set JBI100_DATA_CACHE=0 to always re-ingest the CSVs
+USE_DATA_CACHE = os.environ.get("JBI100_DATA_CACHE", "1") != "0"
+
+# How many category frames the lazy dataset registry keeps in memory
+MAX_RESIDENT_CATEGORIES = int(os.environ.get("JBI100_MAX_RESIDENT_CATEGORIES", "8"))
+
+# Rows sampled per CSV to decide which columns are numeric attributes
+SCAN_ROWS = 1000
+
+# Choropleth base figures kept by update_map, and for how long (seconds)
+FIGURE_CACHE_SIZE = int(os.environ.get("JBI100_FIGURE_CACHE_SIZE", "64"))
+FIGURE_CACHE_TTL = float(os.environ.get("JBI100_FIGURE_CACHE_TTL", "600"))
+
+# Simplified country geometry served to the browser (python -m jbi100_app.geometry);
+# set JBI100_MAP_GEOMETRY=0 to let Plotly resolve country names instead
+GEOMETRY_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets", "geo")
+USE_MAP_GEOMETRY = os.environ.get("JBI100_MAP_GEOMETRY", "1") != "0"
+
+# Set JBI100_COMPACT_FIGURES=0 to send figures as plain JSON lists instead of
+# base64 typed arrays with a trimmed layout (see figure_encoding.py)
+COMPACT_FIGURES = os.environ.get("JBI100_COMPACT_FIGURES", "1") != "0"
+
+# Scatter plots with more points than this are drawn with WebGL (Scattergl)
+WEBGL_MIN_POINTS = int(os.environ.get("JBI100_WEBGL_MIN_POINTS", "1000"))
+
+# Set JBI100_COMPACT_DTYPES=1 to keep loaded datasets in their smallest
+# safe dtypes (float32, small ints, categorical / Arrow text)
+COMPACT_DTYPES = os.environ.get("JBI100_COMPACT_DTYPES", "0") == "1"
+
+# Set JBI100_SHARED_STORE=1 to publish loaded datasets as memory-mapped
+# buffers that every worker process attaches to instead of loading its own copy;
+# the folder is per user and must not be writable by anyone else
+USE_SHARED_STORE = os.environ.get("JBI100_SHARED_STORE", "0") == "1"
+_STORE_NAME = f"jbi100-{os.getuid()}" if hasattr(os, "getuid") else "jbi100-shm"
+SHARED_STORE_DIR = os.environ.get(
+    "JBI100_SHARED_STORE_DIR",
+    os.path.join("/dev/shm", _STORE_NAME) if os.path.isdir("/dev/shm")
+    else os.path.join(tempfile.gettempdir(), _STORE_NAME),
+)
+
+# Set JBI100_PRELOAD_DATASETS=1 to load every category while starting up,
+# e.g. in a gunicorn master before it forks the workers
+PRELOAD_DATASETS = os.environ.get("JBI100_PRELOAD_DATASETS", "0") == "1"
+
+# Set JBI100_WATCH_DATA=1 to reload changed, new or removed CSVs in DATA_DIR
+# while running, checking every WATCH_INTERVAL seconds
+WATCH_DATA_DIR = os.environ.get("JBI100_WATCH_DATA", "0") == "1"
+WATCH_INTERVAL = float(os.environ.get("JBI100_WATCH_INTERVAL", "2"))
+
+# Set by gunicorn.conf.py: the server starts the watcher in every worker after
+# the fork, so importing the app (in the preforking master) must not
+WATCH_STARTED_BY_SERVER = os.environ.get("JBI100_WATCH_STARTED_BY_SERVER", "0") == "1"
+
+# Set JBI100_SHARED_CACHE=0 to keep computed figures per process only;
+# otherwise (with diskcache installed) worker processes share them on disk
+USE_SHARED_CACHE = os.environ.get("JBI100_SHARED_CACHE", "1") != "0"
+
+# Folder of the cross-process caches
+SHARED_CACHE_DIR = os.environ.get(
+    "JBI100_SHARED_CACHE_DIR",
+    os.path.join(CACHE_DIR, "shared"),
+)
+
+# Seconds a worker may hold the lock on a shared entry it is computing
+SHARED_CACHE_LOCK_TIMEOUT = 60
+
+# Build the cross-category wide table while starting up instead of on first use
+BUILD_WIDE_TABLE_AT_STARTUP = os.environ.get("JBI100_WIDE_TABLE_AT_STARTUP", "0") == "1"
+
+# ------------------------------
+# BACKGROUND CALLBACKS
+# ------------------------------
+
+# Set JBI100_BACKGROUND=1 to run the map and data tab callbacks as
+# background jobs (needs dash[diskcache])
+BACKGROUND_CALLBACKS = os.environ.get("JBI100_BACKGROUND", "0") == "1"
+
+# Local diskcache folder holding job results and progress
+BACKGROUND_CACHE_DIR = os.environ.get(
+    "JBI100_BACKGROUND_DIR",
+    os.path.join(CACHE_DIR, "jobs"),
+)
+
+# Seconds an unused job result stays cached
+BACKGROUND_RESULT_TTL = float(os.environ.get("JBI100_BACKGROUND_TTL", "600"))
+
+# How often (ms) the browser polls a running job
+BACKGROUND_POLL_MS = int(os.environ.get("JBI100_BACKGROUND_POLL_MS", "250"))
+
+# ------------------------------
+# HTTP RESPONSES
+# ------------------------------
+
+# Response encodings in order of preference ("br" needs the brotli package);
+# set JBI100_COMPRESS= (empty) to send everything uncompressed
+COMPRESS_ENCODINGS = [
+    e.strip() for e in os.environ.get("JBI100_COMPRESS", "br,gzip").split(",") if e.strip()
+]
+
+# Responses smaller than this (bytes) are not worth compressing
+COMPRESS_MIN_BYTES = int(os.environ.get("JBI100_COMPRESS_MIN_BYTES", "1024"))
+
+GZIP_LEVEL = int(os.environ.get("JBI100_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.environ.get("JBI100_BROTLI_QUALITY", "5"))
+
+# Seconds browsers may cache versioned assets (URLs with ?m= or ?v=)
+ASSET_MAX_AGE = int(os.environ.get("JBI100_ASSET_MAX_AGE", str(365 * 24 * 3600)))
+
+# ------------------------------
+# CALLBACK INSTRUMENTATION
+# ------------------------------
+
+# Set JBI100_INSTRUMENT=1 to time every server-side callback
+INSTRUMENT_CALLBACKS = os.environ.get("JBI100_INSTRUMENT", "0") == "1"
+
+# Endpoint with rolling per-callback percentiles
+METRICS_PATH = os.environ.get("JBI100_METRICS_PATH", "/_metrics")
+
+# Token the metrics endpoint asks for ("Authorization: Bearer <token>"); without
+# one it only answers local requests that did not come through a proxy
+METRICS_TOKEN = os.environ.get("JBI100_METRICS_TOKEN") or None
+
+# Number of recent calls per callback the percentiles are computed over
+METRICS_WINDOW = int(os.environ.get("JBI100_METRICS_WINDOW", "500"))
+
+# Callbacks slower than this (ms) get a cProfile dump; unset = no profiling
+PROFILE_THRESHOLD_MS = (
+    float(os.environ["JBI100_PROFILE_THRESHOLD_MS"])
+    if os.environ.get("JBI100_PROFILE_THRESHOLD_MS") else None
+)
+PROFILE_DIR = os.environ.get(
+    "JBI100_PROFILE_DIR",
+    os.path.join(os.path.dirname(__file__), ".profiles"),
+)
@@ -0,0 +1,216 @@
+# jbi100_app/data_cache.py
+"""
+Columnar on-disk cache for the cleaned category datasets.
+
+Every CSV in DATA_DIR gets one Arrow IPC (Feather v2) snapshot holding the
+frame exactly as `load_datasets()` produces it, plus one per derived table
+(precomputed ranks and statistics). A manifest keeps, per source
+file, its size, mtime and SHA-256 together with the category attributes and
+country list, so a restart only re-ingests the CSVs that actually changed and
+the layouts can be built without touching any snapshot.
+
+Worker processes share the cache folder: manifest updates hold an
+exclusive lock on a sidecar file, so concurrent stores of different CSVs
+all end up in the manifest.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, a single process owns the cache
+    fcntl = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # cache is simply disabled without pyarrow
+    pa = None
+    feather = None
+
+MANIFEST_NAME = "manifest.json"
+LOCK_NAME = "manifest.lock"
+
+# Bump whenever the ingest pipeline changes what ends up in a snapshot
+SNAPSHOT_VERSION = 4
+
+
+def file_fingerprint(path):
+    """Cheap identity of a source file: size and modification time."""
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """SHA-256 of the file contents, read in chunks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def source_state(path):
+    """
+    Fingerprint and hash of a source file, taken before it is read so a
+    snapshot is stored under the version it was ingested from: a CSV
+    rewritten during ingest no longer matches and is ingested again.
+    """
+    return {**file_fingerprint(path), "sha256": file_hash(path)}
+
+
+def _atomic_write(path, write):
+    """Write through a temp file in the same folder, then rename over `path`."""
+    folder = os.path.dirname(path)
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix=".tmp-")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class SnapshotCache:
+    """
+    Snapshot store keyed by source file name.
+
+    lookup() returns the cached (df, attributes, tables) for a CSV or None
+    when the CSV is new or changed, lookup_meta() the attributes and countries
+    without loading any frame; store() saves a freshly ingested frame and its
+    derived tables ({name: DataFrame}) under the source_state() taken before
+    the CSV was read.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.manifest_path = os.path.join(cache_dir, MANIFEST_NAME)
+        self.lock_path = os.path.join(cache_dir, LOCK_NAME)
+        self.enabled = pa is not None
+        if self.enabled:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    # ---------- manifest ----------
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get("version") != SNAPSHOT_VERSION:
+            return {}
+        return manifest.get("files", {})
+
+    @contextmanager
+    def _manifest_lock(self):
+        """Exclusive across processes, for a read-modify-write of the manifest."""
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _update_manifest(self, file_name, entry):
+        # Re-read under the lock so other workers' entries survive
+        with self._manifest_lock():
+            files = self._read_manifest()
+            files[file_name] = entry
+
+            def write(tmp):
+                with open(tmp, "w") as f:
+                    json.dump({"version": SNAPSHOT_VERSION, "files": files}, f, indent=1)
+
+            _atomic_write(self.manifest_path, write)
+
+    # ---------- public API ----------
+
+    def _fresh_entry(self, path):
+        """Manifest entry for `path` if its snapshot is still valid, else None."""
+        if not self.enabled:
+            return None
+
+        file_name = os.path.basename(path)
+        entry = self._read_manifest().get(file_name)
+        if entry is None:
+            return None
+
+        snapshots = [entry["snapshot"], *entry.get("tables", {}).values()]
+        if not all(os.path.exists(os.path.join(self.cache_dir, s)) for s in snapshots):
+            return None
+
+        fingerprint = file_fingerprint(path)
+        if fingerprint["size"] != entry["size"]:
+            return None
+
+        if fingerprint["mtime_ns"] != entry["mtime_ns"]:
+            # Touched but maybe not changed (git checkout, copy): compare contents
+            if file_hash(path) != entry["sha256"]:
+                return None
+            entry = {**entry, **fingerprint}
+            self._update_manifest(file_name, entry)
+
+        return entry
+
+    def lookup_meta(self, path):
+        """Cached (attributes, countries) for a CSV without reading its snapshot."""
+        entry = self._fresh_entry(path)
+        if entry is None:
+            return None
+        return [tuple(a) for a in entry["attributes"]], entry["countries"]
+
+    def lookup(self, path):
+        entry = self._fresh_entry(path)
+        if entry is None:
+            return None
+
+        df = self._read(entry["snapshot"])
+        attributes = [tuple(a) for a in entry["attributes"]]
+        tables = {name: self._read(s) for name, s in entry.get("tables", {}).items()}
+        return df, attributes, tables
+
+    def _read(self, snapshot_name):
+        path = os.path.join(self.cache_dir, snapshot_name)
+        return feather.read_table(path, memory_map=True).to_pandas()
+
+    def _write(self, snapshot_name, df):
+        # Uncompressed so the snapshot can be memory-mapped back
+        _atomic_write(
+            os.path.join(self.cache_dir, snapshot_name),
+            lambda tmp: feather.write_feather(df, tmp, compression="uncompressed"),
+        )
+
+    def store(self, path, source, df, attributes, tables=None):
+        if not self.enabled:
+            return
+
+        file_name = os.path.basename(path)
+        stem = os.path.splitext(file_name)[0]
+
+        snapshot_name = stem + ".arrow"
+        self._write(snapshot_name, df)
+
+        table_names = {}
+        for name, table in (tables or {}).items():
+            table_names[name] = f"{stem}.{name}.arrow"
+            self._write(table_names[name], table)
+
+        self._update_manifest(file_name, {
+            **source,
+            "snapshot": snapshot_name,
+            "tables": table_names,
+            "attributes": [list(a) for a in attributes],
+            "countries": (
+                sorted(df["Country"].dropna().unique().tolist())
+                if "Country" in df.columns else []
+            ),
+        })
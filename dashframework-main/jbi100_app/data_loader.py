@@ -1,397 +1,80 @@
+import logging
 import os
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+
+import numpy as np
 import pandas as pd
 
-# Folder where all CSV datasets live
-DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
-
-UN_COUNTRIES = {'AFGHANISTAN', 'ALBANIA', 'ALGERIA', 'ANDORRA', 'ANGOLA', 'ANTIGUA AND BARBUDA', 'ARGENTINA', 'ARMENIA',
-                'AUSTRALIA', 'AUSTRIA', 'AZERBAIJAN', 'BAHAMAS, THE', 'BAHRAIN', 'BANGLADESH', 'BARBADOS', 'BELARUS',
-                'BELGIUM', 'BELIZE', 'BENIN', 'BHUTAN', 'BOLIVIA', 'BOSNIA AND HERZEGOVINA', 'BOTSWANA', 'BRAZIL',
-                'BRUNEI', 'BULGARIA', 'BURKINA FASO', 'BURUNDI', 'CABO VERDE', 'CAMBODIA', 'CAMEROON', 'CANADA',
-                'CENTRAL AFRICAN REPUBLIC', 'CHAD', 'CHILE', 'CHINA', 'COLOMBIA', 'COMOROS', 'CONGO, REPUBLIC OF THE',
-                'COSTA RICA', "COTE D'IVOIRE", 'CROATIA', 'CUBA', 'CYPRUS', 'CZECHIA', 'KOREA, NORTH',
-                'CONGO, DEMOCRATIC REPUBLIC OF THE', 'DENMARK', 'DJIBOUTI', 'DOMINICA', 'DOMINICAN REPUBLIC', 'ECUADOR',
-                'EGYPT', 'EL SALVADOR', 'EQUATORIAL GUINEA', 'ERITREA', 'ESTONIA', 'ESWATINI', 'ETHIOPIA', 'FIJI',
-                'FINLAND', 'FRANCE', 'GABON', 'GAMBIA, THE', 'GEORGIA', 'GERMANY', 'GHANA', 'GREECE', 'GRENADA',
-                'GUATEMALA', 'GUINEA', 'GUINEA-BISSAU', 'GUYANA', 'HAITI', 'HONDURAS', 'HUNGARY', 'ICELAND', 'INDIA',
-                'INDONESIA', 'IRAN', 'IRAQ', 'IRELAND', 'ISRAEL', 'ITALY', 'JAMAICA', 'JAPAN', 'JORDAN', 'KAZAKHSTAN',
-                'KENYA', 'KIRIBATI', 'KUWAIT', 'KYRGYZSTAN', 'LAOS', 'LATVIA', 'LEBANON', 'LESOTHO', 'LIBERIA', 'LIBYA',
-                'LIECHTENSTEIN', 'LITHUANIA', 'LUXEMBOURG', 'MADAGASCAR', 'MALAWI', 'MALAYSIA', 'MALDIVES', 'MALI',
-                'MALTA', 'MARSHALL ISLANDS', 'MAURITANIA', 'MAURITIUS', 'MEXICO', 'MICRONESIA, FEDERATED STATES OF',
-                'MONACO', 'MONGOLIA', 'MONTENEGRO', 'MOROCCO', 'MOZAMBIQUE', 'BURMA', 'NAMIBIA', 'NAURU', 'NEPAL',
-                'NETHERLANDS', 'NEW ZEALAND', 'NICARAGUA', 'NIGER', 'NIGERIA', 'NORTH MACEDONIA', 'NORWAY', 'OMAN',
-                'PAKISTAN', 'PALAU', 'PANAMA', 'PAPUA NEW GUINEA', 'PARAGUAY', 'PERU', 'PHILIPPINES', 'POLAND',
-                'PORTUGAL', 'QATAR', 'KOREA, SOUTH', 'MOLDOVA', 'ROMANIA', 'RUSSIA', 'RWANDA', 'SAINT KITTS AND NEVIS',
-                'SAINT LUCIA', 'SAINT VINCENT AND THE GRENADINES', 'SAMOA', 'SAN MARINO', 'SAO TOME AND PRINCIPE',
-                'SAUDI ARABIA', 'SENEGAL', 'SERBIA', 'SEYCHELLES', 'SIERRA LEONE', 'SINGAPORE', 'SLOVAKIA', 'SLOVENIA',
-                'SOLOMON ISLANDS', 'SOMALIA', 'SOUTH AFRICA', 'SOUTH SUDAN', 'SPAIN', 'SRI LANKA', 'SUDAN', 'SURINAME',
-                'SWEDEN', 'SWITZERLAND', 'SYRIA', 'TAJIKISTAN', 'TANZANIA', 'THAILAND', 'TIMOR-LESTE', 'TOGO', 'TONGA',
-                'TRINIDAD AND TOBAGO', 'TUNISIA', 'TURKEY (TURKIYE)', 'TURKMENISTAN', 'TUVALU', 'UGANDA', 'UKRAINE',
-                'UNITED ARAB EMIRATES', 'UNITED KINGDOM', 'UNITED STATES', 'URUGUAY', 'UZBEKISTAN', 'VANUATU',
-                'VENEZUELA', 'VIETNAM', 'YEMEN', 'ZAMBIA', 'ZIMBABWE'}
-
-CONTINENTS = {
-
-    "AFRICA": [
-        "ALGERIA", "ANGOLA", "BENIN", "BOTSWANA", "BURKINA FASO", "BURUNDI",
-        "CABO VERDE", "CAMEROON", "CENTRAL AFRICAN REPUBLIC", "CHAD", "COMOROS",
-        "CONGO, DEMOCRATIC REPUBLIC OF THE", "CONGO, REPUBLIC OF THE",
-        "COTE D'IVOIRE", "DJIBOUTI", "EGYPT", "EQUATORIAL GUINEA", "ERITREA",
-        "ESWATINI", "ETHIOPIA", "GABON", "GAMBIA, THE", "GHANA", "GUINEA",
-        "GUINEA-BISSAU", "KENYA", "LESOTHO", "LIBERIA", "LIBYA", "MADAGASCAR",
-        "MALAWI", "MALI", "MAURITANIA", "MAURITIUS", "MOROCCO", "MOZAMBIQUE",
-        "NAMIBIA", "NIGER", "NIGERIA", "RWANDA", "SAO TOME AND PRINCIPE",
-        "SENEGAL", "SEYCHELLES", "SIERRA LEONE", "SOMALIA", "SOUTH AFRICA",
-        "SOUTH SUDAN", "SUDAN", "TANZANIA", "TOGO", "TUNISIA", "UGANDA",
-        "ZAMBIA", "ZIMBABWE"
-    ],
-
-    "ASIA": [
-        "AFGHANISTAN", "ARMENIA", "AZERBAIJAN", "BAHRAIN", "BANGLADESH",
-        "BHUTAN", "BRUNEI", "CAMBODIA", "CHINA", "CYPRUS", "GEORGIA", "INDIA",
-        "INDONESIA", "IRAN", "IRAQ", "ISRAEL", "JAPAN", "JORDAN", "KAZAKHSTAN",
-        "KOREA, NORTH", "KOREA, SOUTH", "KUWAIT", "KYRGYZSTAN", "LAOS",
-        "LEBANON", "MALAYSIA", "MALDIVES", "MONGOLIA", "MYANMAR", "NEPAL",
-        "OMAN", "PAKISTAN", "PHILIPPINES", "QATAR", "SAUDI ARABIA", "SINGAPORE",
-        "SRI LANKA", "SYRIA", "TAJIKISTAN", "THAILAND", "TIMOR-LESTE",
-        "TURKEY (TURKIYE)", "TURKMENISTAN", "UNITED ARAB EMIRATES", "UZBEKISTAN",
-        "VIETNAM", "YEMEN"
-    ],
-
-    "EUROPE": [
-        "ALBANIA", "ANDORRA", "AUSTRIA", "BELARUS", "BELGIUM",
-        "BOSNIA AND HERZEGOVINA", "BULGARIA", "CROATIA", "CZECHIA",
-        "DENMARK", "ESTONIA", "FINLAND", "FRANCE", "GERMANY", "GREECE",
-        "HUNGARY", "ICELAND", "IRELAND", "ITALY", "LATVIA", "LIECHTENSTEIN",
-        "LITHUANIA", "LUXEMBOURG", "MALTA", "MOLDOVA", "MONACO", "MONTENEGRO",
-        "NETHERLANDS", "NORTH MACEDONIA", "NORWAY", "POLAND", "PORTUGAL",
-        "ROMANIA", "RUSSIA", "SAN MARINO", "SERBIA", "SLOVAKIA", "SLOVENIA",
-        "SPAIN", "SWEDEN", "SWITZERLAND", "UKRAINE", "UNITED KINGDOM"
-    ],
-
-    "NORTH AMERICA": [
-        "CANADA", "UNITED STATES", "MEXICO"
-    ],
-
-    "CENTRAL AMERICA": [
-        "BELIZE", "COSTA RICA", "EL SALVADOR", "GUATEMALA",
-        "HONDURAS", "NICARAGUA", "PANAMA"
-    ],
-
-    "CARIBBEAN": [
-        "ANTIGUA AND BARBUDA", "BAHAMAS, THE", "BARBADOS", "CUBA", "DOMINICA",
-        "DOMINICAN REPUBLIC", "GRENADA", "HAITI", "JAMAICA",
-        "SAINT KITTS AND NEVIS", "SAINT LUCIA",
-        "SAINT VINCENT AND THE GRENADINES", "TRINIDAD AND TOBAGO"
-    ],
-
-    "SOUTH AMERICA": [
-        "ARGENTINA", "BOLIVIA", "BRAZIL", "CHILE", "COLOMBIA", "ECUADOR",
-        "GUYANA", "PARAGUAY", "PERU", "SURINAME", "URUGUAY", "VENEZUELA"
-    ],
-
-    "OCEANIA": [
-        "AUSTRALIA", "FIJI", "KIRIBATI", "MARSHALL ISLANDS",
-        "MICRONESIA, FEDERATED STATES OF", "NAURU", "NEW ZEALAND",
-        "PALAU", "PAPUA NEW GUINEA", "SAMOA", "SOLOMON ISLANDS",
-        "TONGA", "TUVALU", "VANUATU"
-    ],
-}
+from jbi100_app.config import (
+    DATA_DIR,
+    COUNTRY_INFO_PATH,
+    CACHE_DIR,
+    USE_DATA_CACHE,
+    MAX_RESIDENT_CATEGORIES,
+    SCAN_ROWS,
+    BUILD_WIDE_TABLE_AT_STARTUP,
+    COMPACT_DTYPES,
+    USE_SHARED_STORE,
+    SHARED_STORE_DIR,
+    PRELOAD_DATASETS,
+    WATCH_DATA_DIR,
+    WATCH_INTERVAL,
+    WATCH_STARTED_BY_SERVER,
+)
+from jbi100_app.cache import SingleFlight, reinit_after_fork
+from jbi100_app.figure_encoding import fits_float32
+from jbi100_app.data_cache import SnapshotCache, file_fingerprint, source_state, pa, SNAPSHOT_VERSION
+from jbi100_app.shared_store import SharedStore
+from jbi100_app.watcher import start_watcher
+from jbi100_app.geo import (  # noqa: F401 (re-exported for the views and callbacks)
+    UN_COUNTRIES,
+    CONTINENTS,
+    COUNTRY_TO_CONTINENT,
+    REGIONS,
+    COUNTRY_TO_REGION,
+)
 
-COUNTRY_TO_CONTINENT = {
-    country: continent
-    for continent, countries in CONTINENTS.items()
-    for country in countries
-}
+logger = logging.getLogger(__name__)
 
-REGIONS = {
-
-    # ------------------------------------------------------------
-    # AFRICA
-    # ------------------------------------------------------------
-
-    "NORTHERN AFRICA": [
-        "ALGERIA",
-        "EGYPT",
-        "LIBYA",
-        "MOROCCO",
-        "SUDAN",
-        "TUNISIA"
-    ],
-
-    "WESTERN AFRICA": [
-        "BENIN",
-        "BURKINA FASO",
-        "CABO VERDE",
-        "COTE D'IVOIRE",
-        "GAMBIA, THE",
-        "GHANA",
-        "GUINEA",
-        "GUINEA-BISSAU",
-        "LIBERIA",
-        "MALI",
-        "MAURITANIA",
-        "NIGER",
-        "NIGERIA",
-        "SENEGAL",
-        "SIERRA LEONE",
-        "TOGO"
-    ],
-
-    "MIDDLE AFRICA": [
-        "ANGOLA",
-        "CAMEROON",
-        "CENTRAL AFRICAN REPUBLIC",
-        "CHAD",
-        "CONGO, DEMOCRATIC REPUBLIC OF THE",
-        "CONGO, REPUBLIC OF THE",
-        "EQUATORIAL GUINEA",
-        "GABON",
-        "SAO TOME AND PRINCIPE"
-    ],
-
-    "EASTERN AFRICA": [
-        "BURUNDI",
-        "COMOROS",
-        "DJIBOUTI",
-        "ERITREA",
-        "ETHIOPIA",
-        "KENYA",
-        "MADAGASCAR",
-        "MALAWI",
-        "MAURITIUS",
-        "MOZAMBIQUE",
-        "RWANDA",
-        "SEYCHELLES",
-        "SOMALIA",
-        "SOUTH SUDAN",
-        "TANZANIA",
-        "UGANDA",
-        "ZAMBIA",
-        "ZIMBABWE"
-    ],
-
-    "SOUTHERN AFRICA": [
-        "BOTSWANA",
-        "ESWATINI",
-        "LESOTHO",
-        "NAMIBIA",
-        "SOUTH AFRICA"
-    ],
-
-    # ------------------------------------------------------------
-    # AMERICAS
-    # ------------------------------------------------------------
-
-    "NORTHERN AMERICA": [
-        "CANADA",
-        "UNITED STATES"
-    ],
-
-    "CENTRAL AMERICA": [
-        "BELIZE",
-        "COSTA RICA",
-        "EL SALVADOR",
-        "GUATEMALA",
-        "HONDURAS",
-        "MEXICO",
-        "NICARAGUA",
-        "PANAMA"
-    ],
-
-    "CARIBBEAN": [
-        "ANTIGUA AND BARBUDA",
-        "BAHAMAS, THE",
-        "BARBADOS",
-        "CUBA",
-        "DOMINICA",
-        "DOMINICAN REPUBLIC",
-        "GRENADA",
-        "HAITI",
-        "JAMAICA",
-        "SAINT KITTS AND NEVIS",
-        "SAINT LUCIA",
-        "SAINT VINCENT AND THE GRENADINES",
-        "TRINIDAD AND TOBAGO"
-    ],
-
-    "SOUTH AMERICA": [
-        "ARGENTINA",
-        "BOLIVIA",
-        "BRAZIL",
-        "CHILE",
-        "COLOMBIA",
-        "ECUADOR",
-        "GUYANA",
-        "PARAGUAY",
-        "PERU",
-        "SURINAME",
-        "URUGUAY",
-        "VENEZUELA"
-    ],
-
-    # ------------------------------------------------------------
-    # ASIA
-    # ------------------------------------------------------------
-
-    "CENTRAL ASIA": [
-        "KAZAKHSTAN",
-        "KYRGYZSTAN",
-        "TAJIKISTAN",
-        "TURKMENISTAN",
-        "UZBEKISTAN"
-    ],
-
-    "EASTERN ASIA": [
-        "CHINA",
-        "JAPAN",
-        "KOREA, NORTH",
-        "KOREA, SOUTH",
-        "MONGOLIA"
-    ],
-
-    "SOUTH-EASTERN ASIA": [
-        "BRUNEI",
-        "CAMBODIA",
-        "INDONESIA",
-        "LAOS",
-        "MALAYSIA",
-        "BURMA",          # your CSV uses BURMA → normalize to MYANMAR
-        "PHILIPPINES",
-        "SINGAPORE",
-        "THAILAND",
-        "TIMOR-LESTE",
-        "VIETNAM"
-    ],
-
-    "SOUTHERN ASIA": [
-        "AFGHANISTAN",
-        "BANGLADESH",
-        "BHUTAN",
-        "INDIA",
-        "IRAN",
-        "MALDIVES",
-        "NEPAL",
-        "PAKISTAN",
-        "SRI LANKA"
-    ],
-
-    "WESTERN ASIA": [
-        "ARMENIA",
-        "AZERBAIJAN",
-        "BAHRAIN",
-        "CYPRUS",
-        "GEORGIA",
-        "IRAQ",
-        "ISRAEL",
-        "JORDAN",
-        "KUWAIT",
-        "LEBANON",
-        "OMAN",
-        "QATAR",
-        "SAUDI ARABIA",
-        "SYRIA",
-        "TURKEY (TURKIYE)",
-        "UNITED ARAB EMIRATES",
-        "YEMEN"
-    ],
-
-    # ------------------------------------------------------------
-    # EUROPE
-    # ------------------------------------------------------------
-
-    "EASTERN EUROPE": [
-        "BELARUS",
-        "BULGARIA",
-        "CZECHIA",
-        "HUNGARY",
-        "MOLDOVA",
-        "POLAND",
-        "ROMANIA",
-        "RUSSIA",
-        "SLOVAKIA",
-        "UKRAINE"
-    ],
-
-    "NORTHERN EUROPE": [
-        "DENMARK",
-        "ESTONIA",
-        "FINLAND",
-        "ICELAND",
-        "IRELAND",
-        "LATVIA",
-        "LITHUANIA",
-        "NORWAY",
-        "SWEDEN",
-        "UNITED KINGDOM"
-    ],
-
-    "SOUTHERN EUROPE": [
-        "ALBANIA",
-        "ANDORRA",
-        "BOSNIA AND HERZEGOVINA",
-        "CROATIA",
-        "GREECE",
-        "ITALY",
-        "MALTA",
-        "MONTENEGRO",
-        "NORTH MACEDONIA",
-        "PORTUGAL",
-        "SAN MARINO",
-        "SERBIA",
-        "SLOVENIA",
-        "SPAIN"
-    ],
-
-    "WESTERN EUROPE": [
-        "AUSTRIA",
-        "BELGIUM",
-        "FRANCE",
-        "GERMANY",
-        "LIECHTENSTEIN",
-        "LUXEMBOURG",
-        "MONACO",
-        "NETHERLANDS",
-        "SWITZERLAND"
-    ],
-
-    # ------------------------------------------------------------
-    # OCEANIA
-    # ------------------------------------------------------------
-
-    "AUSTRALIA AND NEW ZEALAND": [
-        "AUSTRALIA",
-        "NEW ZEALAND"
-    ],
-
-    "MELANESIA": [
-        "FIJI",
-        "PAPUA NEW GUINEA",
-        "SOLOMON ISLANDS",
-        "VANUATU"
-    ],
-
-    "MICRONESIA": [
-        "KIRIBATI",
-        "MARSHALL ISLANDS",
-        "MICRONESIA, FEDERATED STATES OF",
-        "NAURU",
-        "PALAU"
-    ],
-
-    "POLYNESIA": [
-        "SAMOA",
-        "TONGA",
-        "TUVALU"
-    ],
-}
+# ------------------------------------------------------------
+# SHARED GEO DTYPES + LOOKUP TABLE
+# ------------------------------------------------------------
 
-COUNTRY_TO_REGION = {
-    country: region
-    for region, countries in REGIONS.items()
-    for country in countries
+# One country dictionary shared by every dataset's Country column
+COUNTRY_DTYPE = pd.CategoricalDtype(sorted(UN_COUNTRIES))
+CONTINENT_DTYPE = pd.CategoricalDtype(sorted(CONTINENTS) + ["Unknown"])
+REGION_DTYPE = pd.CategoricalDtype(sorted(REGIONS) + ["Unknown"])
+
+GEO_DTYPES = {
+    "Country": COUNTRY_DTYPE,
+    "Continent": CONTINENT_DTYPE,
+    "Region": REGION_DTYPE,
 }
 
+# Geo metadata per country, row i = country code i of COUNTRY_DTYPE
+GEO_TABLE = pd.DataFrame({
+    "Country": pd.Categorical(COUNTRY_DTYPE.categories, dtype=COUNTRY_DTYPE),
+    "Continent": pd.Categorical(
+        [COUNTRY_TO_CONTINENT.get(c, "Unknown") for c in COUNTRY_DTYPE.categories],
+        dtype=CONTINENT_DTYPE,
+    ),
+    "Region": pd.Categorical(
+        [COUNTRY_TO_REGION.get(c, "Unknown") for c in COUNTRY_DTYPE.categories],
+        dtype=REGION_DTYPE,
+    ),
+})
+
+# Country code -> continent / region code, for joining through integer takes
+_CONTINENT_CODES = GEO_TABLE["Continent"].cat.codes.to_numpy()
+_REGION_CODES = GEO_TABLE["Region"].cat.codes.to_numpy()
+
+GEO_COLUMNS = ["Country", "Continent", "Region"]
+
+# Time column of panel datasets (one row per country and year)
+YEAR_COLUMN = "Year"
+
 
 def prettify_attribute(name: str) -> str:
     """Convert snake_case attribute into readable label preserving ALL CAPS parts."""
@@ -416,57 +99,892 @@ def normalize_country(name):
     return name.strip().upper()
 
 
-def load_datasets():
+def country_codes(values):
+    """
+    Vectorised normalize_country + UN filter: the code of every value in
+    COUNTRY_DTYPE, or -1 when it is missing or not a UN country.
+
+    String ops only run on the distinct values, not on every row.
+    """
+    codes, uniques = pd.factorize(values)
+    normalized = pd.Index(uniques).astype("string").str.strip().str.upper()
+    unique_codes = COUNTRY_DTYPE.categories.get_indexer(normalized)
+    return np.where(codes >= 0, unique_codes[codes], -1)
+
+
+def enrich_geo(df):
+    """
+    Normalize the Country column, keep UN countries only and attach
+    Continent/Region, all as categoricals over the shared geo dtypes.
+    """
+    codes = country_codes(df["Country"])
+    keep = codes >= 0
+    codes = codes[keep]
+
+    return df[keep].assign(
+        Country=pd.Categorical.from_codes(codes, dtype=COUNTRY_DTYPE),
+        Continent=pd.Categorical.from_codes(_CONTINENT_CODES[codes], dtype=CONTINENT_DTYPE),
+        Region=pd.Categorical.from_codes(_REGION_CODES[codes], dtype=REGION_DTYPE),
+    )
+
+
+def restore_geo_dtypes(df):
+    """Re-attach the shared geo dtypes to a frame read back from a snapshot."""
+    geo_cols = {col: dtype for col, dtype in GEO_DTYPES.items() if col in df.columns}
+    return df.astype(geo_cols) if geo_cols else df
+
+
+class GeoIndex:
+    """
+    Row positions of every continent, region and country in one dataset,
+    so geo filtering is a union of precomputed arrays plus a single take.
+    """
+
+    SCALE_COLUMNS = {
+        "continent": "Continent",
+        "region": "Region",
+        "country": "Country",
+    }
+
+    def __init__(self, df):
+        self.positions = {}
+        for scale, col in self.SCALE_COLUMNS.items():
+            if col in df.columns:
+                self.positions[scale] = df.groupby(col, observed=True, sort=False).indices
+
+    def lookup(self, scale, names):
+        """Sorted row positions of all rows matching any of `names` at `scale`."""
+        by_name = self.positions.get(scale, {})
+        parts = [by_name[n] for n in names if n in by_name]
+        if not parts:
+            return np.empty(0, dtype=np.intp)
+        if len(parts) == 1:
+            return parts[0]
+        return np.unique(np.concatenate(parts))
+
+
+def build_join_index(df):
+    """
+    Country code -> row position of that country's first row, -1 when the
+    country is missing. Used to line up categories without a Year column on
+    Country without merges.
+    """
+    join_index = np.full(len(COUNTRY_DTYPE.categories), -1, dtype=np.intp)
+    if "Country" not in df.columns:
+        return join_index
+
+    codes = df["Country"].cat.codes.to_numpy()
+    positions = np.arange(len(codes))
+    # Reversed so the first row of a country is the one that sticks
+    join_index[codes[::-1]] = positions[::-1]
+    return join_index
+
+
+class CountryYearIndex:
+    """
+    Row position of the first row of every (country code, year) in one
+    dataset, to line up panel datasets on (Country, Year) without merges.
+    Rows without a year are left out.
+    """
+
+    def __init__(self, df):
+        years = df[YEAR_COLUMN].to_numpy()
+        keys = pd.MultiIndex.from_arrays([df["Country"].cat.codes.to_numpy(), years])
+        first = ~keys.duplicated() & pd.notna(years)
+        self.keys = keys[first]
+        self.positions = np.flatnonzero(first)
+
+    def rows(self, keys):
+        """Row position of every (country code, year) of `keys`, -1 when missing."""
+        found = self.keys.get_indexer(keys)
+        return np.where(found >= 0, self.positions[found], -1)
+
+
+def build_year_index(df):
+    """CountryYearIndex of `df`, or None when it has no Country and Year columns."""
+    if "Country" not in df.columns or YEAR_COLUMN not in df.columns:
+        return None
+    return CountryYearIndex(df)
+
+
+# ------------------------------------------------------------
+# PRECOMPUTED RANKS + STATISTICS
+# ------------------------------------------------------------
+
+# Scope -> geo column the ranks and statistics are grouped by
+RANK_SCOPES = {
+    "global": None,
+    "continent": "Continent",
+    "region": "Region",
+}
+
+# Name of the single group of the global scope
+GLOBAL_GROUP = "Global"
+
+STAT_COLUMNS = ["count", "nulls", "min", "q25", "median", "q75", "max", "mean"]
+
+
+def dense_ranks(values, groups=None):
+    """
+    Dense descending rank (1 = highest value) of every value within its
+    group, 0 for missing values. int16 unless there are too many rows.
+    """
+    values = np.asarray(values, dtype=float)
+    dtype = np.int16 if len(values) <= np.iinfo(np.int16).max else np.int32
+    ranks = np.zeros(len(values), dtype=dtype)
+
+    valid = ~np.isnan(values)
+    v = values[valid]
+    g = np.asarray(groups)[valid] if groups is not None else np.zeros(len(v), dtype=np.int8)
+    if not len(v):
+        return ranks
+
+    # Group by group, then highest value first
+    order = np.lexsort((-v, g))
+    v, g = v[order], g[order]
+
+    new_group = np.r_[True, g[1:] != g[:-1]]
+    new_value = new_group | np.r_[True, v[1:] != v[:-1]]
+
+    # Running count of distinct values, restarted at every group
+    distinct = np.cumsum(new_value)
+    group_start = np.maximum.accumulate(np.where(new_group, distinct, 0))
+
+    valid_ranks = np.empty(len(v), dtype=dtype)
+    valid_ranks[order] = distinct - group_start + 1
+    ranks[valid] = valid_ranks
+    return ranks
+
+
+def rank_table(df, attributes):
+    """
+    Row-aligned ranks of every attribute in every RANK_SCOPES scope, one
+    column per '<scope>:<attribute>'.
+    """
+    columns = {}
+    for scope, geo_col in RANK_SCOPES.items():
+        if geo_col is not None and geo_col not in df.columns:
+            continue
+        groups = df[geo_col].cat.codes.to_numpy() if geo_col else None
+        for raw, _ in attributes:
+            values = df[raw].to_numpy(dtype=float, na_value=np.nan)
+            columns[f"{scope}:{raw}"] = dense_ranks(values, groups)
+    return pd.DataFrame(columns, index=pd.RangeIndex(len(df)))
+
+
+STAT_DTYPES = {
+    **{c: "int32" for c in ("count", "nulls")},
+    **{c: "float32" for c in STAT_COLUMNS[2:]},
+}
+
+
+def empty_stats():
+    """stats_table of a frame without rows: no groups, the same columns."""
+    return pd.DataFrame(columns=["scope", "group", "attribute", *STAT_COLUMNS]).astype(
+        {"scope": object, "group": object, "attribute": object, **STAT_DTYPES}
+    )
+
+
+def stats_table(df, attributes, scopes=RANK_SCOPES):
+    """
+    Summary statistics of every attribute per scope group: one row per
+    (scope, group, attribute) with STAT_COLUMNS (counts int32, rest float32).
+    """
+    raws = [raw for raw, _ in attributes]
+    parts = []
+
+    # No groups to summarise (quantile() of no rows has no levels to take apart)
+    if df.empty or not raws:
+        return empty_stats()
+
+    for scope, geo_col in scopes.items():
+        if geo_col is not None and geo_col not in df.columns:
+            continue
+
+        values = df[raws].astype(float)
+        if geo_col is None:
+            grouped = values.groupby(np.zeros(len(df), dtype=np.int8))
+        else:
+            grouped = values.groupby(df[geo_col], observed=True)
+
+        quantiles = grouped.quantile([0.25, 0.5, 0.75])
+        summary = {
+            "count": grouped.count(),
+            "nulls": grouped.size().to_numpy()[:, None] - grouped.count(),
+            "min": grouped.min(),
+            "q25": quantiles.xs(0.25, level=-1),
+            "median": quantiles.xs(0.5, level=-1),
+            "q75": quantiles.xs(0.75, level=-1),
+            "max": grouped.max(),
+            "mean": grouped.mean(),
+        }
+
+        # group x attribute per statistic -> (group, attribute) rows
+        part = pd.concat({k: v.stack() for k, v in summary.items()}, axis=1)
+        part.index.names = ["group", "attribute"]
+        part = part.reset_index()
+        part["group"] = GLOBAL_GROUP if geo_col is None else part["group"].astype(str)
+        part.insert(0, "scope", scope)
+        parts.append(part)
+
+    if not parts:
+        return empty_stats()
+
+    stats = pd.concat(parts, ignore_index=True)
+    return stats.astype(STAT_DTYPES)
+
+
+def derived_tables(df, attributes):
+    """Tables precomputed at ingest and stored next to the frame's snapshot."""
+    return {
+        "ranks": rank_table(df, attributes),
+        "stats": stats_table(df, attributes),
+    }
+
+
+class CategoryData:
+    """
+    A loaded category: the cleaned frame plus its lookup structures and the
+    ranks and statistics precomputed at ingest.
+    """
+
+    def __init__(self, frame, ranks=None, stats=None):
+        self.frame = frame
+        self.geo_index = GeoIndex(frame)
+        self.join_index = build_join_index(frame)
+        self.year_index = build_year_index(frame)
+        self.ranks = ranks
+        self.stats = stats
+
+    def select(self, scale, names):
+        """Rows of the frame in the given continents/regions/countries."""
+        return self.frame.take(self.geo_index.lookup(scale, names))
+
+    def rank(self, scope, attribute):
+        """Row-aligned dense ranks of `attribute` within `scope`, 0 = missing."""
+        return self.ranks[f"{scope}:{attribute}"].to_numpy()
+
+    def attribute_stats(self, scope, groups, attributes):
+        """Statistics rows of `attributes` for the given groups of `scope`."""
+        stats = self.stats
+        mask = (
+            (stats["scope"] == scope)
+            & stats["group"].isin(groups)
+            & stats["attribute"].isin(attributes)
+        )
+        return stats[mask]
+
+    def selection_stats(self, scale, names, attributes, group):
+        """
+        Statistics rows of `attributes` over the rows of the given
+        continents/regions/countries together, labelled `group`. Computed
+        on the fly, for selections without precomputed statistics.
+        """
+        rows = self.select(scale, names)
+        stats = stats_table(rows, [(a, a) for a in attributes], scopes={"global": None})
+        return stats.assign(scope=scale, group=group)
+
+
+# GEO_TABLE rows are in country code order, so its positions are country codes
+GEO_INDEX = GeoIndex(GEO_TABLE)
+
+
+def attributes_by_category(attr_ids):
+    """['Economy::GDP', 'Energy::CO2', ...] -> {'Economy': ['GDP'], 'Energy': ['CO2']}"""
+    selection = {}
+    for attr_id in attr_ids:
+        cat, attr = attr_id.split("::", 1)
+        columns = selection.setdefault(cat, [])
+        if attr not in columns:
+            columns.append(attr)
+    return selection
+
+
+def csv_fingerprint(path):
+    """(size, mtime) of a CSV, changes whenever the file is rewritten."""
+    fp = file_fingerprint(path)
+    return fp["size"], fp["mtime_ns"]
+
+
+def category_name_for(file):
+    """economy_and_trade.csv -> 'Economy And Trade'"""
+    return os.path.splitext(file)[0].replace("_", " ").title()
+
+
+def ingest_csv(full_path):
+    """Parse one CSV and return the cleaned frame plus its attribute list."""
+    df = pd.read_csv(full_path)
+
+    # Normalize country column, filter to UN countries and add geo metadata
+    if "Country" in df.columns:
+        df = enrich_geo(df)
+
+    return df, numeric_attributes(df)
+
+
+def numeric_attributes(df):
+    """Attributes = all numeric columns except Country/Region/Continent."""
+    numeric_cols = [
+        col for col in df.columns
+        if col.lower() not in ("country", "region", "continent") and pd.api.types.is_numeric_dtype(df[col])
+    ]
+    return [(col, prettify_attribute(col)) for col in numeric_cols]
+
+
+def scan_csv(full_path):
+    """
+    Attributes and UN countries of a CSV without ingesting the whole file:
+    dtypes come from the first SCAN_ROWS rows, countries from the Country
+    column alone.
+    """
+    sample = pd.read_csv(full_path, nrows=SCAN_ROWS)
+
+    countries = []
+    if "Country" in sample.columns:
+        codes = country_codes(pd.read_csv(full_path, usecols=["Country"])["Country"])
+        countries = COUNTRY_DTYPE.categories[np.unique(codes[codes >= 0])].tolist()
+
+    return numeric_attributes(sample), countries
+
+
+# ------------------------------------------------------------
+# COMPACT DTYPES
+# ------------------------------------------------------------
+
+# Text columns with at most this share of distinct values become categoricals
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+TEXT_DTYPE = "string[pyarrow]" if pa is not None else None
+
+
+def compact_series(s):
+    """
+    Smallest dtype that holds `s` without changing its values as shown:
+    - integers: smallest (unsigned) integer dtype
+    - floats: float32 when that changes no value by more than the hovers
+      show (figure_encoding.FLOAT32_TOLERANCE), else float64 (e.g. large
+      populations or amounts with cents)
+    - text: categorical when values repeat, else Arrow strings
+    Categoricals (the geo columns) and booleans are kept.
+    """
+    dtype = s.dtype
+    if isinstance(dtype, pd.CategoricalDtype) or dtype.kind == "b":
+        return s
+
+    if dtype.kind in "iu":
+        return pd.to_numeric(s, downcast="unsigned" if s.min() >= 0 else "integer")
+
+    if dtype.kind == "f":
+        if dtype == np.float64 and not fits_float32(s.to_numpy()):
+            return s
+        return s.astype(np.float32)
+
+    if pd.api.types.is_string_dtype(dtype):
+        if s.nunique() <= len(s) * CATEGORY_MAX_UNIQUE_RATIO:
+            return s.astype("category")
+        if TEXT_DTYPE is not None and dtype != TEXT_DTYPE:
+            return s.astype(TEXT_DTYPE)
+
+    return s
+
+
+def compact_frame(df):
+    """`df` with every column in its compact dtype, see compact_series."""
+    return df.assign(**{col: compact_series(df[col]) for col in df.columns})
+
+
+def frame_memory(df):
+    """Bytes held by `df`, including the contents of text columns."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def ingest_category(full_path):
+    """ingest_csv plus the tables derived from the cleaned frame."""
+    df, attributes = ingest_csv(full_path)
+    return df, attributes, derived_tables(df, attributes)
+
+
+def load_datasets(data_dir=DATA_DIR, use_cache=USE_DATA_CACHE, compact=COMPACT_DTYPES, memory=None):
+    """
+    Load every CSV in `data_dir`.
+
+    With `use_cache`, cleaned frames are read back from the snapshot cache
+    in CACHE_DIR and only new or changed CSVs are parsed again.
+    With `compact`, frames are converted to their compact dtypes; a
+    `memory` dict is filled with {category: {"before": bytes, "after": bytes}}.
+    """
     datasets = {}
     category_attributes = {}
+    cache = SnapshotCache(CACHE_DIR) if use_cache else None
 
-    for file in os.listdir(DATA_DIR):
+    for file in sorted(os.listdir(data_dir)):
         if not file.endswith(".csv"):
             continue
 
-        full_path = os.path.join(DATA_DIR, file)
-        category_name = os.path.splitext(file)[0].replace("_", " ").title()
-
-        df = pd.read_csv(full_path)
+        full_path = os.path.join(data_dir, file)
+        category_name = category_name_for(file)
 
-        # Normalize country column for filtering
-        if "Country" in df.columns:
-            df["Country"] = df["Country"].apply(normalize_country)
-
-            # Filter to UN countries
-            df = df[df["Country"].isin(UN_COUNTRIES)]
+        cached = cache.lookup(full_path) if cache else None
+        if cached is not None:
+            df, attributes, _ = cached
+            df = restore_geo_dtypes(df)
+        else:
+            source = source_state(full_path) if cache else None
+            df, attributes, tables = ingest_category(full_path)
+            if cache:
+                cache.store(full_path, source, df, attributes, tables)
 
-            # Add geographic metadata
-            df["Continent"] = df["Country"].map(COUNTRY_TO_CONTINENT).fillna("Unknown")
-            df["Region"] = df["Country"].map(COUNTRY_TO_REGION).fillna("Unknown")
+        if compact:
+            before = frame_memory(df)
+            df = compact_frame(df)
+            if memory is not None:
+                memory[category_name] = {"before": before, "after": frame_memory(df)}
 
         # Store cleaned dataset
         datasets[category_name] = df
-
-        # Attributes = all columns except Country/Region/Continent
-        numeric_cols = [
-            col for col in df.columns
-            if col.lower() not in ("country", "region", "continent") and pd.api.types.is_numeric_dtype(df[col])
-        ]
-
-        category_attributes[category_name] = [
-            (col, prettify_attribute(col)) for col in numeric_cols
-        ]
+        category_attributes[category_name] = attributes
 
     return datasets, category_attributes
 
 
-# Load dynamically
-DATASETS, CATEGORY_ATTRIBUTES = load_datasets()
+class DatasetRegistry(Mapping):
+    """
+    Lazy, read-only mapping of category name -> cleaned DataFrame.
+
+    Creating the registry only scans the CSVs (or the snapshot manifest) for
+    attributes and countries; a category's full frame is loaded the first time
+    it is looked up. At most `max_resident` frames stay in memory, the least
+    recently used one is dropped first. With `compact`, loaded frames are
+    converted to their compact dtypes and `memory` records their size
+    before and after.
+
+    entry() gives the CategoryData (frame + geo index) of a category. Frames
+    are shared between requests and must be treated as read-only. Loading a
+    category only blocks the requests waiting for that same category; the
+    registry lock just guards the bookkeeping.
+    """
+
+    def __init__(self, data_dir=DATA_DIR, max_resident=MAX_RESIDENT_CATEGORIES, use_cache=USE_DATA_CACHE,
+                 compact=COMPACT_DTYPES, shared=USE_SHARED_STORE):
+        self.data_dir = data_dir
+        self.max_resident = max_resident
+        self.cache = SnapshotCache(CACHE_DIR) if use_cache else None
+        self.compact = compact
+        self.store = SharedStore(
+            SHARED_STORE_DIR,
+            GEO_DTYPES,
+            variant=f"v{SNAPSHOT_VERSION}-{'compact' if compact else 'full'}",
+        ) if shared else None
+        self.memory = {}       # category -> {"before": bytes, "after": bytes}, compact mode only
+
+        self.files = {}         # category -> csv path
+        self.attributes = {}    # category -> [(raw, pretty), ...]
+        self.countries = {}     # category -> [country, ...]
+        self.fingerprints = {}  # category -> (size, mtime) of the csv version scanned
+
+        # Bumped by every refresh() that changed something
+        self.version = 0
+        self._listeners = []
+
+        self._resident = OrderedDict()
+        self._wide_table = None
+        self._lock = threading.RLock()
+        # One load per (category, csv version) at a time, outside self._lock
+        self._loads = SingleFlight()
+        # Processes forked from this one (background jobs) get unlocked copies
+        reinit_after_fork(self, hold_lock=True)
+
+        self.scan()
+
+    def _after_fork(self):
+        # Held by the forking thread (and self._loads resets itself)
+        self._lock = threading.RLock()
+
+    def csv_files(self):
+        """category -> (path, fingerprint) of every CSV currently in data_dir."""
+        found = {}
+        for file in sorted(os.listdir(self.data_dir)):
+            if file.endswith(".csv"):
+                path = os.path.join(self.data_dir, file)
+                found[category_name_for(file)] = (path, csv_fingerprint(path))
+        return found
+
+    def _read_meta(self, path):
+        meta = self.cache.lookup_meta(path) if self.cache else None
+        return meta if meta is not None else scan_csv(path)
+
+    def scan(self):
+        for category, (path, fingerprint) in self.csv_files().items():
+            attributes, countries = self._read_meta(path)
+
+            self.files[category] = path
+            self.attributes[category] = attributes
+            self.countries[category] = countries
+            self.fingerprints[category] = fingerprint
+
+    def all_countries(self):
+        """Sorted list of all UN countries present in any dataset."""
+        return sorted({c for countries in self.countries.values() for c in countries})
+
+    def _load(self, path):
+        cached = self.cache.lookup(path) if self.cache else None
+        if cached is not None:
+            df, attributes, tables = cached
+            return restore_geo_dtypes(df), attributes, tables
+
+        source = source_state(path) if self.cache else None
+        df, attributes, tables = ingest_category(path)
+        if self.cache:
+            self.cache.store(path, source, df, attributes, tables)
+        return df, attributes, tables
+
+    def _build(self, category, path, fingerprint):
+        """CategoryData of one CSV version, attached from the shared store or loaded."""
+        shared = self.store.attach(path, fingerprint) if self.store else None
+
+        if shared is not None:
+            df, attributes, tables = shared
+        else:
+            df, attributes, tables = self._load(path)
+
+            if self.compact:
+                before = frame_memory(df)
+                df = compact_frame(df)
+                self.memory[category] = {"before": before, "after": frame_memory(df)}
+
+            if self.store:
+                self.store.publish(path, fingerprint, df, attributes, tables)
+
+        return CategoryData(df, tables["ranks"], tables["stats"]), attributes
+
+    def entry(self, category):
+        with self._lock:
+            if category in self._resident:
+                self._resident.move_to_end(category)
+                return self._resident[category]
+
+            if category not in self.files:
+                raise KeyError(category)
+            path, fingerprint = self.files[category], self.fingerprints[category]
+
+        return self._loads.do(
+            (category, fingerprint), lambda: self._admit(category, path, fingerprint)
+        )
+
+    def _admit(self, category, path, fingerprint):
+        """Load one CSV version and make it resident, unless it went stale meanwhile."""
+        with self._lock:
+            # A load that finished just before this one started
+            if category in self._resident and self.fingerprints.get(category) == fingerprint:
+                return self._resident[category]
+
+        data, attributes = self._build(category, path, fingerprint)
+
+        with self._lock:
+            # refresh() swapped in another version while this one was loading
+            if self.fingerprints.get(category) != fingerprint:
+                return data
+
+            # The full frame is authoritative over the sampled header scan
+            self.attributes[category] = attributes
+
+            self._resident[category] = data
+            while len(self._resident) > self.max_resident:
+                self._resident.popitem(last=False)
+
+        return data
+
+    def peek(self, category):
+        """
+        CategoryData of `category` without touching the LRU order: the resident
+        copy when loaded, otherwise a load that is not kept. For passes over
+        every category (WideTable) that must not evict what requests use.
+        """
+        with self._lock:
+            if category in self._resident:
+                return self._resident[category]
+            if category not in self.files:
+                raise KeyError(category)
+            path, fingerprint = self.files[category], self.fingerprints[category]
+
+        data, _ = self._build(category, path, fingerprint)
+        return data
+
+    def refresh(self):
+        """
+        Pick up new, changed and removed CSVs in data_dir.
+
+        Only those categories are re-read. A changed category that is loaded
+        is re-ingested first and then swapped in, so requests keep using the
+        old frame until the new one is ready. A CSV that cannot be read yet
+        (e.g. still being written) keeps its old version and is retried on
+        the next refresh. Listeners get the changed category names.
+        """
+        found = self.csv_files()
+        changed = [
+            category for category, (path, fingerprint) in found.items()
+            if self.files.get(category) != path or self.fingerprints.get(category) != fingerprint
+        ]
+        removed = [category for category in self.files if category not in found]
+
+        updates = {}
+        for category in changed:
+            path, fingerprint = found[category]
+            try:
+                attributes, countries = self._read_meta(path)
+                data = None
+                if category in self._resident:
+                    data, attributes = self._build(category, path, fingerprint)
+            except (OSError, ValueError) as e:
+                logger.warning("Could not reload %s, keeping the previous version: %s", path, e)
+                continue
+            updates[category] = (path, fingerprint, attributes, countries, data)
+
+        if not updates and not removed:
+            return []
+
+        with self._lock:
+            for category in removed:
+                for table in (self.files, self.attributes, self.countries, self.fingerprints, self._resident):
+                    table.pop(category, None)
+
+            for category, (path, fingerprint, attributes, countries, data) in updates.items():
+                self.files[category] = path
+                self.attributes[category] = attributes
+                self.countries[category] = countries
+                self.fingerprints[category] = fingerprint
+                if data is not None:
+                    self._resident[category] = data
+                else:
+                    # May have been loaded from the old file in the meantime
+                    self._resident.pop(category, None)
+
+            self._wide_table = None
+            self.version += 1
+
+        changed = sorted(updates) + removed
+        for listener in self._listeners:
+            listener(changed)
+        return changed
+
+    def on_change(self, listener):
+        """Call `listener(categories)` after every refresh() that changed something."""
+        self._listeners.append(listener)
+
+    def __getitem__(self, category):
+        return self.entry(category).frame
+
+    def fingerprint(self, category):
+        """(size, mtime) of the category's CSV version, to key caches that outlive the process."""
+        return self.fingerprints[category]
+
+    def preload(self):
+        """
+        Load every category now. `max_resident` is raised to the number of
+        categories first, so none of them is evicted again, e.g. in a
+        preforking master whose workers share the preloaded frames.
+        """
+        if len(self.files) > self.max_resident:
+            logger.info(
+                "Preloading %d categories, raising max_resident from %d",
+                len(self.files), self.max_resident,
+            )
+            self.max_resident = len(self.files)
+
+        for category in list(self.files):
+            self.entry(category)
+
+    def wide_table(self):
+        """The cross-category WideTable, built on first use (outside the registry lock)."""
+        with self._lock:
+            if self._wide_table is not None:
+                return self._wide_table
+            version = self.version
+
+        table = self._loads.do(("wide table", version), lambda: WideTable(self, self.all_countries()))
+
+        with self._lock:
+            # Not kept when refresh() changed the data while it was built
+            if self.version == version and self._wide_table is None:
+                self._wide_table = table
+            return table
+
+    def __iter__(self):
+        return iter(self.files)
+
+    def __len__(self):
+        return len(self.files)
+
+
+class WideTable:
+    """
+    Country (x year) x attribute column store over every category.
+
+    Categories with a Year column are lined up on (Country, Year): row i of
+    `keys` is one (country code, year) found in any of them. Categories
+    without Year are lined up on Country through their join indexes (first
+    row per country), row i being country i of `countries` (a dense id
+    derived from ALL_COUNTRIES). Selecting attributes from several
+    categories is then a column slice instead of a merge.
+    """
+
+    def __init__(self, registry, countries):
+        self.countries = countries
+        self.country_codes = COUNTRY_DTYPE.categories.get_indexer(countries)
+
+        # Country code -> dense country id, -1 for countries without data
+        self.id_of_code = np.full(len(COUNTRY_DTYPE.categories), -1, dtype=np.intp)
+        self.id_of_code[self.country_codes] = np.arange(len(countries))
+
+        self.geo = GEO_TABLE.take(self.country_codes).reset_index(drop=True)
+
+        self.columns = []     # column position -> values per country id or per key
+        self.positions = {}   # 'category::attribute' -> column position
+        self.present = {}     # category -> bool per country id or per key
+        self.yearly = set()   # categories lined up on (Country, Year)
+
+        # One category at a time, read past the registry's LRU so building the
+        # table neither evicts the categories in use nor keeps every frame
+        sources = {}
+        for cat in registry:
+            data = registry.peek(cat)
+            sources[cat] = (
+                data.year_index,
+                data.join_index,
+                [(raw, data.frame[raw].to_numpy()) for raw, _ in registry.attributes[cat]],
+            )
+
+        self.keys = pd.MultiIndex.from_arrays([[], []])
+        for year_index, _, _ in sources.values():
+            if year_index is not None:
+                self.keys = self.keys.union(year_index.keys)
+
+        codes = self.keys.get_level_values(0).to_numpy(dtype=np.intp)
+        # Key row -> dense country id
+        self.key_country = self.id_of_code[codes]
+        self.key_geo = self.geo.take(self.key_country).reset_index(drop=True)
+        self.key_geo[YEAR_COLUMN] = self.keys.get_level_values(1).to_numpy()
+
+        for cat, (year_index, join_index, values) in sources.items():
+            if year_index is not None:
+                self.yearly.add(cat)
+                rows = year_index.rows(self.keys)
+            else:
+                rows = join_index[self.country_codes]
+            self.present[cat] = rows >= 0
+
+            for raw, column in values:
+                self.positions[f"{cat}::{raw}"] = len(self.columns)
+                self.columns.append(pd.api.extensions.take(column, rows, allow_fill=True))
+
+    def select(self, selection, country_codes=None):
+        """
+        The selected columns ({category: [column]}) of several categories.
+        With a category that has a Year column there is one row per country
+        and year of the selected yearly categories (values of categories
+        without Year repeat over the years), otherwise one row per country.
+        Rows missing from every selected category are dropped, missing values are NaN. A column name used by
+        more than one category gets the category appended, e.g.
+        'Total (Energy)'.
+        """
+        yearly = any(cat in self.yearly for cat in selection)
+
+        if yearly:
+            ids = np.arange(len(self.keys))
+            if country_codes is not None:
+                country_ids = self.id_of_code[country_codes]
+                allowed = np.zeros(len(self.countries), dtype=bool)
+                allowed[country_ids[country_ids >= 0]] = True
+                ids = ids[allowed[self.key_country]]
+        else:
+            ids = np.arange(len(self.countries))
+            if country_codes is not None:
+                ids = self.id_of_code[country_codes]
+                ids = ids[ids >= 0]
+
+        def rows_of(cat, ids):
+            # Per-country categories are reached through each key's country
+            return ids if cat in self.yearly or not yearly else self.key_country[ids]
+
+        # Yearly rows come from the selected yearly categories only
+        row_sources = [cat for cat in selection if cat in self.yearly] if yearly else list(selection)
+        present = np.logical_or.reduce([self.present[cat][ids] for cat in row_sources])
+        ids = ids[present]
+
+        # The Year key is already a column of yearly rows
+        skip = {YEAR_COLUMN} if yearly else set()
+        seen = {}
+        for columns in selection.values():
+            for col in columns:
+                seen[col] = seen.get(col, 0) + 1
+
+        out = (self.key_geo if yearly else self.geo).take(ids).reset_index(drop=True)
+        for cat, columns in selection.items():
+            rows = rows_of(cat, ids)
+            for col in columns:
+                position = self.positions.get(f"{cat}::{col}")
+                if position is None or col in skip:
+                    continue
+                name = col if seen[col] == 1 else f"{col} ({cat})"
+                out[name] = self.columns[position][rows]
+
+        return out
+
+
+# Categories are loaded on demand, see DatasetRegistry
+DATASETS = DatasetRegistry()
+CATEGORY_ATTRIBUTES = DATASETS.attributes
 
 # Global list of all UN countries present in any dataset
-ALL_COUNTRIES = sorted(
-    {
-        country
-        for df in DATASETS.values()
-        if "Country" in df.columns
-        for country in df["Country"].dropna().unique()
+ALL_COUNTRIES = DATASETS.all_countries()
+
+
+def build_geo_options(countries):
+    """
+    Dropdown values per geo scale, plus the countries of every continent and
+    region, computed once. Shipped to the browser in the geo-options-store,
+    where clientside callbacks turn them into dropdown options.
+    """
+    continents = sorted(set(COUNTRY_TO_CONTINENT.values()))
+    regions = sorted(set(COUNTRY_TO_REGION.values()))
+    return {
+        "continents": continents,
+        "regions": regions,
+        "countries": list(countries),
+        "by_continent": {
+            c: [x for x in countries if COUNTRY_TO_CONTINENT.get(x) == c] for c in continents
+        },
+        "by_region": {
+            r: [x for x in countries if COUNTRY_TO_REGION.get(x) == r] for r in regions
+        },
     }
-)
 
-DATA_INFO = pd.read_csv("/Users/sofie/dev/Python/Uni/JBI100/dashframework-main/jbi100_app/country_info_final.csv")
+
+GEO_OPTIONS = build_geo_options(ALL_COUNTRIES)
+
+
+def refresh_country_lists(changed):
+    """Keep ALL_COUNTRIES and GEO_OPTIONS (shared objects) in step with DATASETS."""
+    ALL_COUNTRIES[:] = DATASETS.all_countries()
+    GEO_OPTIONS.update(build_geo_options(ALL_COUNTRIES))
+
+
+DATASETS.on_change(refresh_country_lists)
+
+# Load every category up front, e.g. in a preforking master whose workers
+# then share the frames (see gunicorn.conf.py)
+if PRELOAD_DATASETS:
+    DATASETS.preload()
+
+# Optionally pay for the cross-category table up front instead of on first use
+if BUILD_WIDE_TABLE_AT_STARTUP:
+    DATASETS.wide_table()
+
+DATA_INFO = pd.read_csv(COUNTRY_INFO_PATH)
+
+# Hot reload of changed CSVs. Under gunicorn every worker starts its own in
+# post_fork instead: a watcher thread in the master could hold the registry
+# lock at the moment a worker is forked, leaving that lock held forever in the
+# child (see gunicorn.conf.py)
+if WATCH_DATA_DIR and not WATCH_STARTED_BY_SERVER:
+    start_watcher(DATASETS, WATCH_INTERVAL)
@@ -0,0 +1,162 @@
+# jbi100_app/figure_encoding.py
+"""
+Compact JSON encoding of Plotly figures.
+
+Numeric trace arrays are sent as base64 typed arrays ({"dtype", "bdata",
+"shape"}, decoded natively by plotly.js >= 2.28) in the smallest dtype that
+keeps the values: integers in the smallest integer type, floats as float32
+when that changes no value by more than FLOAT32_TOLERANCE (what the hovers
+show), float64 otherwise. The layout template only keeps the trace defaults
+of the trace types the figure uses, and empty layout entries are dropped.
+
+`compact_figure` takes a figure or its `to_plotly_json()` dict and returns
+a new dict; the input is not modified, so cached figures can be passed in.
+"""
+import base64
+
+import numpy as np
+
+# Trace attributes holding one number per point
+NUMERIC_KEYS = (
+    ("x",), ("y",), ("z",), ("lat",), ("lon",), ("customdata",),
+    ("marker", "color"), ("marker", "size"),
+)
+
+# Largest absolute change float32 may make to a value (hovers show 2 decimals)
+FLOAT32_TOLERANCE = 0.005
+
+# Shorter arrays stay plain lists: the typed array wrapper would not pay off
+MIN_TYPED_LENGTH = 16
+
+INT_DTYPES = [np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32]
+
+TYPED_CODES = {
+    "int8": "i1", "uint8": "u1", "int16": "i2", "uint16": "u2",
+    "int32": "i4", "uint32": "u4", "float32": "f4", "float64": "f8",
+}
+CODE_DTYPES = {code: np.dtype(name) for name, code in TYPED_CODES.items()}
+
+
+def decode_typed_array(spec):
+    """NumPy array of a {"dtype", "bdata", "shape"} typed array spec."""
+    arr = np.frombuffer(base64.b64decode(spec["bdata"]), dtype=CODE_DTYPES[spec["dtype"]].newbyteorder("<"))
+    shape = spec.get("shape")
+    if shape:
+        arr = arr.reshape([int(n) for n in str(shape).split(",")])
+    return arr
+
+
+def numeric_array(value):
+    """`value` as a numeric (bool excluded) array, or None when it is not one."""
+    if isinstance(value, dict) and "bdata" in value:
+        return decode_typed_array(value)
+    if not isinstance(value, (list, tuple, np.ndarray)) and not hasattr(value, "to_numpy"):
+        return None
+
+    arr = np.asarray(value)
+    if arr.dtype.kind in "iuf":
+        return arr
+    if arr.dtype.kind != "O":
+        return None
+    try:
+        # None becomes NaN, any string raises
+        return np.array(arr.tolist(), dtype=float)
+    except (TypeError, ValueError):
+        return None
+
+
+def fits_float32(arr):
+    """True when float32 changes no finite value of `arr` by more than FLOAT32_TOLERANCE."""
+    finite = np.isfinite(arr)
+    with np.errstate(over="ignore", invalid="ignore"):
+        error = np.abs(arr.astype(np.float32).astype(np.float64) - arr)
+    return bool(np.all(error[finite] <= FLOAT32_TOLERANCE))
+
+
+def smallest_dtype(arr):
+    """Smallest dtype in TYPED_CODES that holds `arr` within FLOAT32_TOLERANCE."""
+    finite = np.isfinite(arr) if arr.dtype.kind == "f" else np.ones(arr.shape, dtype=bool)
+    whole = finite.all() and (arr.dtype.kind in "iu" or np.array_equal(arr, np.round(arr)))
+
+    if whole:
+        lo, hi = (arr.min(), arr.max()) if arr.size else (0, 0)
+        for dtype in INT_DTYPES:
+            info = np.iinfo(dtype)
+            if info.min <= lo and hi <= info.max:
+                return np.dtype(dtype)
+
+    if fits_float32(arr):
+        return np.dtype(np.float32)
+    return np.dtype(np.float64)
+
+
+def typed_array(arr):
+    """Typed array spec of a 1-D or 2-D numeric array in its smallest dtype."""
+    dtype = smallest_dtype(arr)
+    data = np.ascontiguousarray(arr, dtype=dtype.newbyteorder("<"))
+    spec = {
+        "dtype": TYPED_CODES[dtype.name],
+        "bdata": base64.b64encode(data.tobytes()).decode("ascii"),
+    }
+    if data.ndim > 1:
+        spec["shape"] = ", ".join(str(n) for n in data.shape)
+    return spec
+
+
+def compact_trace(trace):
+    """Copy of a trace dict with its numeric arrays as typed arrays."""
+    trace = dict(trace)
+    for path in NUMERIC_KEYS:
+        parent = trace
+        for key in path[:-1]:
+            if not isinstance(parent.get(key), dict):
+                parent = None
+                break
+            # Copy on the way down, the nested dicts may be shared
+            parent[key] = dict(parent[key])
+            parent = parent[key]
+        if parent is None or path[-1] not in parent:
+            continue
+
+        arr = numeric_array(parent[path[-1]])
+        if arr is not None and arr.ndim in (1, 2) and len(arr) >= MIN_TYPED_LENGTH:
+            parent[path[-1]] = typed_array(arr)
+    return trace
+
+
+def strip_empty(value):
+    """`value` without None entries and empty dicts, recursively."""
+    if not isinstance(value, dict):
+        return value
+    stripped = {}
+    for key, item in value.items():
+        item = strip_empty(item)
+        if item is None or item == {}:
+            continue
+        stripped[key] = item
+    return stripped
+
+
+def compact_layout(layout, trace_types):
+    """Layout without empty entries and with the template trimmed to `trace_types`."""
+    layout = dict(layout)
+    template = layout.get("template")
+    if isinstance(template, dict):
+        template = dict(template)
+        if isinstance(template.get("data"), dict):
+            template["data"] = {t: v for t, v in template["data"].items() if t in trace_types}
+        layout["template"] = template
+    return strip_empty(layout)
+
+
+def compact_figure(figure):
+    """Compact copy of a figure (go.Figure or figure dict), see the module docstring."""
+    if hasattr(figure, "to_plotly_json"):
+        figure = figure.to_plotly_json()
+
+    data = [compact_trace(trace) for trace in figure.get("data", [])]
+    trace_types = {trace.get("type", "scatter") for trace in data}
+    compact = dict(figure, data=data)
+    if "layout" in figure:
+        compact["layout"] = compact_layout(figure["layout"], trace_types)
+    return compact
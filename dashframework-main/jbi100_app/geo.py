@@ -0,0 +1,452 @@
+# jbi100_app/geo.py
+"""
+Geographic reference data: the UN member states as spelled in the datasets
+and their UN M49 continents and sub-regions.
+"""
+
+UN_COUNTRIES = {'AFGHANISTAN', 'ALBANIA', 'ALGERIA', 'ANDORRA', 'ANGOLA', 'ANTIGUA AND BARBUDA', 'ARGENTINA', 'ARMENIA',
+                'AUSTRALIA', 'AUSTRIA', 'AZERBAIJAN', 'BAHAMAS, THE', 'BAHRAIN', 'BANGLADESH', 'BARBADOS', 'BELARUS',
+                'BELGIUM', 'BELIZE', 'BENIN', 'BHUTAN', 'BOLIVIA', 'BOSNIA AND HERZEGOVINA', 'BOTSWANA', 'BRAZIL',
+                'BRUNEI', 'BULGARIA', 'BURKINA FASO', 'BURUNDI', 'CABO VERDE', 'CAMBODIA', 'CAMEROON', 'CANADA',
+                'CENTRAL AFRICAN REPUBLIC', 'CHAD', 'CHILE', 'CHINA', 'COLOMBIA', 'COMOROS', 'CONGO, REPUBLIC OF THE',
+                'COSTA RICA', "COTE D'IVOIRE", 'CROATIA', 'CUBA', 'CYPRUS', 'CZECHIA', 'KOREA, NORTH',
+                'CONGO, DEMOCRATIC REPUBLIC OF THE', 'DENMARK', 'DJIBOUTI', 'DOMINICA', 'DOMINICAN REPUBLIC', 'ECUADOR',
+                'EGYPT', 'EL SALVADOR', 'EQUATORIAL GUINEA', 'ERITREA', 'ESTONIA', 'ESWATINI', 'ETHIOPIA', 'FIJI',
+                'FINLAND', 'FRANCE', 'GABON', 'GAMBIA, THE', 'GEORGIA', 'GERMANY', 'GHANA', 'GREECE', 'GRENADA',
+                'GUATEMALA', 'GUINEA', 'GUINEA-BISSAU', 'GUYANA', 'HAITI', 'HONDURAS', 'HUNGARY', 'ICELAND', 'INDIA',
+                'INDONESIA', 'IRAN', 'IRAQ', 'IRELAND', 'ISRAEL', 'ITALY', 'JAMAICA', 'JAPAN', 'JORDAN', 'KAZAKHSTAN',
+                'KENYA', 'KIRIBATI', 'KUWAIT', 'KYRGYZSTAN', 'LAOS', 'LATVIA', 'LEBANON', 'LESOTHO', 'LIBERIA', 'LIBYA',
+                'LIECHTENSTEIN', 'LITHUANIA', 'LUXEMBOURG', 'MADAGASCAR', 'MALAWI', 'MALAYSIA', 'MALDIVES', 'MALI',
+                'MALTA', 'MARSHALL ISLANDS', 'MAURITANIA', 'MAURITIUS', 'MEXICO', 'MICRONESIA, FEDERATED STATES OF',
+                'MONACO', 'MONGOLIA', 'MONTENEGRO', 'MOROCCO', 'MOZAMBIQUE', 'BURMA', 'NAMIBIA', 'NAURU', 'NEPAL',
+                'NETHERLANDS', 'NEW ZEALAND', 'NICARAGUA', 'NIGER', 'NIGERIA', 'NORTH MACEDONIA', 'NORWAY', 'OMAN',
+                'PAKISTAN', 'PALAU', 'PANAMA', 'PAPUA NEW GUINEA', 'PARAGUAY', 'PERU', 'PHILIPPINES', 'POLAND',
+                'PORTUGAL', 'QATAR', 'KOREA, SOUTH', 'MOLDOVA', 'ROMANIA', 'RUSSIA', 'RWANDA', 'SAINT KITTS AND NEVIS',
+                'SAINT LUCIA', 'SAINT VINCENT AND THE GRENADINES', 'SAMOA', 'SAN MARINO', 'SAO TOME AND PRINCIPE',
+                'SAUDI ARABIA', 'SENEGAL', 'SERBIA', 'SEYCHELLES', 'SIERRA LEONE', 'SINGAPORE', 'SLOVAKIA', 'SLOVENIA',
+                'SOLOMON ISLANDS', 'SOMALIA', 'SOUTH AFRICA', 'SOUTH SUDAN', 'SPAIN', 'SRI LANKA', 'SUDAN', 'SURINAME',
+                'SWEDEN', 'SWITZERLAND', 'SYRIA', 'TAJIKISTAN', 'TANZANIA', 'THAILAND', 'TIMOR-LESTE', 'TOGO', 'TONGA',
+                'TRINIDAD AND TOBAGO', 'TUNISIA', 'TURKEY (TURKIYE)', 'TURKMENISTAN', 'TUVALU', 'UGANDA', 'UKRAINE',
+                'UNITED ARAB EMIRATES', 'UNITED KINGDOM', 'UNITED STATES', 'URUGUAY', 'UZBEKISTAN', 'VANUATU',
+                'VENEZUELA', 'VIETNAM', 'YEMEN', 'ZAMBIA', 'ZIMBABWE'}
+
+CONTINENTS = {
+
+    "AFRICA": [
+        "ALGERIA", "ANGOLA", "BENIN", "BOTSWANA", "BURKINA FASO", "BURUNDI",
+        "CABO VERDE", "CAMEROON", "CENTRAL AFRICAN REPUBLIC", "CHAD", "COMOROS",
+        "CONGO, DEMOCRATIC REPUBLIC OF THE", "CONGO, REPUBLIC OF THE",
+        "COTE D'IVOIRE", "DJIBOUTI", "EGYPT", "EQUATORIAL GUINEA", "ERITREA",
+        "ESWATINI", "ETHIOPIA", "GABON", "GAMBIA, THE", "GHANA", "GUINEA",
+        "GUINEA-BISSAU", "KENYA", "LESOTHO", "LIBERIA", "LIBYA", "MADAGASCAR",
+        "MALAWI", "MALI", "MAURITANIA", "MAURITIUS", "MOROCCO", "MOZAMBIQUE",
+        "NAMIBIA", "NIGER", "NIGERIA", "RWANDA", "SAO TOME AND PRINCIPE",
+        "SENEGAL", "SEYCHELLES", "SIERRA LEONE", "SOMALIA", "SOUTH AFRICA",
+        "SOUTH SUDAN", "SUDAN", "TANZANIA", "TOGO", "TUNISIA", "UGANDA",
+        "ZAMBIA", "ZIMBABWE"
+    ],
+
+    "ASIA": [
+        "AFGHANISTAN", "ARMENIA", "AZERBAIJAN", "BAHRAIN", "BANGLADESH",
+        "BHUTAN", "BRUNEI", "CAMBODIA", "CHINA", "CYPRUS", "GEORGIA", "INDIA",
+        "INDONESIA", "IRAN", "IRAQ", "ISRAEL", "JAPAN", "JORDAN", "KAZAKHSTAN",
+        "KOREA, NORTH", "KOREA, SOUTH", "KUWAIT", "KYRGYZSTAN", "LAOS",
+        "LEBANON", "MALAYSIA", "MALDIVES", "MONGOLIA", "MYANMAR", "NEPAL",
+        "OMAN", "PAKISTAN", "PHILIPPINES", "QATAR", "SAUDI ARABIA", "SINGAPORE",
+        "SRI LANKA", "SYRIA", "TAJIKISTAN", "THAILAND", "TIMOR-LESTE",
+        "TURKEY (TURKIYE)", "TURKMENISTAN", "UNITED ARAB EMIRATES", "UZBEKISTAN",
+        "VIETNAM", "YEMEN"
+    ],
+
+    "EUROPE": [
+        "ALBANIA", "ANDORRA", "AUSTRIA", "BELARUS", "BELGIUM",
+        "BOSNIA AND HERZEGOVINA", "BULGARIA", "CROATIA", "CZECHIA",
+        "DENMARK", "ESTONIA", "FINLAND", "FRANCE", "GERMANY", "GREECE",
+        "HUNGARY", "ICELAND", "IRELAND", "ITALY", "LATVIA", "LIECHTENSTEIN",
+        "LITHUANIA", "LUXEMBOURG", "MALTA", "MOLDOVA", "MONACO", "MONTENEGRO",
+        "NETHERLANDS", "NORTH MACEDONIA", "NORWAY", "POLAND", "PORTUGAL",
+        "ROMANIA", "RUSSIA", "SAN MARINO", "SERBIA", "SLOVAKIA", "SLOVENIA",
+        "SPAIN", "SWEDEN", "SWITZERLAND", "UKRAINE", "UNITED KINGDOM"
+    ],
+
+    "NORTH AMERICA": [
+        "CANADA", "UNITED STATES", "MEXICO"
+    ],
+
+    "CENTRAL AMERICA": [
+        "BELIZE", "COSTA RICA", "EL SALVADOR", "GUATEMALA",
+        "HONDURAS", "NICARAGUA", "PANAMA"
+    ],
+
+    "CARIBBEAN": [
+        "ANTIGUA AND BARBUDA", "BAHAMAS, THE", "BARBADOS", "CUBA", "DOMINICA",
+        "DOMINICAN REPUBLIC", "GRENADA", "HAITI", "JAMAICA",
+        "SAINT KITTS AND NEVIS", "SAINT LUCIA",
+        "SAINT VINCENT AND THE GRENADINES", "TRINIDAD AND TOBAGO"
+    ],
+
+    "SOUTH AMERICA": [
+        "ARGENTINA", "BOLIVIA", "BRAZIL", "CHILE", "COLOMBIA", "ECUADOR",
+        "GUYANA", "PARAGUAY", "PERU", "SURINAME", "URUGUAY", "VENEZUELA"
+    ],
+
+    "OCEANIA": [
+        "AUSTRALIA", "FIJI", "KIRIBATI", "MARSHALL ISLANDS",
+        "MICRONESIA, FEDERATED STATES OF", "NAURU", "NEW ZEALAND",
+        "PALAU", "PAPUA NEW GUINEA", "SAMOA", "SOLOMON ISLANDS",
+        "TONGA", "TUVALU", "VANUATU"
+    ],
+}
+
+COUNTRY_TO_CONTINENT = {
+    country: continent
+    for continent, countries in CONTINENTS.items()
+    for country in countries
+}
+
+REGIONS = {
+
+    # ------------------------------------------------------------
+    # AFRICA
+    # ------------------------------------------------------------
+
+    "NORTHERN AFRICA": [
+        "ALGERIA",
+        "EGYPT",
+        "LIBYA",
+        "MOROCCO",
+        "SUDAN",
+        "TUNISIA"
+    ],
+
+    "WESTERN AFRICA": [
+        "BENIN",
+        "BURKINA FASO",
+        "CABO VERDE",
+        "COTE D'IVOIRE",
+        "GAMBIA, THE",
+        "GHANA",
+        "GUINEA",
+        "GUINEA-BISSAU",
+        "LIBERIA",
+        "MALI",
+        "MAURITANIA",
+        "NIGER",
+        "NIGERIA",
+        "SENEGAL",
+        "SIERRA LEONE",
+        "TOGO"
+    ],
+
+    "MIDDLE AFRICA": [
+        "ANGOLA",
+        "CAMEROON",
+        "CENTRAL AFRICAN REPUBLIC",
+        "CHAD",
+        "CONGO, DEMOCRATIC REPUBLIC OF THE",
+        "CONGO, REPUBLIC OF THE",
+        "EQUATORIAL GUINEA",
+        "GABON",
+        "SAO TOME AND PRINCIPE"
+    ],
+
+    "EASTERN AFRICA": [
+        "BURUNDI",
+        "COMOROS",
+        "DJIBOUTI",
+        "ERITREA",
+        "ETHIOPIA",
+        "KENYA",
+        "MADAGASCAR",
+        "MALAWI",
+        "MAURITIUS",
+        "MOZAMBIQUE",
+        "RWANDA",
+        "SEYCHELLES",
+        "SOMALIA",
+        "SOUTH SUDAN",
+        "TANZANIA",
+        "UGANDA",
+        "ZAMBIA",
+        "ZIMBABWE"
+    ],
+
+    "SOUTHERN AFRICA": [
+        "BOTSWANA",
+        "ESWATINI",
+        "LESOTHO",
+        "NAMIBIA",
+        "SOUTH AFRICA"
+    ],
+
+    # ------------------------------------------------------------
+    # AMERICAS
+    # ------------------------------------------------------------
+
+    "NORTHERN AMERICA": [
+        "CANADA",
+        "UNITED STATES"
+    ],
+
+    "CENTRAL AMERICA": [
+        "BELIZE",
+        "COSTA RICA",
+        "EL SALVADOR",
+        "GUATEMALA",
+        "HONDURAS",
+        "MEXICO",
+        "NICARAGUA",
+        "PANAMA"
+    ],
+
+    "CARIBBEAN": [
+        "ANTIGUA AND BARBUDA",
+        "BAHAMAS, THE",
+        "BARBADOS",
+        "CUBA",
+        "DOMINICA",
+        "DOMINICAN REPUBLIC",
+        "GRENADA",
+        "HAITI",
+        "JAMAICA",
+        "SAINT KITTS AND NEVIS",
+        "SAINT LUCIA",
+        "SAINT VINCENT AND THE GRENADINES",
+        "TRINIDAD AND TOBAGO"
+    ],
+
+    "SOUTH AMERICA": [
+        "ARGENTINA",
+        "BOLIVIA",
+        "BRAZIL",
+        "CHILE",
+        "COLOMBIA",
+        "ECUADOR",
+        "GUYANA",
+        "PARAGUAY",
+        "PERU",
+        "SURINAME",
+        "URUGUAY",
+        "VENEZUELA"
+    ],
+
+    # ------------------------------------------------------------
+    # ASIA
+    # ------------------------------------------------------------
+
+    "CENTRAL ASIA": [
+        "KAZAKHSTAN",
+        "KYRGYZSTAN",
+        "TAJIKISTAN",
+        "TURKMENISTAN",
+        "UZBEKISTAN"
+    ],
+
+    "EASTERN ASIA": [
+        "CHINA",
+        "JAPAN",
+        "KOREA, NORTH",
+        "KOREA, SOUTH",
+        "MONGOLIA"
+    ],
+
+    "SOUTH-EASTERN ASIA": [
+        "BRUNEI",
+        "CAMBODIA",
+        "INDONESIA",
+        "LAOS",
+        "MALAYSIA",
+        "BURMA",          # your CSV uses BURMA → normalize to MYANMAR
+        "PHILIPPINES",
+        "SINGAPORE",
+        "THAILAND",
+        "TIMOR-LESTE",
+        "VIETNAM"
+    ],
+
+    "SOUTHERN ASIA": [
+        "AFGHANISTAN",
+        "BANGLADESH",
+        "BHUTAN",
+        "INDIA",
+        "IRAN",
+        "MALDIVES",
+        "NEPAL",
+        "PAKISTAN",
+        "SRI LANKA"
+    ],
+
+    "WESTERN ASIA": [
+        "ARMENIA",
+        "AZERBAIJAN",
+        "BAHRAIN",
+        "CYPRUS",
+        "GEORGIA",
+        "IRAQ",
+        "ISRAEL",
+        "JORDAN",
+        "KUWAIT",
+        "LEBANON",
+        "OMAN",
+        "QATAR",
+        "SAUDI ARABIA",
+        "SYRIA",
+        "TURKEY (TURKIYE)",
+        "UNITED ARAB EMIRATES",
+        "YEMEN"
+    ],
+
+    # ------------------------------------------------------------
+    # EUROPE
+    # ------------------------------------------------------------
+
+    "EASTERN EUROPE": [
+        "BELARUS",
+        "BULGARIA",
+        "CZECHIA",
+        "HUNGARY",
+        "MOLDOVA",
+        "POLAND",
+        "ROMANIA",
+        "RUSSIA",
+        "SLOVAKIA",
+        "UKRAINE"
+    ],
+
+    "NORTHERN EUROPE": [
+        "DENMARK",
+        "ESTONIA",
+        "FINLAND",
+        "ICELAND",
+        "IRELAND",
+        "LATVIA",
+        "LITHUANIA",
+        "NORWAY",
+        "SWEDEN",
+        "UNITED KINGDOM"
+    ],
+
+    "SOUTHERN EUROPE": [
+        "ALBANIA",
+        "ANDORRA",
+        "BOSNIA AND HERZEGOVINA",
+        "CROATIA",
+        "GREECE",
+        "ITALY",
+        "MALTA",
+        "MONTENEGRO",
+        "NORTH MACEDONIA",
+        "PORTUGAL",
+        "SAN MARINO",
+        "SERBIA",
+        "SLOVENIA",
+        "SPAIN"
+    ],
+
+    "WESTERN EUROPE": [
+        "AUSTRIA",
+        "BELGIUM",
+        "FRANCE",
+        "GERMANY",
+        "LIECHTENSTEIN",
+        "LUXEMBOURG",
+        "MONACO",
+        "NETHERLANDS",
+        "SWITZERLAND"
+    ],
+
+    # ------------------------------------------------------------
+    # OCEANIA
+    # ------------------------------------------------------------
+
+    "AUSTRALIA AND NEW ZEALAND": [
+        "AUSTRALIA",
+        "NEW ZEALAND"
+    ],
+
+    "MELANESIA": [
+        "FIJI",
+        "PAPUA NEW GUINEA",
+        "SOLOMON ISLANDS",
+        "VANUATU"
+    ],
+
+    "MICRONESIA": [
+        "KIRIBATI",
+        "MARSHALL ISLANDS",
+        "MICRONESIA, FEDERATED STATES OF",
+        "NAURU",
+        "PALAU"
+    ],
+
+    "POLYNESIA": [
+        "SAMOA",
+        "TONGA",
+        "TUVALU"
+    ],
+}
+
+COUNTRY_TO_REGION = {
+    country: region
+    for region, countries in REGIONS.items()
+    for country in countries
+}
+
+# ISO 3166-1 alpha-3 code of every country as spelled in the datasets; the
+# map geometry in assets/geo is keyed by these codes (see geometry.py)
+COUNTRY_TO_ISO = {
+    "AFGHANISTAN": "AFG", "ALBANIA": "ALB", "ALGERIA": "DZA", "ANDORRA": "AND",
+    "ANGOLA": "AGO", "ANTIGUA AND BARBUDA": "ATG", "ARGENTINA": "ARG", "ARMENIA": "ARM",
+    "AUSTRALIA": "AUS", "AUSTRIA": "AUT", "AZERBAIJAN": "AZE", "BAHAMAS, THE": "BHS",
+    "BAHRAIN": "BHR", "BANGLADESH": "BGD", "BARBADOS": "BRB", "BELARUS": "BLR",
+    "BELGIUM": "BEL", "BELIZE": "BLZ", "BENIN": "BEN", "BHUTAN": "BTN",
+    "BOLIVIA": "BOL", "BOSNIA AND HERZEGOVINA": "BIH", "BOTSWANA": "BWA", "BRAZIL": "BRA",
+    "BRUNEI": "BRN", "BULGARIA": "BGR", "BURKINA FASO": "BFA", "BURMA": "MMR",
+    "BURUNDI": "BDI", "CABO VERDE": "CPV", "CAMBODIA": "KHM", "CAMEROON": "CMR",
+    "CANADA": "CAN", "CENTRAL AFRICAN REPUBLIC": "CAF", "CHAD": "TCD", "CHILE": "CHL",
+    "CHINA": "CHN", "COLOMBIA": "COL", "COMOROS": "COM",
+    "CONGO, DEMOCRATIC REPUBLIC OF THE": "COD", "CONGO, REPUBLIC OF THE": "COG",
+    "COSTA RICA": "CRI", "COTE D'IVOIRE": "CIV", "CROATIA": "HRV", "CUBA": "CUB",
+    "CYPRUS": "CYP", "CZECHIA": "CZE", "DENMARK": "DNK", "DJIBOUTI": "DJI",
+    "DOMINICA": "DMA", "DOMINICAN REPUBLIC": "DOM", "ECUADOR": "ECU", "EGYPT": "EGY",
+    "EL SALVADOR": "SLV", "EQUATORIAL GUINEA": "GNQ", "ERITREA": "ERI", "ESTONIA": "EST",
+    "ESWATINI": "SWZ", "ETHIOPIA": "ETH", "FIJI": "FJI", "FINLAND": "FIN",
+    "FRANCE": "FRA", "GABON": "GAB", "GAMBIA, THE": "GMB", "GEORGIA": "GEO",
+    "GERMANY": "DEU", "GHANA": "GHA", "GREECE": "GRC", "GRENADA": "GRD",
+    "GUATEMALA": "GTM", "GUINEA": "GIN", "GUINEA-BISSAU": "GNB", "GUYANA": "GUY",
+    "HAITI": "HTI", "HONDURAS": "HND", "HUNGARY": "HUN", "ICELAND": "ISL",
+    "INDIA": "IND", "INDONESIA": "IDN", "IRAN": "IRN", "IRAQ": "IRQ",
+    "IRELAND": "IRL", "ISRAEL": "ISR", "ITALY": "ITA", "JAMAICA": "JAM",
+    "JAPAN": "JPN", "JORDAN": "JOR", "KAZAKHSTAN": "KAZ", "KENYA": "KEN",
+    "KIRIBATI": "KIR", "KOREA, NORTH": "PRK", "KOREA, SOUTH": "KOR", "KUWAIT": "KWT",
+    "KYRGYZSTAN": "KGZ", "LAOS": "LAO", "LATVIA": "LVA", "LEBANON": "LBN",
+    "LESOTHO": "LSO", "LIBERIA": "LBR", "LIBYA": "LBY", "LIECHTENSTEIN": "LIE",
+    "LITHUANIA": "LTU", "LUXEMBOURG": "LUX", "MADAGASCAR": "MDG", "MALAWI": "MWI",
+    "MALAYSIA": "MYS", "MALDIVES": "MDV", "MALI": "MLI", "MALTA": "MLT",
+    "MARSHALL ISLANDS": "MHL", "MAURITANIA": "MRT", "MAURITIUS": "MUS", "MEXICO": "MEX",
+    "MICRONESIA, FEDERATED STATES OF": "FSM", "MOLDOVA": "MDA", "MONACO": "MCO",
+    "MONGOLIA": "MNG", "MONTENEGRO": "MNE", "MOROCCO": "MAR", "MOZAMBIQUE": "MOZ",
+    "MYANMAR": "MMR", "NAMIBIA": "NAM", "NAURU": "NRU", "NEPAL": "NPL",
+    "NETHERLANDS": "NLD", "NEW ZEALAND": "NZL", "NICARAGUA": "NIC", "NIGER": "NER",
+    "NIGERIA": "NGA", "NORTH MACEDONIA": "MKD", "NORWAY": "NOR", "OMAN": "OMN",
+    "PAKISTAN": "PAK", "PALAU": "PLW", "PANAMA": "PAN", "PAPUA NEW GUINEA": "PNG",
+    "PARAGUAY": "PRY", "PERU": "PER", "PHILIPPINES": "PHL", "POLAND": "POL",
+    "PORTUGAL": "PRT", "QATAR": "QAT", "ROMANIA": "ROU", "RUSSIA": "RUS",
+    "RWANDA": "RWA", "SAINT KITTS AND NEVIS": "KNA", "SAINT LUCIA": "LCA",
+    "SAINT VINCENT AND THE GRENADINES": "VCT", "SAMOA": "WSM", "SAN MARINO": "SMR",
+    "SAO TOME AND PRINCIPE": "STP", "SAUDI ARABIA": "SAU", "SENEGAL": "SEN",
+    "SERBIA": "SRB", "SEYCHELLES": "SYC", "SIERRA LEONE": "SLE", "SINGAPORE": "SGP",
+    "SLOVAKIA": "SVK", "SLOVENIA": "SVN", "SOLOMON ISLANDS": "SLB", "SOMALIA": "SOM",
+    "SOUTH AFRICA": "ZAF", "SOUTH SUDAN": "SSD", "SPAIN": "ESP", "SRI LANKA": "LKA",
+    "SUDAN": "SDN", "SURINAME": "SUR", "SWEDEN": "SWE", "SWITZERLAND": "CHE",
+    "SYRIA": "SYR", "TAJIKISTAN": "TJK", "TANZANIA": "TZA", "THAILAND": "THA",
+    "TIMOR-LESTE": "TLS", "TOGO": "TGO", "TONGA": "TON", "TRINIDAD AND TOBAGO": "TTO",
+    "TUNISIA": "TUN", "TURKEY (TURKIYE)": "TUR", "TURKMENISTAN": "TKM", "TUVALU": "TUV",
+    "UGANDA": "UGA", "UKRAINE": "UKR", "UNITED ARAB EMIRATES": "ARE",
+    "UNITED KINGDOM": "GBR", "UNITED STATES": "USA", "URUGUAY": "URY",
+    "UZBEKISTAN": "UZB", "VANUATU": "VUT", "VENEZUELA": "VEN", "VIETNAM": "VNM",
+    "YEMEN": "YEM", "ZAMBIA": "ZMB", "ZIMBABWE": "ZWE",
+}
+
+# ISO alpha-3 code -> country as spelled in the datasets (BURMA, not MYANMAR)
+ISO_TO_COUNTRY = {iso: country for country, iso in COUNTRY_TO_ISO.items() if country in UN_COUNTRIES}
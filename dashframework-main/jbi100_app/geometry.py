@@ -0,0 +1,312 @@
+# jbi100_app/geometry.py
+"""
+Local country geometry for the choropleth.
+
+`python -m jbi100_app.geometry <countries.geojson>` turns a country GeoJSON
+(e.g. Natural Earth admin-0, with an ISO_A3 / ADM0_A3 property) into one
+file per detail level in assets/geo, keyed by ISO alpha-3 as feature id and
+simplified with Douglas-Peucker, plus a small manifest holding the bounding
+box of every country. Every feature carries the country name and region as
+FEATURE_PROPERTIES, so map hovers read them from the (cached) geometry
+instead of each figure repeating them per point.
+
+At runtime only the manifest is read: the figures reference the geometry by
+URL (the browser fetches and caches each level once) and the continent and
+region bounding boxes are aggregated from it once, so no figure needs
+`fitbounds`. Without a manifest the map keeps resolving country names.
+"""
+import argparse
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from jbi100_app.config import GEOMETRY_DIR, USE_MAP_GEOMETRY
+from jbi100_app.geo import CONTINENTS, REGIONS, COUNTRY_TO_ISO, ISO_TO_COUNTRY, COUNTRY_TO_REGION
+
+MANIFEST_NAME = "manifest.json"
+
+# Douglas-Peucker tolerance (degrees) per detail level
+LEVELS = {
+    "low": 0.1,
+    "medium": 0.03,
+    "high": 0.005,
+}
+
+# Detail level per map view: the smaller the area shown, the finer the outlines
+VIEW_LEVELS = {
+    "Global": "low",
+    "Continent": "medium",
+    "Region": "high",
+}
+
+# Decimals kept per coordinate (~100 m)
+COORD_DECIMALS = 3
+
+# Parts smaller than this share of a country's largest part are left out of
+# its bounding box, so e.g. overseas territories do not widen a region
+BOUNDS_MIN_PART = 0.2
+
+ISO_PROPERTIES = ("ISO_A3", "ISO_A3_EH", "ADM0_A3", "iso_a3", "adm0_a3")
+
+# Properties written on every feature, available to hovers as %{properties.<name>}
+FEATURE_PROPERTIES = ("name", "region")
+
+
+# ------------------------------------------------------------
+# BUILD
+# ------------------------------------------------------------
+
+def simplify_line(points, tolerance):
+    """Douglas-Peucker on an (n, 2) array; keeps the first and last point."""
+    n = len(points)
+    if n < 3 or tolerance <= 0:
+        return points
+
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        a, b = points[start], points[end]
+        seg = points[start + 1:end]
+        ab = b - a
+        norm = np.hypot(*ab)
+        if norm == 0:
+            dist = np.hypot(*(seg - a).T)
+        else:
+            dist = np.abs(ab[0] * (seg[:, 1] - a[1]) - ab[1] * (seg[:, 0] - a[0])) / norm
+        i = int(dist.argmax())
+        if dist[i] > tolerance:
+            mid = start + 1 + i
+            keep[mid] = True
+            stack.append((start, mid))
+            stack.append((mid, end))
+    return points[keep]
+
+
+def simplify_ring(ring, tolerance):
+    """Simplified closed ring, or None when it collapses below a triangle."""
+    points = np.round(simplify_line(np.asarray(ring, dtype=float), tolerance), COORD_DECIMALS)
+    # Rounding can repeat consecutive points
+    points = points[np.r_[True, np.any(np.diff(points, axis=0) != 0, axis=1)]]
+    if len(points) < 4:
+        return None
+    return points.tolist()
+
+
+def ring_area(ring):
+    """Unsigned shoelace area in square degrees."""
+    x, y = np.asarray(ring, dtype=float).T
+    return abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))) / 2
+
+
+def polygons_of(geometry):
+    """Polygons (lists of rings) of a Polygon or MultiPolygon geometry."""
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry["type"] == "MultiPolygon":
+        return geometry["coordinates"]
+    return []
+
+
+def simplify_polygons(polygons, tolerance):
+    """
+    Simplified polygons; holes that collapse are dropped, and so are islands,
+    except that a country never loses all of its parts.
+    """
+    result = []
+    for polygon in polygons:
+        outer = simplify_ring(polygon[0], tolerance)
+        if outer is None:
+            continue
+        holes = [h for h in (simplify_ring(r, tolerance) for r in polygon[1:]) if h is not None]
+        result.append([outer] + holes)
+
+    if not result and polygons:
+        largest = max(polygons, key=lambda p: ring_area(p[0]))
+        result.append([np.round(np.asarray(largest[0], dtype=float), COORD_DECIMALS).tolist()])
+    return result
+
+
+def main_bounds(polygons):
+    """
+    [min lon, min lat, max lon, max lat] of the parts that matter for zooming,
+    merged like continents so a country across the antimeridian (e.g. Fiji)
+    does not span the whole globe.
+    """
+    areas = [ring_area(p[0]) for p in polygons]
+    largest = max(areas)
+    boxes = []
+    for polygon, area in zip(polygons, areas):
+        if area >= BOUNDS_MIN_PART * largest:
+            points = np.asarray(polygon[0], dtype=float)
+            boxes.append([*points.min(axis=0), *points.max(axis=0)])
+    return [round(v, 2) for v in merge_bounds(boxes)]
+
+
+def feature_iso(feature):
+    properties = feature.get("properties") or {}
+    for key in ISO_PROPERTIES:
+        iso = properties.get(key)
+        if isinstance(iso, str) and len(iso) == 3 and iso != "-99":
+            return iso.upper()
+    return None
+
+
+def feature_properties(iso):
+    """FEATURE_PROPERTIES of the country with ISO code `iso`."""
+    country = ISO_TO_COUNTRY.get(iso, iso)
+    return {"name": country, "region": COUNTRY_TO_REGION.get(country, "Unknown")}
+
+
+def build_geometry(source_path, out_dir=GEOMETRY_DIR):
+    """Write one GeoJSON per LEVELS entry plus the manifest; returns the manifest."""
+    with open(source_path, encoding="utf-8") as f:
+        source = json.load(f)
+
+    wanted = set(COUNTRY_TO_ISO.values())
+    countries = {}
+    for feature in source["features"]:
+        iso = feature_iso(feature)
+        polygons = polygons_of(feature.get("geometry") or {"type": None})
+        if iso in wanted and polygons:
+            countries.setdefault(iso, []).extend(polygons)
+
+    os.makedirs(out_dir, exist_ok=True)
+    digest = hashlib.sha256()
+    files = {}
+    for level, tolerance in LEVELS.items():
+        collection = {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "id": iso,
+                    "properties": feature_properties(iso),
+                    "geometry": {"type": "MultiPolygon",
+                                 "coordinates": simplify_polygons(polygons, tolerance)},
+                }
+                for iso, polygons in sorted(countries.items())
+            ],
+        }
+        payload = json.dumps(collection, separators=(",", ":")).encode("utf-8")
+        digest.update(payload)
+        files[level] = f"countries-{level}.json"
+        with open(os.path.join(out_dir, files[level]), "wb") as f:
+            f.write(payload)
+
+    manifest = {
+        "version": digest.hexdigest()[:12],
+        "files": files,
+        "properties": list(FEATURE_PROPERTIES),
+        "bounds": {iso: main_bounds(polygons) for iso, polygons in sorted(countries.items())},
+        "missing": sorted(wanted - set(countries)),
+    }
+    with open(os.path.join(out_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    return manifest
+
+
+# ------------------------------------------------------------
+# RUNTIME
+# ------------------------------------------------------------
+
+def merge_bounds(boxes):
+    """
+    Union of [min lon, min lat, max lon, max lat] boxes. When the union spans
+    more than half the globe, the boxes are also tried with longitudes
+    shifted by 360, so e.g. Oceania stays a box across the antimeridian.
+    """
+    boxes = np.asarray(boxes, dtype=float)
+    min_lat, max_lat = boxes[:, 1].min(), boxes[:, 3].max()
+    min_lon, max_lon = boxes[:, 0].min(), boxes[:, 2].max()
+
+    if max_lon - min_lon > 180:
+        shifted = boxes[:, [0, 2]] + np.where(boxes[:, [0]] < 0, 360, 0)
+        if shifted[:, 1].max() - shifted[:, 0].min() < max_lon - min_lon:
+            min_lon, max_lon = shifted[:, 0].min(), shifted[:, 1].max()
+
+    return [float(min_lon), float(min_lat), float(max_lon), float(max_lat)]
+
+
+def scope_bounds(country_bounds):
+    """{"continent": {name: box}, "region": {name: box}} from the per-country boxes."""
+    result = {}
+    for scale, groups in (("continent", CONTINENTS), ("region", REGIONS)):
+        result[scale] = {}
+        for name, members in groups.items():
+            boxes = [country_bounds[COUNTRY_TO_ISO[c]] for c in members
+                     if COUNTRY_TO_ISO.get(c) in country_bounds]
+            if boxes:
+                result[scale][name] = merge_bounds(boxes)
+    return result
+
+
+def geo_viewport(box, margin=0.05):
+    """update_geos() arguments showing `box`, with a relative margin around it."""
+    min_lon, min_lat, max_lon, max_lat = box
+    pad_lon = (max_lon - min_lon) * margin
+    pad_lat = (max_lat - min_lat) * margin
+    center_lon = (min_lon + max_lon) / 2
+    center_lat = (min_lat + max_lat) / 2
+    return dict(
+        lonaxis_range=[min_lon - pad_lon, max_lon + pad_lon],
+        lataxis_range=[max(min_lat - pad_lat, -90), min(max_lat + pad_lat, 90)],
+        center=dict(lon=center_lon, lat=center_lat),
+        projection_rotation=dict(lon=(center_lon + 180) % 360 - 180),
+    )
+
+
+class GeometryLayer:
+    """The built geometry in `folder`: file per detail level and viewport per scope."""
+
+    def __init__(self, folder=GEOMETRY_DIR):
+        with open(os.path.join(folder, MANIFEST_NAME), encoding="utf-8") as f:
+            manifest = json.load(f)
+        self.version = manifest["version"]
+        self.files = manifest["files"]
+        self.countries = set(manifest["bounds"])
+        # Geometry built before the features carried names has none
+        self.properties = set(manifest.get("properties", []))
+        self.viewports = {
+            scale: {name: geo_viewport(box) for name, box in boxes.items()}
+            for scale, boxes in scope_bounds(manifest["bounds"]).items()
+        }
+
+    def asset_path(self, view):
+        """Path below assets/ of the geometry for a map view, versioned for caching."""
+        level = VIEW_LEVELS.get(view, "low")
+        return f"geo/{self.files[level]}?v={self.version}"
+
+    def viewport(self, scope, name):
+        """update_geos() arguments for a continent/region, or None to show the world."""
+        return self.viewports.get(scope, {}).get(name)
+
+
+def load_geometry_layer(folder=GEOMETRY_DIR):
+    """The GeometryLayer, or None when it is disabled or has not been built."""
+    if not USE_MAP_GEOMETRY or not os.path.exists(os.path.join(folder, MANIFEST_NAME)):
+        return None
+    return GeometryLayer(folder)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the simplified country geometry for the map.")
+    parser.add_argument("source", help="country GeoJSON with ISO alpha-3 codes, e.g. Natural Earth admin-0")
+    parser.add_argument("--out-dir", default=GEOMETRY_DIR)
+    args = parser.parse_args()
+
+    manifest = build_geometry(args.source, args.out_dir)
+    for level, name in manifest["files"].items():
+        size = os.path.getsize(os.path.join(args.out_dir, name))
+        print(f"{level:8} {name:28} {size:>12,} bytes")
+    if manifest["missing"]:
+        print("no geometry for:", ", ".join(manifest["missing"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+# jbi100_app/instrumentation.py
+"""
+Opt-in per-callback instrumentation (JBI100_INSTRUMENT=1).
+
+instrument(app) wraps `app.callback` so every server-side callback registered
+afterwards records wall time, CPU time, input/output JSON sizes and the
+trigger id of each call. Rolling percentiles are served as JSON on
+METRICS_PATH, and with PROFILE_THRESHOLD_MS set, every call that is slower
+gets a cProfile dump in PROFILE_DIR (open it with snakeviz or flameprof for
+a flame view).
+
+The endpoint answers requests carrying METRICS_TOKEN as a bearer token.
+Without a token it only answers requests from this machine that carry no
+proxy headers: behind a reverse proxy every request comes from 127.0.0.1,
+so the address alone would make the timings public.
+"""
+import cProfile
+import functools
+import hmac
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from collections import defaultdict, deque
+
+import flask
+from dash import callback_context
+from plotly.utils import PlotlyJSONEncoder
+
+from jbi100_app.cache import reinit_after_fork
+from jbi100_app.config import METRICS_PATH, METRICS_TOKEN, METRICS_WINDOW, PROFILE_THRESHOLD_MS, PROFILE_DIR
+
+LOCAL_ADDRESSES = {"127.0.0.1", "::1", "localhost"}
+
+# Set by reverse proxies on the requests they forward
+PROXY_HEADERS = ("Forwarded", "X-Forwarded-For", "X-Forwarded-Host", "X-Real-IP")
+
+
+class _SizeEncoder(PlotlyJSONEncoder):
+    """PlotlyJSONEncoder that never fails, e.g. on dash.no_update."""
+
+    def default(self, obj):
+        try:
+            return super().default(obj)
+        except TypeError:
+            return None
+
+
+def json_size(obj):
+    """Bytes of `obj` as JSON, roughly what Dash puts on the wire."""
+    try:
+        return len(json.dumps(obj, cls=_SizeEncoder).encode("utf-8"))
+    except (TypeError, ValueError):
+        return None
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class CallbackMetrics:
+    """Rolling window of call records per callback."""
+
+    FIELDS = ("wall_ms", "cpu_ms", "input_bytes", "output_bytes")
+
+    def __init__(self, window=METRICS_WINDOW):
+        self.window = window
+        self._calls = defaultdict(lambda: deque(maxlen=self.window))
+        self._totals = defaultdict(int)
+        self._lock = threading.Lock()
+        # Instrumented background jobs record from forked processes
+        reinit_after_fork(self)
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+
+    def record(self, name, **call):
+        with self._lock:
+            self._calls[name].append(call)
+            self._totals[name] += 1
+
+    def summary(self):
+        with self._lock:
+            snapshot = {name: list(calls) for name, calls in self._calls.items()}
+            totals = dict(self._totals)
+
+        out = {}
+        for name, calls in snapshot.items():
+            stats = {"count": totals[name], "window": len(calls)}
+            for field in self.FIELDS:
+                values = sorted(c[field] for c in calls if c.get(field) is not None)
+                stats[field] = {
+                    "p50": percentile(values, 50),
+                    "p90": percentile(values, 90),
+                    "p99": percentile(values, 99),
+                    "max": values[-1] if values else None,
+                }
+            stats["last_trigger"] = calls[-1]["trigger"] if calls else None
+            out[name] = stats
+        return out
+
+
+METRICS = CallbackMetrics()
+
+
+def _trigger_id():
+    try:
+        trigger = callback_context.triggered_id
+    except Exception:  # outside a request, e.g. called from a benchmark
+        return None
+    return trigger if isinstance(trigger, (str, dict)) else None
+
+
+def _dump_profile(profiler, name, wall_ms):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stem = os.path.join(PROFILE_DIR, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{wall_ms:.0f}ms")
+
+    profiler.dump_stats(stem + ".prof")
+
+    text = io.StringIO()
+    pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(40)
+    with open(stem + ".txt", "w") as f:
+        f.write(text.getvalue())
+
+
+def timed_callback(func, metrics=METRICS, profile_threshold_ms=PROFILE_THRESHOLD_MS):
+    """Wrap one callback function so every call is recorded in `metrics`."""
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profiler = None
+        if profile_threshold_ms is not None:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:  # another profiler is already active
+                profiler = None
+
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            cpu_ms = (time.thread_time() - cpu_start) * 1000
+            wall_ms = (time.perf_counter() - wall_start) * 1000
+            if profiler is not None:
+                profiler.disable()
+
+        metrics.record(
+            name,
+            wall_ms=wall_ms,
+            cpu_ms=cpu_ms,
+            input_bytes=json_size([args, kwargs]),
+            output_bytes=json_size(result),
+            trigger=_trigger_id(),
+        )
+
+        if profiler is not None and wall_ms > profile_threshold_ms:
+            _dump_profile(profiler, name, wall_ms)
+
+        return result
+
+    return wrapper
+
+
+def metrics_allowed(request, token=METRICS_TOKEN):
+    """Whether `request` may read the metrics: the right token, or local and not proxied."""
+    if token is not None:
+        scheme, _, given = request.headers.get("Authorization", "").partition(" ")
+        return scheme.lower() == "bearer" and hmac.compare_digest(given.encode(), token.encode())
+
+    if any(header in request.headers for header in PROXY_HEADERS):
+        return False
+    return request.remote_addr in LOCAL_ADDRESSES
+
+
+def instrument(app, metrics=METRICS, metrics_path=METRICS_PATH, token=METRICS_TOKEN):
+    """
+    Instrument every callback registered on `app` from now on and expose the
+    metrics on `metrics_path` (see metrics_allowed for who may read them).
+    """
+    register = app.callback
+
+    @functools.wraps(register)
+    def callback(*args, **kwargs):
+        decorator = register(*args, **kwargs)
+
+        def wrap(func):
+            decorator(timed_callback(func, metrics))
+            # Like Dash, hand back the undecorated function to the module
+            return func
+
+        return wrap
+
+    app.callback = callback
+
+    @app.server.route(metrics_path)
+    def callback_metrics():
+        if not metrics_allowed(flask.request, token):
+            flask.abort(403)
+        return flask.jsonify(metrics.summary())
+
+    return app
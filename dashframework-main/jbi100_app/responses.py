@@ -0,0 +1,152 @@
+# jbi100_app/responses.py
+"""
+HTTP response compression and caching headers for the Dash server.
+
+configure_responses(app) adds one `after_request` hook to the Flask server:
+
+* text-like responses (callback JSON, layout, assets) of at least
+  COMPRESS_MIN_BYTES are compressed with the first encoding in
+  COMPRESS_ENCODINGS that the browser accepts (brotli needs the optional
+  `brotli` package, gzip is always available)
+* assets requested with a version query (?m=... from Dash, ?v=... from the
+  map geometry) are cacheable for ASSET_MAX_AGE seconds; other assets, the
+  layout and the callback graph revalidate with an ETag and get an empty
+  304 when unchanged
+
+ETags are weak, so one tag covers every encoding of the same content.
+Compressed assets are kept in memory per (path, ETag, encoding).
+"""
+import gzip
+import hashlib
+
+import flask
+
+from jbi100_app.cache import LRUCache
+from jbi100_app.config import (
+    COMPRESS_ENCODINGS,
+    COMPRESS_MIN_BYTES,
+    GZIP_LEVEL,
+    BROTLI_QUALITY,
+    ASSET_MAX_AGE,
+)
+
+try:
+    import brotli
+except ImportError:  # responses are only gzipped without brotli
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "text/",
+    "image/svg+xml",
+)
+
+# Dash endpoints whose GET response only changes with the data (hot reload)
+REVALIDATED_ENDPOINTS = ("_dash-layout", "_dash-dependencies")
+
+# Query parameters that version an asset URL
+VERSION_PARAMS = ("m", "v")
+
+COMPRESSED_ASSETS = LRUCache(maxsize=64)
+
+
+def available_encodings(encodings=COMPRESS_ENCODINGS):
+    """The configured encodings this process can produce, in preference order."""
+    return [e for e in encodings if e == "gzip" or (e == "br" and brotli is not None)]
+
+
+def compress(data, encoding):
+    """`data` (bytes) compressed with "gzip" or "br"."""
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    # mtime=0 keeps the output identical for identical input
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def choose_encoding(request, encodings):
+    """First of `encodings` the request accepts, or None."""
+    for encoding in encodings:
+        if request.accept_encodings[encoding]:
+            return encoding
+    return None
+
+
+def is_compressible(response):
+    return (
+        response.status_code == 200
+        and "Content-Encoding" not in response.headers
+        and response.mimetype is not None
+        and response.mimetype.startswith(COMPRESSIBLE_TYPES)
+    )
+
+
+def weak_etag(response):
+    """ETag value of the response, set from a hash of its body when missing."""
+    etag, _ = response.get_etag()
+    if etag is None:
+        etag = hashlib.sha1(response.get_data()).hexdigest()[:20]
+    response.set_etag(etag, weak=True)
+    return etag
+
+
+def not_modified(response, etag):
+    """Empty 304 keeping the validators of `response`."""
+    result = flask.Response(status=304)
+    result.set_etag(etag, weak=True)
+    for header in ("Cache-Control", "Vary"):
+        if header in response.headers:
+            result.headers[header] = response.headers[header]
+    return result
+
+
+def configure_responses(app, encodings=COMPRESS_ENCODINGS, min_bytes=COMPRESS_MIN_BYTES):
+    """Install compression and caching headers on `app.server`."""
+    encodings = available_encodings(encodings)
+    assets_prefix = app.config.routes_pathname_prefix + app.config.assets_url_path.strip("/") + "/"
+    revalidated = {app.config.routes_pathname_prefix + name for name in REVALIDATED_ENDPOINTS}
+
+    @app.server.after_request
+    def finish_response(response):
+        request = flask.request
+        if request.method not in ("GET", "HEAD", "POST") or response.status_code != 200:
+            return response
+
+        is_asset = request.path.startswith(assets_prefix)
+        if is_asset or request.path in revalidated:
+            # Static files are streamed; read them so they can be hashed and compressed
+            response.direct_passthrough = False
+            if is_asset and any(p in request.args for p in VERSION_PARAMS):
+                response.cache_control.no_cache = None
+                response.cache_control.public = True
+                response.cache_control.max_age = ASSET_MAX_AGE
+                response.cache_control.immutable = True
+            else:
+                response.cache_control.no_cache = True
+            etag = weak_etag(response)
+            if request.if_none_match.contains_weak(etag):
+                return not_modified(response, etag)
+        else:
+            etag = None
+
+        if not encodings or not is_compressible(response):
+            return response
+        response.vary.add("Accept-Encoding")
+
+        data = response.get_data()
+        encoding = choose_encoding(request, encodings)
+        if encoding is None or len(data) < min_bytes:
+            return response
+
+        if is_asset:
+            body = COMPRESSED_ASSETS.get_or_compute(
+                (request.path, etag, encoding), lambda: compress(data, encoding)
+            )
+        else:
+            body = compress(data, encoding)
+
+        response.set_data(body)
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    return app
@@ -0,0 +1,214 @@
+# jbi100_app/shared_store.py
+"""
+Shared-memory store of the loaded category datasets.
+
+The first process to load a category publishes its frame, ranks and
+statistics as plain .npy buffers in a RAM-backed folder (/dev/shm by
+default). Every other process attaches to them with np.load(mmap_mode="r"),
+so the column data lives once in the page cache however many worker
+processes map it, and attaching costs no parsing or copying.
+
+Numeric columns and categorical codes are mapped; the few columns that
+have no fixed-width representation (text), a non-integer index and the
+small statistics table are stored as Arrow IPC (Feather) files. Nothing
+is unpickled, and the folder must be private to the user running the app:
+it is created with mode 0700, and a folder that is not owned by this user
+or that others can write to disables the store.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import stat
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # store is simply disabled without pyarrow
+    feather = None
+
+logger = logging.getLogger(__name__)
+
+META_NAME = "meta.json"
+
+# Versions of a file kept published: the current one and the one before,
+# which workers that have not refreshed yet may still attach to
+KEEP_VERSIONS = 2
+
+
+def is_private(folder):
+    """Folder owned by this user that no other user can write to or read."""
+    if not hasattr(os, "getuid"):  # Windows: no getuid, the temp folder is per user
+        return True
+    try:
+        st = os.lstat(folder)
+    except OSError:
+        return False
+    return stat.S_ISDIR(st.st_mode) and st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+
+class SharedStore:
+    """
+    Published datasets under `root`, one folder per source file version.
+
+    attach() returns (df, attributes, tables) for a CSV or None when it was
+    not published yet (or changed since); publish() stores a loaded frame.
+    `dtypes` are categorical dtypes restored by column name instead of being
+    stored (the shared geo dtypes); `variant` separates differently loaded
+    frames of the same file (e.g. compact dtypes).
+    """
+
+    def __init__(self, root, dtypes=None, variant=""):
+        self.root = root
+        self.dtypes = dtypes or {}
+        self.variant = variant
+        self.enabled = feather is not None
+        if self.enabled:
+            os.makedirs(root, mode=0o700, exist_ok=True)
+            if not is_private(root):
+                logger.warning("Shared store disabled: %s is not private to this user", root)
+                self.enabled = False
+
+    def _folder(self, path, fingerprint):
+        stem = os.path.splitext(os.path.basename(path))[0]
+        if self.variant:
+            stem = f"{stem}.{self.variant}"
+        key = hashlib.sha1(json.dumps(list(fingerprint)).encode()).hexdigest()[:12]
+        return os.path.join(self.root, f"{stem}-{key}")
+
+    # ---------- attach ----------
+
+    def attach(self, path, fingerprint):
+        if not self.enabled or not is_private(self.root):
+            return None
+
+        folder = self._folder(path, fingerprint)
+        try:
+            with open(os.path.join(folder, META_NAME)) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        df = self._read_frame(folder, "frame", meta["frame"])
+        tables = {
+            "ranks": self._read_frame(folder, "ranks", meta["ranks"]),
+            "stats": feather.read_feather(os.path.join(folder, "stats.arrow")),
+        }
+        return df, [tuple(a) for a in meta["attributes"]], tables
+
+    def _read_frame(self, folder, name, meta):
+        def load(file):
+            return np.load(os.path.join(folder, file), mmap_mode="r")
+
+        # Text columns and a non-integer index, keyed by column position
+        text = None
+        if meta.get("text"):
+            text = feather.read_feather(os.path.join(folder, f"{name}.text.arrow"))
+
+        columns = {}
+        object_columns = {}
+        for i, (col, kind, extra) in enumerate(meta["columns"]):
+            file = f"{name}.{i}"
+            if kind == "numpy":
+                columns[col] = load(file + ".npy")
+            elif kind == "categorical":
+                dtype = self.dtypes.get(col) or pd.CategoricalDtype(extra)
+                columns[col] = pd.Categorical.from_codes(load(file + ".npy"), dtype=dtype)
+            else:
+                columns[col] = text[str(i)].array
+                if extra == "object":
+                    object_columns[col] = object
+
+        index = None
+        if meta["index"] == "numpy":
+            index = load(f"{name}.index.npy")
+        elif meta["index"] == "arrow":
+            index = pd.Index(text["index"], name=meta["index_name"])
+        return pd.DataFrame(columns, index=index, copy=False).astype(object_columns)
+
+    # ---------- publish ----------
+
+    def publish(self, path, fingerprint, df, attributes, tables):
+        if not self.enabled:
+            return
+
+        folder = self._folder(path, fingerprint)
+        if os.path.exists(folder):
+            return
+
+        # Written next to the final folder, then renamed into place in one step
+        tmp = tempfile.mkdtemp(dir=self.root, prefix=".tmp-")
+        try:
+            meta = {
+                "attributes": [list(a) for a in attributes],
+                "frame": self._write_frame(tmp, "frame", df),
+                "ranks": self._write_frame(tmp, "ranks", tables["ranks"]),
+            }
+            feather.write_feather(tables["stats"].reset_index(drop=True), os.path.join(tmp, "stats.arrow"))
+            with open(os.path.join(tmp, META_NAME), "w") as f:
+                json.dump(meta, f)
+
+            os.rename(tmp, folder)
+        except OSError:
+            # Another process published the same version first
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+
+        self._remove_old_versions(folder)
+
+    def _write_frame(self, folder, name, df):
+        columns = []
+        text = {}
+        for i, col in enumerate(df.columns):
+            s = df[col]
+            file = os.path.join(folder, f"{name}.{i}")
+
+            if isinstance(s.dtype, pd.CategoricalDtype):
+                np.save(file + ".npy", s.cat.codes.to_numpy())
+                categories = None if col in self.dtypes else s.cat.categories.tolist()
+                columns.append((col, "categorical", categories))
+            elif isinstance(s.dtype, np.dtype) and s.dtype.kind in "biuf":
+                np.save(file + ".npy", s.to_numpy())
+                columns.append((col, "numpy", None))
+            else:
+                text[str(i)] = s.reset_index(drop=True)
+                # Object columns would come back as Arrow text otherwise
+                columns.append((col, "arrow", "object" if s.dtype == object else None))
+
+        index = None
+        if isinstance(df.index, pd.RangeIndex):
+            pass
+        elif df.index.dtype.kind in "iu":
+            index = "numpy"
+            np.save(os.path.join(folder, f"{name}.index.npy"), df.index.to_numpy())
+        else:
+            index = "arrow"
+            text["index"] = df.index.to_series(index=pd.RangeIndex(len(df)))
+
+        if text:
+            feather.write_feather(pd.DataFrame(text), os.path.join(folder, f"{name}.text.arrow"))
+
+        return {"columns": columns, "index": index, "index_name": df.index.name, "text": bool(text)}
+
+    def _remove_old_versions(self, folder):
+        """
+        Drop all but the KEEP_VERSIONS newest versions of the same file.
+        Processes mapping a dropped version keep their pages.
+        """
+        current = os.path.basename(folder)
+        stem = current.rsplit("-", 1)[0]
+        older = [
+            os.path.join(self.root, name) for name in os.listdir(self.root)
+            if name != current and not name.startswith(".") and name.rsplit("-", 1)[0] == stem
+        ]
+        older.sort(key=os.path.getmtime, reverse=True)
+        for old in older[KEEP_VERSIONS - 1:]:
+            shutil.rmtree(old, ignore_errors=True)
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+        os.makedirs(self.root, mode=0o700, exist_ok=True)
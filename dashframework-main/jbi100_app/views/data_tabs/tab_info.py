@@ -24,80 +24,109 @@ def format_area(area):
         return "Unknown"
 
 
-def render_info_tab(attrs, geo_tags, geo_scale, country_info_df):
-    """
-    Renders Info tab content using the country_info dataset.
-    """
-
-    # ----- No country selected -----
-    if not geo_tags:
-        return html.Div([
-            html.H3("Country Overview"),
-            html.P("Select a country in the left panel or by clicking on the map."),
-        ])
-
-    # Only use the first selected country
-    country = geo_tags[0]["id"].upper()
-
-    if country not in country_info_df["Country"].values:
-        return html.Div([
-            html.H3("Country Overview"),
-            html.P("No information available for the selected country."),
-        ])
+def _text(value, default="Unknown"):
+    """Cell value as shown in the Info tab, `default` for empty cells."""
+    if value is None or (isinstance(value, float) and value != value):
+        return default
+    return value
 
-    row = country_info_df[country_info_df["Country"] == country].iloc[0]
 
-    name = row.get("Written_name", country)
-    capital = row.get("Capital", "Unknown")
-    gov_type = row.get("Government_Type", "Unknown")
-    suffrage = row.get("Suffrage_Age", "Unknown")
-    pop = format_population(row.get("Total_Population"))
-    area = format_area(row.get("Area_Total"))
-    continent = row.get("Continent", "Unknown")
-    subregion = row.get("Region", "Unknown")
-    desc = row.get("Description", "")
-    wiki = row.get("Wiki_link", "")
-
-    # ----- Layout -----
+def country_info_records(country_info_df):
+    """
+    Pre-formatted Info tab records keyed by (upper-case) country, built once
+    at startup so rendering the tab is a dict lookup.
+    """
+    records = {}
+    for row in country_info_df.to_dict("records"):
+        country = str(row.get("Country", "")).strip().upper()
+        if not country or country in records:
+            continue
+
+        name = _text(row.get("Written_name"), country)
+        continent = _text(row.get("Continent"))
+        wiki = _text(row.get("Wiki_link"), "")
+
+        records[country] = {
+            "name": name,
+            "capital": _text(row.get("Capital")),
+            "gov_type": _text(row.get("Government_Type")),
+            "suffrage": _text(row.get("Suffrage_Age")),
+            "pop": format_population(row.get("Total_Population")),
+            "area": format_area(row.get("Area_Total")),
+            "continent": continent.title() if isinstance(continent, str) else continent,
+            "subregion": _text(row.get("Region")),
+            "desc": _text(row.get("Description"), ""),
+            "wiki": wiki if wiki else f"https://en.wikipedia.org/wiki/{quote(str(name))}",
+        }
+    return records
+
+
+def render_country_card(record):
     return html.Div(
         style={"maxWidth": "650px"},
         children=[
 
-            html.H2(name),
+            html.H2(record["name"]),
 
-            html.P(desc, style={"fontSize": "18px", "marginBottom": "20px"}),
+            html.P(record["desc"], style={"fontSize": "18px", "marginBottom": "20px"}),
 
             html.H3("Basic Facts", style={"marginTop": "20px"}),
 
             html.Ul([
-                html.Li([html.B("Capital: "), capital]),
-                html.Li([html.B("Government: "), gov_type]),
-                html.Li([html.B("Suffrage Age: "), suffrage]),
-                html.Li([html.B("Continent: "), continent.title() if isinstance(continent, str) else continent]),
-                html.Li([html.B("Subregion: "), subregion]),
-                html.Li([html.B("Population: "), pop]),
-                html.Li([html.B("Area: "), area]),
+                html.Li([html.B("Capital: "), record["capital"]]),
+                html.Li([html.B("Government: "), record["gov_type"]]),
+                html.Li([html.B("Suffrage Age: "), record["suffrage"]]),
+                html.Li([html.B("Continent: "), record["continent"]]),
+                html.Li([html.B("Subregion: "), record["subregion"]]),
+                html.Li([html.B("Population: "), record["pop"]]),
+                html.Li([html.B("Area: "), record["area"]]),
             ]),
 
             html.Br(),
 
-            # Optional Wikipedia link
+            # Wikipedia link (falls back to a search on the country name)
             html.Div([
                 html.A(
                     "↗ More details on Wikipedia",
-                    href=wiki if wiki else f"https://en.wikipedia.org/wiki/{quote(name)}",
+                    href=record["wiki"],
                     target="_blank",
                     style={"fontSize": "16px"}
                 )
-            ]) if wiki or name else html.Div(),
-
-            html.Div([
-                html.A(
-                    "↗ More details on Wikipedia",
-                    href=wiki if wiki else f"https://en.wikipedia.org/wiki/{quote(name)}",
-                    target="_blank",
-                    style={"fontSize": "16px"}
-                )
-            ]) if wiki or name else html.Div(),
+            ]),
         ]
     )
+
+
+def render_info_tab(attrs, geo_tags, geo_scale, country_info):
+    """
+    Renders Info tab content for every selected country.
+    `country_info` is the dict built by country_info_records().
+    """
+
+    # ----- No country selected -----
+    if not geo_tags:
+        return html.Div([
+            html.H3("Country Overview"),
+            html.P("Select a country in the left panel or by clicking on the map."),
+        ])
+
+    records = [
+        country_info[t["id"].upper()]
+        for t in geo_tags
+        if t["id"].upper() in country_info
+    ]
+
+    if not records:
+        return html.Div([
+            html.H3("Country Overview"),
+            html.P("No information available for the selected country."),
+        ])
+
+    # ----- Layout -----
+    cards = []
+    for i, record in enumerate(records):
+        if i:
+            cards.append(html.Hr())
+        cards.append(render_country_card(record))
+
+    return html.Div(cards)
@@ -1,16 +1,174 @@
+import re
+
 from dash import html, dash_table
 
-def render_numbers_tab(df):
+PAGE_SIZE = 15
+
+# Precomputed statistics columns -> table headers
+STAT_LABELS = {
+    "attribute": "Attribute",
+    "group": "Scope",
+    "count": "Count",
+    "nulls": "Missing",
+    "min": "Min",
+    "q25": "25%",
+    "median": "Median",
+    "q75": "75%",
+    "max": "Max",
+    "mean": "Mean",
+}
+
+# Operators of the DataTable filter syntax, longest first so that e.g.
+# ">=" is matched before ">"
+FILTER_OPERATORS = [
+    ["ge ", ">="],
+    ["le ", "<="],
+    ["lt ", "<"],
+    ["gt ", ">"],
+    ["ne ", "!="],
+    ["eq ", "="],
+    ["contains "],
+    ["datestartswith "],
+]
+
+# '{column name} <operator> <value>'
+FILTER_PART = re.compile(r"\s*\{(.*?)\}\s*(.*)$", re.S)
+
+
+def split_filter_part(filter_part):
+    """
+    '{col} >= 5' -> ('col', 'ge', 5). The column name is only read from
+    inside the braces and the operator right after them, so names that
+    contain operator words (e.g. '{Usage le vel}') parse correctly.
+    """
+    match = FILTER_PART.match(filter_part)
+    if match is None:
+        return None, None, None
+    name, rest = match.groups()
+
+    for operator_type in FILTER_OPERATORS:
+        for operator in operator_type:
+            if rest.startswith(operator):
+                value_part = rest[len(operator):].strip()
+                v0 = value_part[0] if value_part else ""
+                if v0 and v0 == value_part[-1] and v0 in ("'", '"', "`"):
+                    value = value_part[1:-1].replace("\\" + v0, v0)
+                else:
+                    try:
+                        value = float(value_part)
+                    except ValueError:
+                        value = value_part
+
+                # word operators need spaces after them in the filter string,
+                # but we don't want these later
+                return name, operator_type[0].strip(), value
+
+    return None, None, None
+
+
+def filter_frame(df, filter_query):
+    """Apply a DataTable `filter_query` ("{a} > 1 && {b} contains x") to df."""
+    if not filter_query:
+        return df
+
+    for filter_part in filter_query.split(" && "):
+        col_name, operator, value = split_filter_part(filter_part)
+        if col_name not in df.columns:
+            continue
+
+        col = df[col_name]
+        if operator in ("eq", "ne", "lt", "le", "gt", "ge"):
+            if col.dtype.kind not in "iuf":
+                # Text and categorical columns compare as strings
+                col, value = col.astype(str), str(value)
+            elif isinstance(value, str):
+                # Text filter on a numeric column never matches
+                return df.iloc[0:0]
+            df = df.loc[getattr(col, operator)(value)]
+        elif operator == "contains":
+            df = df.loc[col.astype(str).str.contains(str(value), case=False, regex=False)]
+        elif operator == "datestartswith":
+            df = df.loc[col.astype(str).str.startswith(str(value))]
+
+    return df
+
+
+def sort_frame(df, sort_by):
+    """Apply a DataTable `sort_by` list to df."""
+    sort_by = [s for s in sort_by or [] if s["column_id"] in df.columns]
+    if not sort_by:
+        return df
+
+    return df.sort_values(
+        [s["column_id"] for s in sort_by],
+        ascending=[s["direction"] == "asc" for s in sort_by],
+        na_position="last",
+    )
+
+
+def table_page(df, page_current, page_size, sort_by, filter_query):
+    """
+    Records of one table page, the total number of pages and the page shown.
+    A page past the end (e.g. after a filter removed rows) becomes the last page.
+    """
+    df = sort_frame(filter_frame(df, filter_query), sort_by)
+
+    page_count = max(1, -(-len(df) // page_size))
+    page_current = min(max(page_current, 0), page_count - 1)
+    start = page_current * page_size
+    return df.iloc[start:start + page_size].to_dict("records"), page_count, page_current
+
+
+def render_stats_table(stats):
+    """Summary table of the precomputed attribute statistics."""
+    stats = stats[list(STAT_LABELS)]
+    numeric = stats.select_dtypes("number").columns
+    floats = stats.select_dtypes("floating").columns
+    stats = stats.astype({c: float for c in floats}).round(2)
+
+    return dash_table.DataTable(
+        id="numbers-stats",
+        data=stats.to_dict("records"),
+        columns=[
+            {"name": label, "id": c, "type": "numeric" if c in numeric else "text"}
+            for c, label in STAT_LABELS.items()
+        ],
+        style_table={"overflowX": "auto", "marginBottom": "20px"},
+    )
+
+
+def render_numbers_tab(df, stats=None):
     if df is None or df.empty:
         return html.Div("No data available for the selected attributes or region.")
 
+    # Only the first page is sent; paging, sorting and filtering are done
+    # server-side by the numbers-table callback
+    records, page_count, _ = table_page(df, 0, PAGE_SIZE, [], "")
+
+    summary = []
+    if stats is not None and not stats.empty:
+        summary = [html.H3("Summary"), render_stats_table(stats)]
+
     return html.Div([
+        *summary,
         html.H3("Numbers"),
         dash_table.DataTable(
-            data=df.to_dict("records"),
-            columns=[{"name": c, "id": c} for c in df.columns],
+            id="numbers-table",
+            data=records,
+            columns=[
+                {"name": c, "id": c,
+                 "type": "numeric" if df[c].dtype.kind in "iuf" else "text"}
+                for c in df.columns
+            ],
             style_table={"overflowX": "auto"},
-            page_size=15
+            page_current=0,
+            page_size=PAGE_SIZE,
+            page_count=page_count,
+            page_action="custom",
+            sort_action="custom",
+            sort_mode="multi",
+            sort_by=[],
+            filter_action="custom",
+            filter_query="",
         )
     ])
-
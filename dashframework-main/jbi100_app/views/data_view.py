@@ -216,8 +216,8 @@ def data_view_layout():
                         },
                         children=[
                             html.Button(
-                                "Map view",
-                                id="bottom-nav-button",
+                                "Go to Map View",
+                                id="data-nav-button",
                                 className="switch-view-button"
                             )
                         ]
@@ -0,0 +1,59 @@
+# jbi100_app/views/layout_cache.py
+"""
+Page views built once and kept in serialised form.
+
+view_layout(name) returns the view's component tree as the plain JSON
+structure Dash sends to the browser ({"type", "namespace", "props"}), built
+on first use and reused for every page load and lazy view request after
+that. The views only depend on the dataset lists (categories, attributes,
+countries), so the cache is dropped whenever DATASETS reloads a category.
+"""
+import threading
+
+from dash.development.base_component import Component
+
+from jbi100_app.data_loader import DATASETS
+from jbi100_app.views.data_view import data_view_layout
+from jbi100_app.views.map_view import map_view_layout
+
+VIEWS = {
+    "data": data_view_layout,
+    "map": map_view_layout,
+}
+
+# Page shown on load; the other views are fetched on the first switch
+INITIAL_VIEW = "data"
+
+_LAYOUTS = {}
+_LOCK = threading.Lock()
+
+
+def serialise(value):
+    """Component tree as nested dicts/lists, like Dash's JSON encoding of it."""
+    if isinstance(value, Component):
+        return {key: serialise(item) for key, item in value.to_plotly_json().items()}
+    if isinstance(value, dict):
+        return {key: serialise(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [serialise(item) for item in value]
+    return value
+
+
+def view_layout(name):
+    """Serialised layout of the view `name` ("data" or "map")."""
+    layout = _LAYOUTS.get(name)
+    if layout is None:
+        with _LOCK:
+            layout = _LAYOUTS.get(name)
+            if layout is None:
+                layout = _LAYOUTS[name] = serialise(VIEWS[name]())
+    return layout
+
+
+def discard_layouts(changed=None):
+    """Rebuild the views on next use, e.g. after categories were reloaded."""
+    with _LOCK:
+        _LAYOUTS.clear()
+
+
+DATASETS.on_change(discard_layouts)
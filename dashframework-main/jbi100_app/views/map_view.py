@@ -1,12 +1,13 @@
 from dash import html, dcc
-from jbi100_app.data_loader import CATEGORY_ATTRIBUTES, ALL_COUNTRIES, COUNTRY_TO_REGION, COUNTRY_TO_CONTINENT
+from jbi100_app.data_loader import CATEGORY_ATTRIBUTES
 
 
 def map_view_layout() -> html.Div:
     category_list = list(CATEGORY_ATTRIBUTES.keys())
 
-    # Dynamic region list (UN M49)
-    REGION_OPTIONS = ["Global"] + sorted(set(COUNTRY_TO_REGION.values()))
+    # The region and country options are filled clientside from the
+    # geo-options-store as soon as the view is in the page
+    REGION_OPTIONS = ["Global"]
 
     return html.Div(
         id="map-view",
@@ -70,7 +71,7 @@ def map_view_layout() -> html.Div:
                         children=[
                             html.Button(
                                 "Go to Data View",
-                                id="bottom-nav-button",
+                                id="map-nav-button",
                                 className="switch-view-button"
                             )
                         ]
@@ -97,7 +98,7 @@ def map_view_layout() -> html.Div:
                                     ),
                                     dcc.Dropdown(
                                         id="search-country",
-                                        options=[{"label": c, "value": c} for c in ALL_COUNTRIES],
+                                        options=[],
                                         searchable=True,
                                         clearable=True,
                                         placeholder="Search country",
@@ -110,7 +111,10 @@ def map_view_layout() -> html.Div:
                     # --- MAP BELOW ---
                     dcc.Graph(id="mun-map",
                               style={"height": "100%"},
-                              )
+                              ),
+
+                    # Highlight trace index + countries on the map, set by update_map
+                    dcc.Store(id="map-highlight-store"),
                 ],
             ),
 
@@ -0,0 +1,71 @@
+# jbi100_app/watcher.py
+"""
+Polling watcher that hot-reloads the datasets when CSVs in DATA_DIR change.
+
+Every `interval` seconds the CSV sizes and modification times are compared
+with the versions the registry knows. A change is only acted upon once it
+has looked the same for two polls in a row, so files that are still being
+copied are not ingested half-written; the registry then re-reads just the
+affected categories (DatasetRegistry.refresh).
+"""
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+_WATCHER = None
+
+
+class DataWatcher(threading.Thread):
+    """Daemon thread refreshing `registry` whenever its data_dir settles after a change."""
+
+    def __init__(self, registry, interval):
+        super().__init__(name="data-watcher", daemon=True)
+        self.registry = registry
+        self.interval = interval
+        self.pid = os.getpid()
+        self._pending = None
+        self._stopped = threading.Event()
+
+    def poll(self):
+        """One check of data_dir; returns the categories that were reloaded."""
+        found = self.registry.csv_files()
+        known = {
+            category: (path, self.registry.fingerprints.get(category))
+            for category, path in self.registry.files.items()
+        }
+
+        if found == known:
+            self._pending = None
+            return []
+
+        # Wait until the folder looks the same on two polls in a row
+        if found != self._pending:
+            self._pending = found
+            return []
+
+        self._pending = None
+        return self.registry.refresh()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:  # keep watching whatever a single refresh does
+                logger.exception("Checking %s for changed datasets failed", self.registry.data_dir)
+
+    def stop(self):
+        self._stopped.set()
+
+
+def start_watcher(registry, interval):
+    """
+    Start the watcher of this process. Threads do not survive a fork, so a
+    forked worker calling this gets its own watcher.
+    """
+    global _WATCHER
+    if _WATCHER is None or _WATCHER.pid != os.getpid():
+        _WATCHER = DataWatcher(registry, interval)
+        _WATCHER.start()
+    return _WATCHER
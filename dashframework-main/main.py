@@ -1,9 +1,23 @@
 # jbi100_app/main.py
 from dash import Dash
 
+from jbi100_app.background import BACKGROUND_MANAGER
+from jbi100_app.responses import configure_responses
+
 app = Dash(
     __name__,
     suppress_callback_exceptions=True,
+    background_callback_manager=BACKGROUND_MANAGER,
 )
 
 app.title = "JBI100 Dashboard"
+
+# Compressed responses and caching headers for assets and the layout
+configure_responses(app)
+
+# Opt-in callback timing; must run before any callback is registered
+from jbi100_app.config import INSTRUMENT_CALLBACKS  # noqa: E402
+
+if INSTRUMENT_CALLBACKS:
+    from jbi100_app.instrumentation import instrument
+    instrument(app)
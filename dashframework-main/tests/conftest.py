@@ -0,0 +1,41 @@
+# tests/conftest.py
+"""
+Shared test setup. Run from the dashframework-main folder:
+
+    python -m pytest tests
+
+The app reads its configuration when first imported, so before any test
+module is collected the environment is pointed at small synthetic datasets
+(benchmarks.fixtures) in a temporary folder.
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The app is not an installed package; import jbi100_app from the checkout
+if APP_ROOT not in sys.path:
+    sys.path.insert(0, APP_ROOT)
+
+_FIXTURES = None
+
+
+def pytest_configure(config):
+    global _FIXTURES
+    from benchmarks.fixtures import write_fixtures
+
+    _FIXTURES = tempfile.mkdtemp(prefix="jbi100-tests-")
+    data_dir, info_path = write_fixtures(_FIXTURES, countries=40, years=3, attributes=3, categories=2)
+    os.environ.update({
+        "JBI100_DATA_DIR": data_dir,
+        "JBI100_COUNTRY_INFO": info_path,
+        "JBI100_CACHE_DIR": os.path.join(_FIXTURES, "cache"),
+        "JBI100_SHARED_CACHE": "0",
+    })
+
+
+def pytest_unconfigure(config):
+    if _FIXTURES is not None:
+        shutil.rmtree(_FIXTURES, ignore_errors=True)
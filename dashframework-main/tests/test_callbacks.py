@@ -0,0 +1,41 @@
+# tests/test_callbacks.py
+"""
+Server round trips per interaction and the clientside callbacks, as
+checked by benchmarks.callback_counts.
+"""
+import shutil
+
+import pytest
+
+from benchmarks.callback_counts import (
+    INTERACTIONS,
+    load_dependencies,
+    round_trips,
+    run_clientside,
+    unexpected_callbacks,
+)
+
+
+@pytest.fixture(scope="module")
+def deps():
+    from app import app
+
+    return load_dependencies(app)
+
+
+@pytest.mark.parametrize("interaction", list(INTERACTIONS))
+def test_interaction_reaches_only_the_allowed_server_callbacks(deps, interaction):
+    comp_id, prop, allowed = INTERACTIONS[interaction]
+    server, _ = round_trips(deps, comp_id, prop)
+
+    assert server, "the interaction no longer triggers anything"
+    assert unexpected_callbacks(server, allowed) == []
+
+
+def test_a_repeated_round_trip_is_unexpected():
+    assert unexpected_callbacks(["a.b", "a.b"], ["a.b"]) == ["a.b"]
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs Node.js")
+def test_clientside_functions_exist_and_return_the_expected_results(deps):
+    assert run_clientside(deps, shutil.which("node")) == []
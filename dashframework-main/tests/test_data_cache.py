@@ -0,0 +1,53 @@
+# tests/test_data_cache.py
+"""The snapshot cache shared by worker processes."""
+import multiprocessing
+import os
+
+import pandas as pd
+import pytest
+
+from jbi100_app.data_cache import SnapshotCache, source_state
+
+WORKERS = 8
+
+
+def write_csv(path, value):
+    pd.DataFrame({"Country": ["FRANCE"], "GDP": [value]}).to_csv(path, index=False)
+
+
+def store_csv(cache_dir, path):
+    df = pd.read_csv(path)
+    SnapshotCache(cache_dir).store(path, source_state(path), df, [("GDP", "Gdp")])
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_concurrent_stores_keep_every_manifest_entry(tmp_path):
+    paths = []
+    for i in range(WORKERS):
+        paths.append(str(tmp_path / f"category_{i}.csv"))
+        write_csv(paths[-1], i)
+
+    cache_dir = str(tmp_path / "cache")
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=store_csv, args=(cache_dir, p)) for p in paths]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+
+    cache = SnapshotCache(cache_dir)
+    assert all(cache.lookup(p) is not None for p in paths)
+
+
+def test_csv_changed_during_ingest_is_not_served(tmp_path):
+    path = str(tmp_path / "economy.csv")
+    write_csv(path, 1.0)
+    cache = SnapshotCache(str(tmp_path / "cache"))
+
+    source = source_state(path)
+    df = pd.read_csv(path)
+    # Rewritten after the state was taken, while the old contents were being ingested
+    write_csv(path, 20.0)
+    cache.store(path, source, df, [("GDP", "Gdp")])
+
+    assert cache.lookup(path) is None
@@ -0,0 +1,80 @@
+# tests/test_fork.py
+"""Processes forked while other threads hold locks, like background jobs."""
+import multiprocessing
+import os
+import threading
+import time
+
+import pytest
+
+from jbi100_app.cache import LRUCache, SingleFlight
+from jbi100_app.data_loader import DatasetRegistry
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+
+TIMEOUT = 10
+
+
+def run_forked(target):
+    """Exit code of `target` run in a forked child, None when it hung."""
+    process = multiprocessing.get_context("fork").Process(target=target)
+    process.start()
+    process.join(TIMEOUT)
+    if process.is_alive():
+        process.kill()
+        return None
+    return process.exitcode
+
+
+def hold_in_thread(lock, seconds):
+    """Start a thread holding `lock` for `seconds`; returns once it holds it."""
+    held = threading.Event()
+
+    def hold():
+        with lock:
+            held.set()
+            time.sleep(seconds)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    held.wait()
+    return thread
+
+
+def test_registry_is_usable_in_a_child_forked_during_a_refresh():
+    from jbi100_app.config import DATA_DIR
+
+    registry = DatasetRegistry(data_dir=DATA_DIR, use_cache=False, shared=False)
+    category = next(iter(registry.files))
+    # Like the data watcher swapping in a reloaded category
+    thread = hold_in_thread(registry._lock, 0.2)
+
+    assert run_forked(lambda: registry.entry(category)) == 0
+    thread.join()
+
+
+def test_caches_are_usable_in_a_child_forked_mid_computation():
+    cache = LRUCache()
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait()
+        return 1
+
+    thread = threading.Thread(target=lambda: flight.do("key", slow))
+    thread.start()
+    started.wait()
+    lock_thread = hold_in_thread(cache._lock, 0.5)
+
+    def child():
+        assert flight.do("key", lambda: 2) == 2
+        assert cache.get_or_compute("key", lambda: 3) == 3
+
+    try:
+        assert run_forked(child) == 0
+    finally:
+        release.set()
+        thread.join()
+        lock_thread.join()
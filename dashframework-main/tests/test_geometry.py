@@ -0,0 +1,137 @@
+# tests/test_geometry.py
+"""Building the local map geometry from a synthetic GeoJSON, and its viewports."""
+import json
+import os
+
+import numpy as np
+import pytest
+
+from jbi100_app.geometry import (
+    LEVELS,
+    MANIFEST_NAME,
+    GeometryLayer,
+    build_geometry,
+    geo_viewport,
+    merge_bounds,
+    simplify_line,
+)
+
+
+def wavy_ring(min_lon, min_lat, max_lon, max_lat, points=200, amplitude=0.02):
+    """Closed box ring whose bottom edge wiggles by `amplitude` degrees."""
+    lons = np.linspace(min_lon, max_lon, points)
+    bottom = np.c_[lons, min_lat + amplitude * np.sin(np.arange(points))]
+    ring = np.r_[bottom, [[max_lon, max_lat], [min_lon, max_lat], bottom[0]]]
+    return ring.tolist()
+
+
+def feature(iso, polygons):
+    return {
+        "type": "Feature",
+        "properties": {"ADM0_A3": iso},
+        "geometry": {"type": "MultiPolygon", "coordinates": polygons},
+    }
+
+
+@pytest.fixture
+def source(tmp_path):
+    """France (a detailed mainland plus a tiny island far away) and Fiji across the antimeridian."""
+    collection = {
+        "type": "FeatureCollection",
+        "features": [
+            feature("FRA", [
+                [wavy_ring(-5.0, 42.0, 8.0, 51.0)],
+                [[[55.0, -21.0], [55.1, -21.0], [55.1, -20.9], [55.0, -21.0]]],
+            ]),
+            feature("FJI", [
+                [[[177.0, -19.0], [180.0, -19.0], [180.0, -16.0], [177.0, -16.0], [177.0, -19.0]]],
+                [[[-180.0, -17.0], [-178.0, -17.0], [-178.0, -15.0], [-180.0, -15.0], [-180.0, -17.0]]],
+            ]),
+            # Not a country of the dashboard
+            feature("ATA", [[[[0.0, -80.0], [10.0, -80.0], [10.0, -70.0], [0.0, -80.0]]]]),
+        ],
+    }
+    path = tmp_path / "countries.geojson"
+    path.write_text(json.dumps(collection))
+    return path
+
+
+@pytest.fixture
+def built(source, tmp_path):
+    out_dir = tmp_path / "geo"
+    return out_dir, build_geometry(source, out_dir)
+
+
+def point_count(path):
+    with open(path, encoding="utf-8") as f:
+        collection = json.load(f)
+    return {
+        f["id"]: sum(len(ring) for polygon in f["geometry"]["coordinates"] for ring in polygon)
+        for f in collection["features"]
+    }
+
+
+def test_simplify_line_drops_collinear_points_and_keeps_spikes():
+    line = np.array([[0, 0], [1, 0], [2, 0], [3, 0], [4, 0]], dtype=float)
+    assert simplify_line(line, 0.1).tolist() == [[0, 0], [4, 0]]
+
+    spike = np.array([[0, 0], [1, 0], [2, 1], [3, 0], [4, 0]], dtype=float)
+    assert simplify_line(spike, 0.5).tolist() == [[0, 0], [2, 1], [4, 0]]
+    assert simplify_line(spike, 2).tolist() == [[0, 0], [4, 0]]
+
+
+def test_build_writes_one_file_per_level_keyed_by_iso(built):
+    out_dir, manifest = built
+
+    assert set(manifest["files"]) == set(LEVELS)
+    assert os.path.exists(out_dir / MANIFEST_NAME)
+    counts = {level: point_count(out_dir / name) for level, name in manifest["files"].items()}
+
+    assert set(counts["low"]) == {"FRA", "FJI"}
+    assert "ATA" not in manifest["bounds"]
+    assert "FRA" not in manifest["missing"] and "DEU" in manifest["missing"]
+
+    # Coarser levels keep fewer points of the wavy outline
+    assert counts["low"]["FRA"] < counts["medium"]["FRA"] < counts["high"]["FRA"]
+
+
+def test_country_bounds(built):
+    _, manifest = built
+    min_lon, min_lat, max_lon, max_lat = manifest["bounds"]["FRA"]
+    # The island at 55E / 21S is far smaller than the mainland
+    assert (min_lon, max_lon, max_lat) == (-5.0, 8.0, 51.0)
+    assert min_lat == pytest.approx(42.0, abs=0.05)
+
+    # Both halves of Fiji, not the whole globe between them
+    assert manifest["bounds"]["FJI"] == [177.0, -19.0, 182.0, -15.0]
+
+
+def test_merge_bounds_keeps_boxes_across_the_antimeridian_together():
+    assert merge_bounds([[177, -19, 180, -16], [-180, -17, -178, -15]]) == [177, -19, 182, -15]
+    # Boxes that do not span half the globe are merged as they are
+    assert merge_bounds([[-10, 40, 10, 50], [0, 45, 20, 55]]) == [-10, 40, 20, 55]
+
+
+def test_geo_viewport_pads_centres_and_rotates():
+    viewport = geo_viewport([170, -20, 190, -10], margin=0.05)
+    assert viewport["lonaxis_range"] == [169, 191]
+    assert viewport["lataxis_range"] == [-20.5, -9.5]
+    assert viewport["center"] == {"lon": 180, "lat": -15}
+    # Rotation longitudes are wrapped into [-180, 180)
+    assert viewport["projection_rotation"] == {"lon": -180}
+
+    assert geo_viewport([-10, 80, 10, 89.9], margin=0.5)["lataxis_range"] == [75.05, 90]
+
+
+def test_layer_serves_versioned_files_and_scope_viewports(built):
+    out_dir, manifest = built
+    layer = GeometryLayer(out_dir)
+
+    assert layer.countries == {"FRA", "FJI"}
+    assert layer.asset_path("Region") == f"geo/{manifest['files']['high']}?v={manifest['version']}"
+    assert layer.asset_path("Global").startswith(f"geo/{manifest['files']['low']}")
+
+    oceania = layer.viewport("continent", "OCEANIA")
+    assert oceania["center"]["lon"] == pytest.approx(179.5)
+    assert layer.viewport("region", "WESTERN EUROPE")["lonaxis_range"] == pytest.approx([-5.65, 8.65])
+    assert layer.viewport("continent", "ANTARCTICA") is None
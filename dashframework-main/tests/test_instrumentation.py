@@ -0,0 +1,42 @@
+# tests/test_instrumentation.py
+"""Who may read the callback metrics endpoint."""
+import flask
+import pytest
+
+from jbi100_app.instrumentation import CallbackMetrics, instrument
+
+
+class FakeApp:
+    """Just enough of a Dash app for instrument(): a Flask server and app.callback."""
+
+    def __init__(self):
+        self.server = flask.Flask(__name__)
+        self.callback = lambda *args, **kwargs: (lambda func: func)
+
+
+def client(token=None):
+    app = instrument(FakeApp(), metrics=CallbackMetrics(), metrics_path="/_metrics", token=token)
+    return app.server.test_client()
+
+
+def get(client, remote_addr="127.0.0.1", **headers):
+    return client.get("/_metrics", headers=headers, environ_base={"REMOTE_ADDR": remote_addr}).status_code
+
+
+def test_local_requests_only_without_a_token():
+    c = client()
+    assert get(c) == 200
+    assert get(c, remote_addr="203.0.113.7") == 403
+
+
+@pytest.mark.parametrize("header", ["X-Forwarded-For", "Forwarded", "X-Real-IP"])
+def test_proxied_requests_are_refused_without_a_token(header):
+    # The proxy connects from the same machine
+    assert get(client(), **{header: "203.0.113.7"}) == 403
+
+
+def test_token_is_required_from_anywhere_when_set():
+    c = client(token="s3cret")
+    assert get(c) == 403
+    assert get(c, Authorization="Bearer wrong") == 403
+    assert get(c, remote_addr="203.0.113.7", Authorization="Bearer s3cret", **{"X-Forwarded-For": "x"}) == 200
@@ -0,0 +1,103 @@
+# tests/test_map_figure.py
+"""What the choropleth sends per point, with and without the local geometry."""
+import json
+
+import numpy as np
+import plotly
+import pytest
+
+from jbi100_app.geo import COUNTRY_TO_ISO
+from jbi100_app.geometry import GeometryLayer, build_geometry
+from jbi100_app.figure_encoding import compact_figure
+
+
+def payload(figure):
+    return len(json.dumps(figure, cls=plotly.utils.PlotlyJSONEncoder))
+
+
+def string_arrays(trace):
+    """Trace attributes holding one string per point."""
+    return sorted(
+        key for key, value in trace.items()
+        if isinstance(value, (list, tuple, np.ndarray)) and len(value) and isinstance(value[0], str)
+    )
+
+
+@pytest.fixture(scope="module")
+def map_callbacks():
+    import app  # noqa: F401 (registers the callbacks on the Dash app)
+    from jbi100_app.callbacks import map_callbacks
+
+    return map_callbacks
+
+
+@pytest.fixture
+def geometry(tmp_path, map_callbacks, monkeypatch):
+    """A GeometryLayer of one small square per country, installed on the map callbacks."""
+    features = []
+    for i, iso in enumerate(sorted(set(COUNTRY_TO_ISO.values()))):
+        lon, lat = i % 36 * 10 - 180, i // 36 * 10 - 80
+        ring = [[lon, lat], [lon + 5, lat], [lon + 5, lat + 5], [lon, lat]]
+        features.append({
+            "type": "Feature",
+            "properties": {"ISO_A3": iso},
+            "geometry": {"type": "Polygon", "coordinates": [ring]},
+        })
+    source = tmp_path / "countries.geojson"
+    source.write_text(json.dumps({"type": "FeatureCollection", "features": features}))
+    build_geometry(source, tmp_path / "geo")
+
+    layer = GeometryLayer(tmp_path / "geo")
+    monkeypatch.setattr(map_callbacks, "GEOMETRY", layer)
+    return layer
+
+
+@pytest.fixture
+def no_geometry(map_callbacks, monkeypatch):
+    monkeypatch.setattr(map_callbacks, "GEOMETRY", None)
+
+
+def global_map(map_callbacks):
+    from jbi100_app.data_loader import CATEGORY_ATTRIBUTES
+
+    category, attributes = next(iter(CATEGORY_ATTRIBUTES.items()))
+    figure, countries = map_callbacks.build_base_figure(category, attributes[-1][0], "Global", "Global")
+    return figure, countries
+
+
+def test_country_names_are_sent_once(map_callbacks, no_geometry):
+    figure, _ = global_map(map_callbacks)
+    [trace] = figure["data"]
+
+    # No ids or hovertext repeating the locations; the hover reads the location
+    assert string_arrays(trace) == ["locations", "text"]
+    assert "%{location}" in trace["hovertemplate"]
+
+
+def test_geometry_sends_only_iso_codes(map_callbacks, geometry, tmp_path):
+    figure, countries = global_map(map_callbacks)
+    [trace] = figure["data"]
+
+    # Name and region come from the cached geometry's feature properties
+    assert string_arrays(trace) == ["locations"]
+    assert "%{properties.name}" in trace["hovertemplate"]
+    assert "%{properties.region}" in trace["hovertemplate"]
+    assert {COUNTRY_TO_ISO[c] for c in countries} == set(trace["locations"])
+
+    with open(tmp_path / "geo" / geometry.files["low"], encoding="utf-8") as f:
+        feature = json.load(f)["features"][0]
+    assert set(feature["properties"]) == {"name", "region"}
+
+
+def test_geometry_map_is_smaller(map_callbacks, geometry, monkeypatch):
+    # Only the traces: the layout is the same size either way
+    with_geometry = payload(compact_figure(global_map(map_callbacks)[0])["data"])
+    monkeypatch.setattr(map_callbacks, "GEOMETRY", None)
+    with_names = payload(compact_figure(global_map(map_callbacks)[0])["data"])
+
+    assert with_geometry < with_names * 0.6
+
+
+def test_click_maps_iso_location_back_to_the_country(map_callbacks, geometry):
+    click = {"points": [{"location": "MMR", "z": 1}]}
+    assert map_callbacks.handle_map_click(click, None, None) == ("data", "country", "BURMA", None)
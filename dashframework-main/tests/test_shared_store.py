@@ -0,0 +1,60 @@
+# tests/test_shared_store.py
+"""Publishing loaded datasets to the shared store and attaching to them."""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from jbi100_app.shared_store import KEEP_VERSIONS, SharedStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SharedStore(str(tmp_path / "store"))
+
+
+def tables():
+    return {
+        "ranks": pd.DataFrame({"global:GDP": np.arange(3, dtype=np.int32)}),
+        "stats": pd.DataFrame({"scope": ["global"], "count": np.int32([3]), "mean": np.float32([2.0])}),
+    }
+
+
+def test_frames_round_trip_without_pickles(store):
+    index = pd.Index(["a", "b", "c"], name="key")
+    df = pd.DataFrame({
+        "GDP": [1.0, 2.0, 3.0],
+        "Note": pd.Series(["x", np.nan, "z"], dtype=object, index=index),
+        "Region": pd.Categorical(["EUROPE", "ASIA", "EUROPE"]),
+    }, index=index)
+    store.publish("data/economy.csv", (1, 2), df, [("GDP", "Gdp")], tables())
+
+    attached, attributes, attached_tables = store.attach("data/economy.csv", (1, 2))
+    pd.testing.assert_frame_equal(attached, df)
+    assert attributes == [("GDP", "Gdp")]
+    assert attached_tables["stats"]["mean"].tolist() == [2.0]
+
+    files = [f for _, _, names in os.walk(store.root) for f in names]
+    assert not [f for f in files if f.endswith(".pkl")]
+
+
+def test_store_folder_is_private(store, tmp_path):
+    assert os.stat(store.root).st_mode & 0o777 == 0o700
+
+    store.publish("data/economy.csv", (1, 2), pd.DataFrame({"GDP": [1.0]}), [], tables())
+    os.chmod(store.root, 0o777)
+    # Anyone could have planted files since
+    assert store.attach("data/economy.csv", (1, 2)) is None
+    assert not SharedStore(store.root).enabled
+
+
+def test_previous_version_stays_published(store):
+    df = pd.DataFrame({"GDP": [1.0]})
+    for version in range(KEEP_VERSIONS + 2):
+        store.publish("data/economy.csv", (1, version), df, [], tables())
+        # Versions are ordered by folder time
+        os.utime(store._folder("data/economy.csv", (1, version)), (version, version))
+
+    kept = [v for v in range(KEEP_VERSIONS + 2) if store.attach("data/economy.csv", (1, v)) is not None]
+    assert kept == [KEEP_VERSIONS, KEEP_VERSIONS + 1]
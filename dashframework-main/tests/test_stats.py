@@ -0,0 +1,53 @@
+# tests/test_stats.py
+"""Summary statistics of categories and selections without rows."""
+import pandas as pd
+import pytest
+
+from jbi100_app.data_loader import (
+    STAT_COLUMNS,
+    DatasetRegistry,
+    stats_table,
+)
+from jbi100_app.geo import UN_COUNTRIES
+
+
+def test_stats_of_an_empty_frame_have_the_final_columns():
+    df = pd.DataFrame({"Country": pd.Series([], dtype=object), "GDP": pd.Series([], dtype=float)})
+    stats = stats_table(df, [("GDP", "Gdp")])
+
+    assert stats.empty
+    assert list(stats.columns) == ["scope", "group", "attribute", *STAT_COLUMNS]
+    assert stats["count"].dtype == "int32" and stats["mean"].dtype == "float32"
+
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_csv_without_un_countries_loads_as_an_empty_category(tmp_path, use_cache):
+    pd.DataFrame({
+        "Country": ["Atlantis", "Lemuria"],
+        "Year": [2020, 2021],
+        "GDP": [1.0, 2.0],
+    }).to_csv(tmp_path / "lost_lands.csv", index=False)
+
+    registry = DatasetRegistry(data_dir=str(tmp_path), use_cache=use_cache, compact=False, shared=False)
+    data = registry.entry("Lost Lands")
+
+    assert data.frame.empty
+    assert data.stats.empty
+    assert data.selection_stats("country", ["FRANCE"], ["GDP"], "FRANCE").empty
+
+
+def test_numbers_tab_of_a_country_without_rows():
+    from jbi100_app.callbacks.data_callbacks import prepare_dataframe, prepare_stats
+    from jbi100_app.data_loader import CATEGORY_ATTRIBUTES
+    from jbi100_app.views.data_tabs.tab_numbers import render_numbers_tab
+
+    category, attributes = next(iter(CATEGORY_ATTRIBUTES.items()))
+    attrs = [{"id": f"{category}::{attributes[0][0]}"}]
+    # The fixtures hold the first countries alphabetically only
+    absent = [{"id": sorted(UN_COUNTRIES)[-1]}]
+
+    stats = prepare_stats(attrs, absent, "country")
+    assert stats.empty
+
+    df = prepare_dataframe(attrs, absent, "country")
+    assert "No data available" in str(render_numbers_tab(df, stats))
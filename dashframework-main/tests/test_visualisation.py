@@ -0,0 +1,62 @@
+# tests/test_visualisation.py
+"""Bar charts and histograms of numeric, categorical and text columns."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from jbi100_app.Visualisation import BarVis, HistVis
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "Country": ["FRANCE", "FRANCE", "SPAIN", "PERU", "PERU"],
+        "Region": pd.Categorical(["EUROPE", "EUROPE", "EUROPE", "SOUTH AMERICA", "SOUTH AMERICA"]),
+        "Language": ["French", "Breton", "Spanish", "Spanish", None],
+        "Value": [1.0, 2.0, 4.0, np.nan, 8.0],
+        "Note": ["1", "2", "n/a", "4", "8"],
+    })
+
+
+def bars(trace):
+    return dict(zip(trace.x, trace.y))
+
+
+def test_bar_sums_each_group(df):
+    [trace] = BarVis("Country", "Value").render(df).data
+    assert bars(trace) == {"FRANCE": 3.0, "PERU": 8.0, "SPAIN": 4.0}
+
+
+def test_bar_stacks_one_trace_per_colour_group(df):
+    fig = BarVis("Country", "Value", color="Language").render(df)
+
+    assert fig.layout.barmode == "stack"
+    stacked = {trace.name: bars(trace) for trace in fig.data}
+    assert stacked == {
+        "Breton": {"FRANCE": 2.0},
+        "French": {"FRANCE": 1.0},
+        # PERU's Spanish row has no value
+        "Spanish": {"SPAIN": 4.0},
+        "nan": {"PERU": 8.0},
+    }
+
+
+def test_bar_coerces_numbers_stored_as_text(df):
+    [trace] = BarVis("Country", "Note").render(df).data
+    assert bars(trace) == {"FRANCE": 3.0, "PERU": 12.0, "SPAIN": 0.0}
+
+
+def test_bar_rejects_a_non_numeric_value(df):
+    with pytest.raises(ValueError, match="'Region' is not a numeric attribute"):
+        BarVis("Country", "Region").render(df)
+
+
+@pytest.mark.parametrize("column", ["Region", "Language"])
+def test_hist_counts_categories(df, column):
+    [trace] = HistVis(column).render(df).data
+    assert bars(trace) == df[column].value_counts().to_dict()
+
+
+def test_hist_bins_numbers(df):
+    [trace] = HistVis("Value", bins=2).render(df).data
+    assert trace.y.tolist() == [3, 1]